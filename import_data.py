@@ -0,0 +1,52 @@
+import argparse
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+if __name__ == "__main__":
+    from src.app.config.database.bulk_import import (
+        FORMATS,
+        TARGETS,
+        apply_cache_invalidations,
+        import_file,
+    )
+    from src.app.api.controllers.bulk import BULK_CHUNK_SIZE
+    from src.app.config.database.mysql import MySQLConnection
+
+    parser = argparse.ArgumentParser(
+        description="Import a CSV or NDJSON file of records into the database."
+    )
+    parser.add_argument("target", choices=TARGETS)
+    parser.add_argument("file")
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        help="format of the file, by default taken from its extension",
+    )
+    parser.add_argument("--batch-size", type=int, default=BULK_CHUNK_SIZE)
+    parser.add_argument(
+        "--errors", help="NDJSON file receiving the line and error of each failure"
+    )
+    args = parser.parse_args()
+
+    format = args.format or os.path.splitext(args.file)[1].lstrip(".").lower()
+    if format not in FORMATS:
+        parser.error("cannot tell the format of the file, use --format")
+
+    db = MySQLConnection().SessionLocal()
+    errors_file = open(args.errors, "w", encoding="utf-8") if args.errors else None
+    try:
+        with open(args.file, newline="", encoding="utf-8") as file:
+            created, failed = import_file(
+                db, TARGETS[args.target], file, format, args.batch_size, errors_file
+            )
+        apply_cache_invalidations(db, TARGETS[args.target].kind)
+    finally:
+        db.close()
+        if errors_file is not None:
+            errors_file.close()
+
+    print(f"Created {created} {args.target}, {failed} failed")
+    sys.exit(1 if failed else 0)
@@ -1,24 +1,43 @@
+import heapq
+from typing import Iterator, List, Optional, Tuple
 from src.app.api.schemas.analytic_schema import (
     InputTimeFrame,
+    MatchingIndexStats,
     OverallStatistic,
+    SuitableJobs,
     SuitableSeekers,
 )
-from src.app.utils.utils import remove_private_attributes, extract_ids
+from src.app.utils.utils import remove_private_attributes
+from src.app.api.controllers.hydration import (
+    hydrate_jobs,
+    load_resume_fields,
+    load_resume_provinces,
+)
+from src.app.utils.matching_index import IndexEntry, job_index, resume_index
+from src.app.utils.reference_data import provinces
+from src.app.config.logging.logging_config import logger
+from sqlalchemy import select, exists, func, distinct, and_, or_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from src.app.api.models.employer_model import Employer as EmployerModel
 from src.app.api.models.job_model import Job as JobModel
 from src.app.api.models.seeker_model import Seeker as SeekerModel
 from src.app.api.models.resume_model import Resume as ResumeModel
-from src.app.api.models.job_field_model import JobField as JobFieldModel
-from src.app.api.models.province_model import Province as ProvinceModel
+from src.app.api.models.daily_stat_model import DailyStat as DailyStatModel
+from src.app.api.models.association_model import (
+    job_field_table,
+    job_province_table,
+    resume_field_table,
+    resume_province_table,
+)
 from src.app.api.schemas.seeker_schema import SeekerOut
+from src.app.common.pagination import Pagination, PaginationMeta
 from src.app.common.custom_exception import (
     BadRequestException,
     ValidationException,
     NotFoundException,
 )
-from datetime import timedelta, date
+from datetime import timedelta, date, datetime
 from pydantic import ValidationError
 from collections import defaultdict
 
@@ -43,25 +62,17 @@ class AnalyticController:
                 date = fromDate + timedelta(days=i)
                 chart[date]  # Initialize the date in the chart
 
-            # Query all models at once
-            for model, key in [
-                (EmployerModel, "numEmployer"),
-                (JobModel, "numJob"),
-                (SeekerModel, "numSeeker"),
-                (ResumeModel, "numResume"),
-            ]:
-                records = (
-                    db.query(model)
-                    .filter(
-                        model.created_at >= fromDate,
-                        model.created_at <= toDate,
-                    )
-                    .all()
-                )
-
-                # Update the chart and count the records
-                for record in records:
-                    chart[record.created_at.date()][key] += 1
+            # Read the per-day counts from the daily rollup
+            daily_stats = db.query(DailyStatModel).filter(
+                DailyStatModel.date >= fromDate, DailyStatModel.date <= toDate
+            )
+            for daily_stat in daily_stats:
+                chart[daily_stat.date] = {
+                    "numEmployer": daily_stat.num_employer,
+                    "numJob": daily_stat.num_job,
+                    "numSeeker": daily_stat.num_seeker,
+                    "numResume": daily_stat.num_resume,
+                }
 
             # Convert the chart to a list and sort it by date
             chart = [{"date": date, **data} for date, data in sorted(chart.items())]
@@ -84,98 +95,223 @@ class AnalyticController:
         return overall_statistic
 
     @staticmethod
-    def find_suitable_seekers(db: Session, job_id: int) -> SuitableSeekers:
+    def _load_index_links(
+        db: Session, owner_column, target_column, ids: Optional[List[int]] = None
+    ) -> dict:
+        links = defaultdict(list)
+        query = db.query(owner_column, target_column)
+        if ids is not None:
+            query = query.filter(owner_column.in_(ids))
+        for owner_id, target_id in query.yield_per(10000):
+            links[owner_id].append(target_id)
+        return links
+
+    @staticmethod
+    def _resume_index_entries(
+        db: Session, ids: Optional[List[int]] = None
+    ) -> Iterator[Tuple[int, IndexEntry]]:
+        """Index entries of the resumes, of all of them when ids is None."""
+        resume_fields = AnalyticController._load_index_links(
+            db, resume_field_table.c.resume_id, resume_field_table.c.field_id, ids
+        )
+        resume_provinces = AnalyticController._load_index_links(
+            db,
+            resume_province_table.c.resume_id,
+            resume_province_table.c.province_id,
+            ids,
+        )
+
+        query = db.query(ResumeModel.id, ResumeModel.seeker_id, ResumeModel.salary)
+        if ids is not None:
+            query = query.filter(ResumeModel.id.in_(ids))
+        for id, seeker_id, salary in query.yield_per(10000):
+            yield id, IndexEntry(
+                seeker_id,
+                salary,
+                tuple(resume_fields.pop(id, ())),
+                tuple(resume_provinces.pop(id, ())),
+            )
+
+    @staticmethod
+    def _job_index_entries(
+        db: Session, ids: Optional[List[int]] = None
+    ) -> Iterator[Tuple[int, IndexEntry]]:
+        """Index entries of the jobs that have not expired, see above."""
+        job_fields = AnalyticController._load_index_links(
+            db, job_field_table.c.job_id, job_field_table.c.field_id, ids
+        )
+        job_provinces = AnalyticController._load_index_links(
+            db, job_province_table.c.job_id, job_province_table.c.province_id, ids
+        )
+
+        # Jobs that have already expired can never match again unless they
+        # are updated, which re-adds them to the index
+        query = db.query(
+            JobModel.id, JobModel.employer_id, JobModel.salary, JobModel.expired_at
+        ).filter(JobModel.expired_at > datetime.now())
+        if ids is not None:
+            query = query.filter(JobModel.id.in_(ids))
+        for id, employer_id, salary, expired_at in query.yield_per(10000):
+            yield id, IndexEntry(
+                employer_id,
+                salary,
+                tuple(job_fields.pop(id, ())),
+                tuple(job_provinces.pop(id, ())),
+                expired_at,
+            )
+
+    @staticmethod
+    def build_resume_index(db: Session) -> None:
         try:
-            db_job = db.query(JobModel).get(job_id)
+            resume_index.load(AnalyticController._resume_index_entries(db))
         except SQLAlchemyError as e:
-            raise BadRequestException(f"Database error while getting job. Error: {e}")
+            raise BadRequestException(
+                f"Database error while building resume index. Error: {e}"
+            )
 
-        if not db_job:
-            raise NotFoundException(detail="Job not found")
+        logger.info(f"Resume index built: {resume_index.stats()}")
 
+    @staticmethod
+    def refresh_resume_index(db: Session, ids: List[int]) -> None:
+        """Reload the index entries of the resumes, removing deleted ones."""
         try:
-            # Get all fields and provinces of the job
-            job_field_db_ids = extract_ids(db_job.fields)
-            job_province_db_ids = extract_ids(db_job.provinces)
+            entries = dict(AnalyticController._resume_index_entries(db, ids))
+        except SQLAlchemyError as e:
+            raise BadRequestException(
+                f"Database error while refreshing resume index. Error: {e}"
+            )
 
-            db_job_fields = (
-                db.query(JobFieldModel)
-                .filter(JobFieldModel.id.in_(job_field_db_ids))
-                .all()
+        resume_index.refresh(ids, entries)
+
+    @staticmethod
+    def build_job_index(db: Session) -> None:
+        try:
+            job_index.load(AnalyticController._job_index_entries(db))
+        except SQLAlchemyError as e:
+            raise BadRequestException(
+                f"Database error while building job index. Error: {e}"
             )
-            db_job_provinces = (
-                db.query(ProvinceModel)
-                .filter(ProvinceModel.id.in_(job_province_db_ids))
-                .all()
+
+        logger.info(f"Job index built: {job_index.stats()}")
+
+    @staticmethod
+    def refresh_job_index(db: Session, ids: List[int]) -> None:
+        """Reload the index entries of the jobs, removing deleted or expired ones."""
+        try:
+            entries = dict(AnalyticController._job_index_entries(db, ids))
+        except SQLAlchemyError as e:
+            raise BadRequestException(
+                f"Database error while refreshing job index. Error: {e}"
             )
 
-            job_fields_dict = [
-                remove_private_attributes(field) for field in db_job_fields
-            ]
-            job_provinces_dict = [
-                remove_private_attributes(province) for province in db_job_provinces
-            ]
+        job_index.refresh(ids, entries)
+
+    @staticmethod
+    def get_matching_index_stats() -> List[MatchingIndexStats]:
+        return [
+            MatchingIndexStats.model_validate(index.stats())
+            for index in (resume_index, job_index)
+        ]
+
+    @staticmethod
+    def _match_seekers_from_index(
+        db_job: JobModel, page: int, pageSize: int
+    ) -> Tuple[List[int], int]:
+        resume_ids = resume_index.match(
+            [field.id for field in db_job.fields_data],
+            [province.id for province in db_job.provinces_data],
+            max_salary=db_job.salary,
+        )
+        seeker_ids = resume_index.owners(resume_ids)
+        skip = (page - 1) * pageSize
+        return seeker_ids[skip : skip + pageSize], len(seeker_ids)
 
-            # The list is arranged in descending order of expiredAt of the job.
+    @staticmethod
+    def _match_seekers_from_db(
+        db: Session, db_job: JobModel, page: int, pageSize: int
+    ) -> Tuple[List[int], int]:
+        job_field_ids = select(job_field_table.c.field_id).where(
+            job_field_table.c.job_id == db_job.id
+        )
+        job_province_ids = select(job_province_table.c.province_id).where(
+            job_province_table.c.job_id == db_job.id
+        )
+        matching_resumes = db.query(ResumeModel.seeker_id).filter(
+            ResumeModel.salary <= db_job.salary,
+            exists().where(
+                resume_field_table.c.resume_id == ResumeModel.id,
+                resume_field_table.c.field_id.in_(job_field_ids),
+            ),
+            exists().where(
+                resume_province_table.c.resume_id == ResumeModel.id,
+                resume_province_table.c.province_id.in_(job_province_ids),
+            ),
+        )
+
+        # Only the requested page of distinct seeker ids leaves the database
+        total_seekers = matching_resumes.with_entities(
+            func.count(distinct(ResumeModel.seeker_id))
+        ).scalar()
+        seeker_ids = [
+            seeker_id
+            for seeker_id, in matching_resumes.distinct()
+            .order_by(ResumeModel.seeker_id)
+            .offset((page - 1) * pageSize)
+            .limit(pageSize)
+            .all()
+        ]
+        return seeker_ids, total_seekers
 
+    @staticmethod
+    def find_suitable_seekers(
+        db: Session, job_id: int, page: int = 1, pageSize: int = 10
+    ) -> SuitableSeekers:
+        try:
+            db_job = db.query(JobModel).get(job_id)
+        except SQLAlchemyError as e:
+            raise BadRequestException(f"Database error while getting job. Error: {e}")
+
+        if not db_job:
+            raise NotFoundException(detail="Job not found")
+
+        try:
             # Seekers will match jobs if the seeker has a resume that meets the following conditions:
             # 1.Resume whose salary is less than or equal to the salary of the job
             # 2.The resume has 1 field located in the Job's fields
             # 3.The resume has 1 province located in the provinces of the job
-
-            # Query resumes that meet the salary condition
-            resumes = (
-                db.query(ResumeModel)
-                .filter(
-                    ResumeModel.salary <= db_job.salary,
+            if resume_index.ready:
+                seeker_ids, total_seekers = (
+                    AnalyticController._match_seekers_from_index(db_job, page, pageSize)
                 )
-                .all()
-            )
-
-            # Filter resumes that meet the fields and provinces conditions
-            filtered_resumes = [
-                resume
-                for resume in resumes
-                if any(
-                    field_id in extract_ids(resume.fields)
-                    for field_id in job_field_db_ids
+            else:
+                seeker_ids, total_seekers = AnalyticController._match_seekers_from_db(
+                    db, db_job, page, pageSize
                 )
-                and any(
-                    province_id in extract_ids(resume.provinces)
-                    for province_id in job_province_db_ids
-                )
-            ]
-
-            # Get all seekers from the resumes
-            seeker_ids = [resume.seeker_id for resume in filtered_resumes]
 
-            # Remove duplicate seekers
-            seeker_ids = list(set(seeker_ids))
-            # Find Seekers
             seekers_out = (
-                db.query(SeekerModel).filter(SeekerModel.id.in_(seeker_ids)).all()
+                db.query(SeekerModel)
+                .filter(SeekerModel.id.in_(seeker_ids))
+                .order_by(SeekerModel.id)
+                .all()
             )
 
             seekers = []
             for seeker in seekers_out:
                 seeker_dict = remove_private_attributes(seeker)
-                seeker_dict["provinceId"] = (
-                    seeker.province_data.id if seeker.province_data else None
-                )
-                seeker_dict["provinceName"] = (
-                    seeker.province_data.name if seeker.province_data else None
-                )
+                province = provinces.get(db, seeker.province)
+                seeker_dict["provinceId"] = province.id if province else None
+                seeker_dict["provinceName"] = province.name if province else None
                 seeker_out = SeekerOut.model_validate(seeker_dict)
                 seekers.append(seeker_out)
 
-            job_dict = remove_private_attributes(db_job)
-            employer = db.query(EmployerModel).get(job_dict["employer_id"])
-            if employer:
-                job_dict["employerId"] = employer.id
-                job_dict["employerName"] = employer.name
+            job_dict = hydrate_jobs(db, [db_job])[0].model_dump()
             job_dict["seekers"] = seekers
-            job_dict["fields"] = job_fields_dict
-            job_dict["provinces"] = job_provinces_dict
+            job_dict["pagination"] = PaginationMeta(
+                page=page,
+                pageSize=pageSize,
+                totalElements=total_seekers,
+                totalPages=Pagination.totalPages(total_seekers, pageSize),
+            )
             suitable_seekers = SuitableSeekers.model_validate(job_dict)
         except SQLAlchemyError as e:
             raise BadRequestException(
@@ -185,3 +321,127 @@ class AnalyticController:
             raise ValidationException(f"Error validating suitable seekers. Error: {e}")
 
         return suitable_seekers
+
+    @staticmethod
+    def _match_jobs_from_index(
+        resumes: List[dict], after: Optional[int], limit: int
+    ) -> List[int]:
+        now = datetime.now()
+        job_ids = set()
+        for resume in resumes:
+            job_ids |= job_index.match(
+                resume["fieldIds"],
+                resume["provinceIds"],
+                min_salary=resume["salary"],
+                active_at=now,
+            )
+
+        if after is not None:
+            job_ids = {id for id in job_ids if id < after}
+        return heapq.nlargest(limit, job_ids)
+
+    @staticmethod
+    def _match_jobs_from_db(
+        db: Session, resumes: List[dict], after: Optional[int], limit: int
+    ) -> List[int]:
+        query = db.query(JobModel.id).filter(
+            JobModel.expired_at > datetime.now(),
+            or_(
+                *(
+                    and_(
+                        JobModel.salary >= resume["salary"],
+                        exists().where(
+                            job_field_table.c.job_id == JobModel.id,
+                            job_field_table.c.field_id.in_(resume["fieldIds"]),
+                        ),
+                        exists().where(
+                            job_province_table.c.job_id == JobModel.id,
+                            job_province_table.c.province_id.in_(resume["provinceIds"]),
+                        ),
+                    )
+                    for resume in resumes
+                )
+            ),
+        )
+        if after is not None:
+            query = query.filter(JobModel.id < after)
+
+        return [id for id, in query.order_by(JobModel.id.desc()).limit(limit).all()]
+
+    @staticmethod
+    def find_suitable_jobs(
+        db: Session,
+        resume_id: Optional[int] = None,
+        seeker_id: Optional[int] = None,
+        after: Optional[int] = None,
+        limit: int = 10,
+    ) -> SuitableJobs:
+        # Jobs will match a resume if the job meets the following conditions:
+        # 1.The job has not expired yet
+        # 2.Job whose salary is greater than or equal to the salary of the resume
+        # 3.The job has 1 field located in the resume's fields
+        # 4.The job has 1 province located in the provinces of the resume
+        # The list is arranged in descending order of job id, "after" is the last
+        # job id of the previous page.
+        try:
+            query = db.query(ResumeModel.id, ResumeModel.salary)
+            if resume_id is not None:
+                query = query.filter(ResumeModel.id == resume_id)
+            if seeker_id is not None:
+                query = query.filter(ResumeModel.seeker_id == seeker_id)
+            db_resumes = query.all()
+        except SQLAlchemyError as e:
+            raise BadRequestException(
+                f"Database error while getting resumes. Error: {e}"
+            )
+
+        if not db_resumes:
+            raise NotFoundException(detail="Resume not found")
+
+        try:
+            resume_ids = [resume.id for resume in db_resumes]
+            resume_fields = load_resume_fields(db, resume_ids)
+            resume_provinces = load_resume_provinces(db, resume_ids)
+            resumes = [
+                {
+                    "salary": resume.salary,
+                    "fieldIds": [field.id for field in resume_fields[resume.id]],
+                    "provinceIds": [
+                        province.id for province in resume_provinces[resume.id]
+                    ],
+                }
+                for resume in db_resumes
+            ]
+
+            # Fetch one extra job to know whether there is a next page
+            if job_index.ready:
+                job_ids = AnalyticController._match_jobs_from_index(
+                    resumes, after, limit + 1
+                )
+            else:
+                job_ids = AnalyticController._match_jobs_from_db(
+                    db, resumes, after, limit + 1
+                )
+            has_next = len(job_ids) > limit
+            job_ids = job_ids[:limit]
+
+            db_jobs = (
+                db.query(JobModel)
+                .filter(JobModel.id.in_(job_ids))
+                .order_by(JobModel.id.desc())
+                .all()
+            )
+
+            suitable_jobs = SuitableJobs(
+                resumeIds=resume_ids,
+                jobs=hydrate_jobs(db, db_jobs),
+                nextAfter=job_ids[-1] if has_next else None,
+            )
+        except SQLAlchemyError as e:
+            raise BadRequestException(
+                f"Database error while getting suitable jobs. Error: {e}"
+            )
+        except ValidationError as e:
+            raise ValidationException(f"Error validating suitable jobs. Error: {e}")
+
+        return suitable_jobs
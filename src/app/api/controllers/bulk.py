@@ -0,0 +1,202 @@
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from dotenv import load_dotenv
+from sqlalchemy import Table, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from src.app.api.controllers.daily_stat_controller import DailyStatController
+from src.app.api.models.association_model import (
+    job_field_table,
+    job_province_table,
+    resume_field_table,
+    resume_province_table,
+)
+from src.app.api.schemas.bulk_schema import BulkCreateResult, BulkItemResult
+from src.app.config.cache.invalidation import invalidate_records
+from src.app.config.logging.logging_config import logger
+from src.app.utils.row_count import row_counter
+
+load_dotenv()
+
+# Bulk creation validates the foreign keys of a whole request in a few set
+# based queries (fields and provinces come from the in-memory reference data),
+# then inserts the valid records chunk by chunk: one multi-row INSERT per table
+# and one commit per chunk. A chunk that fails is rolled back on its own and
+# its items are reported as failed, the other chunks are kept.
+#
+# The ids of the rows of a multi-row INSERT are derived from the id of its
+# first row, which only holds when InnoDB gives them out in one evenly spaced
+# range (see insert_id_step). Otherwise the records are inserted one by one.
+
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "1000"))
+
+
+class BulkRow(NamedTuple):
+    values: dict
+    field_ids: Sequence[int] = ()
+    province_ids: Sequence[int] = ()
+
+
+class LinkTables(NamedTuple):
+    # Association tables of the records to fields and provinces
+    owner_key: str
+    field_table: Table
+    province_table: Table
+
+
+JOB_LINKS = LinkTables("job_id", job_field_table, job_province_table)
+RESUME_LINKS = LinkTables("resume_id", resume_field_table, resume_province_table)
+
+
+# Step between the ids of the rows of one multi-row INSERT, per database
+_insert_id_steps: Dict[object, Optional[int]] = {}
+
+
+def insert_id_step(db: Session) -> Optional[int]:
+    """
+    Step between the auto-increment ids InnoDB gives the rows of one
+    multi-row INSERT (auto_increment_increment), or None when they may not be
+    evenly spaced: with innodb_autoinc_lock_mode 2 ("interleaved") concurrent
+    INSERTs may take ids within the range. Checked once per database.
+    """
+    bind = db.get_bind()
+    if bind not in _insert_id_steps:
+        step = None
+        if bind.dialect.name == "mysql":
+            increment, lock_mode = db.execute(
+                text("SELECT @@auto_increment_increment, @@innodb_autoinc_lock_mode")
+            ).one()
+            if int(lock_mode) != 2:
+                step = int(increment)
+        if step is None:
+            logger.warning(
+                "Ids of multi-row INSERTs may not be consecutive, "
+                "bulk creation inserts records one by one"
+            )
+        _insert_id_steps[bind] = step
+    return _insert_id_steps[bind]
+
+
+def existing_ids(db: Session, model, ids: Iterable[int]) -> Set[int]:
+    ids = set(ids)
+    if not ids:
+        return set()
+    return {id for id, in db.query(model.id).filter(model.id.in_(ids)).all()}
+
+
+@lru_cache(maxsize=32)
+def _insert_statement(table: Table, keys: Tuple[str, ...], size: int, dialect):
+    """
+    Multi-row INSERT of size rows of the keys, the columns left out that
+    default to an SQL expression (now()) get their default. It is written as
+    text so that its compiled form is cached: SQLAlchemy does not cache
+    multi-row VALUES constructs, and compiling one costs more than running it.
+    """
+    preparer = dialect.identifier_preparer
+    defaults = {
+        column.name: str(column.default.arg.compile(dialect=dialect))
+        for column in table.columns
+        if column.name not in keys
+        and column.default is not None
+        and column.default.is_clause_element
+    }
+    names = ", ".join(preparer.quote(name) for name in (*keys, *defaults))
+    placeholders = [f":{key}_{{i}}" for key in keys] + list(defaults.values())
+    row = "(" + ", ".join(placeholders) + ")"
+    values = ", ".join(row.format(i=i) for i in range(size))
+    table_name = preparer.format_table(table)
+    return text(f"INSERT INTO {table_name} ({names}) VALUES {values}")
+
+
+def _insert_rows(db: Session, model, rows: List[BulkRow]) -> List[int]:
+    keys = tuple(rows[0].values)
+    dialect = db.get_bind().dialect
+    step = insert_id_step(db)
+    if step is None:
+        statement = _insert_statement(model.__table__, keys, 1, dialect)
+        return [
+            db.execute(
+                statement, {f"{key}_0": value for key, value in row.values.items()}
+            ).lastrowid
+            for row in rows
+        ]
+
+    statement = _insert_statement(model.__table__, keys, len(rows), dialect)
+    params = {
+        f"{key}_{i}": value
+        for i, row in enumerate(rows)
+        for key, value in row.values.items()
+    }
+    result = db.execute(statement, params)
+    # InnoDB reserves the ids of a multi-row INSERT at once, so they follow
+    # the id of its first row
+    first_id = result.lastrowid
+    return list(range(first_id, first_id + len(rows) * step, step))
+
+
+def _insert_links(
+    db: Session, links: LinkTables, ids: List[int], rows: List[BulkRow]
+) -> None:
+    field_links = [
+        {links.owner_key: id, "field_id": field_id}
+        for id, row in zip(ids, rows)
+        for field_id in row.field_ids
+    ]
+    province_links = [
+        {links.owner_key: id, "province_id": province_id}
+        for id, row in zip(ids, rows)
+        for province_id in row.province_ids
+    ]
+    # executemany, the driver batches the rows into multi-row INSERTs
+    if field_links:
+        db.execute(links.field_table.insert(), field_links)
+    if province_links:
+        db.execute(links.province_table.insert(), province_links)
+
+
+def bulk_insert(
+    db: Session,
+    model,
+    kind: str,
+    rows: Dict[int, BulkRow],
+    errors: Dict[int, str],
+    links: Optional[LinkTables] = None,
+) -> BulkCreateResult:
+    """
+    Insert the valid rows, keyed by the position of their item in the
+    request, and report the id or the error of every item. The errors of
+    chunks that fail are added to errors.
+    """
+    ids = {}
+    indexes = sorted(rows)
+    for start in range(0, len(indexes), BULK_CHUNK_SIZE):
+        chunk = indexes[start : start + BULK_CHUNK_SIZE]
+        chunk_rows = [rows[index] for index in chunk]
+        try:
+            chunk_ids = _insert_rows(db, model, chunk_rows)
+            if links is not None:
+                _insert_links(db, links, chunk_ids, chunk_rows)
+            DailyStatController.record(db, model, len(chunk))
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            error = getattr(e, "orig", None) or e
+            logger.error(f"Error creating a chunk of {len(chunk)} {kind}s: {error}")
+            errors.update(
+                (index, f"Database error while creating {kind}. Error: {error}")
+                for index in chunk
+            )
+            continue
+
+        row_counter.adjust(model, len(chunk))
+        ids.update(zip(chunk, chunk_ids))
+
+    if ids:
+        invalidate_records(db, kind, [], counts_changed=True)
+
+    items = [
+        BulkItemResult(index=index, id=ids.get(index), error=errors.get(index))
+        for index in sorted(ids.keys() | errors.keys())
+    ]
+    return BulkCreateResult(created=len(ids), failed=len(errors), items=items)
@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+from collections import Counter
+from typing import Iterable, Optional
+from sqlalchemy import Date, func, literal, select, union_all
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.orm import Session
+from src.app.api.models.daily_stat_model import DailyStat as DailyStatModel
+from src.app.api.models.employer_model import Employer as EmployerModel
+from src.app.api.models.job_model import Job as JobModel
+from src.app.api.models.seeker_model import Seeker as SeekerModel
+from src.app.api.models.resume_model import Resume as ResumeModel
+
+# Rollup column counting the records of each model per creation day
+DAILY_STAT_COLUMNS = {
+    EmployerModel: "num_employer",
+    JobModel: "num_job",
+    SeekerModel: "num_seeker",
+    ResumeModel: "num_resume",
+}
+
+
+class DailyStatController:
+    @staticmethod
+    def record(db: Session, model, delta: int, day: Optional[date] = None) -> None:
+        """
+        Add delta to the count of the model for the day, in the caller's
+        transaction. Without a day, the database's current date is used so the
+        count lines up with the created_at default of new records.
+        """
+        column = DAILY_STAT_COLUMNS[model]
+        stmt = insert(DailyStatModel).values(
+            date=day if day is not None else func.curdate(),
+            **{column: max(delta, 0)},
+        )
+        stmt = stmt.on_duplicate_key_update(
+            {column: DailyStatModel.__table__.c[column] + delta}
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def record_deleted(db: Session, model, records: Iterable) -> None:
+        """Subtract deleted records from the counts of their creation days."""
+        days = Counter(
+            record.created_at.date()
+            for record in records
+            if record.created_at is not None
+        )
+        for day, count in days.items():
+            DailyStatController.record(db, model, -count, day)
+
+    @staticmethod
+    def count_per_day(db: Session, fromDate: date, toDate: date) -> dict:
+        """Count the records of all models per day straight from their tables."""
+        counts_per_day = union_all(
+            *(
+                select(
+                    func.date(model.created_at, type_=Date).label("day"),
+                    literal(column).label("column"),
+                    func.count().label("count"),
+                )
+                .where(
+                    model.created_at >= fromDate,
+                    model.created_at < toDate + timedelta(days=1),
+                )
+                .group_by(func.date(model.created_at))
+                for model, column in DAILY_STAT_COLUMNS.items()
+            )
+        )
+
+        counts = {}
+        for day, column, count in db.execute(counts_per_day):
+            counts.setdefault(day, {})[column] = count
+        return counts
+
+    @staticmethod
+    def reconcile(db: Session, fromDate: date, toDate: date) -> int:
+        """Recompute the rollup rows of the date range from the source tables."""
+        counts = DailyStatController.count_per_day(db, fromDate, toDate)
+
+        db.query(DailyStatModel).filter(
+            DailyStatModel.date >= fromDate, DailyStatModel.date <= toDate
+        ).delete(synchronize_session=False)
+        db.add_all(
+            DailyStatModel(date=day, **columns) for day, columns in counts.items()
+        )
+        db.commit()
+
+        return len(counts)
@@ -1,3 +1,4 @@
+from typing import Dict, List, Optional, Tuple
 from src.app.api.models.employer_model import (
     Employer as EmployerModel,
 )
@@ -6,16 +7,24 @@ from src.app.api.schemas.employer_schema import (
     EmployerUpdate,
     EmployerOut,
 )
-from sqlalchemy.orm import Session, joinedload
+from src.app.api.schemas.bulk_schema import BulkCreateResult
+from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from src.app.api.models.province_model import Province as ProvinceModel
+from src.app.api.models.job_model import Job as JobModel
 from src.app.common.custom_exception import (
     NotFoundException,
     BadRequestException,
     ValidationException,
 )
 from src.app.utils.utils import remove_private_attributes
-from src.app.common.pagination import Pagination
+from src.app.common.pagination import Pagination, fetch_page
+from src.app.utils.row_count import row_counter
+from src.app.utils.reference_data import provinces
+from src.app.config.cache.invalidation import invalidate_records, mark_index_stale
+from src.app.utils.matching_index import job_index
+from src.app.utils.text_index import job_text_index
+from src.app.api.controllers.daily_stat_controller import DailyStatController
+from src.app.api.controllers.bulk import BulkRow, bulk_insert
 from src.app.config.logging.logging_config import logger
 
 
@@ -29,7 +38,7 @@ class EmployerController:
             raise BadRequestException(detail="Email already exists")
 
         # Check if province exists
-        db_province = db.query(ProvinceModel).get(employer.provinceId)
+        db_province = provinces.get(db, employer.provinceId)
 
         if not db_province:
             raise NotFoundException(detail="Province not found")
@@ -44,8 +53,11 @@ class EmployerController:
             )
 
             db.add(new_employer)
+            DailyStatController.record(db, EmployerModel, 1)
             db.commit()
             db.refresh(new_employer)
+            row_counter.adjust(EmployerModel, 1)
+            invalidate_records(db, "employer", [], counts_changed=True)
         except IntegrityError:
             raise BadRequestException("Employer already exists")
         except SQLAlchemyError as e:
@@ -60,16 +72,51 @@ class EmployerController:
 
         return "Employer created successfully"
 
+    @staticmethod
+    def prepare_employers(
+        db: Session, employers: List[EmployerCreate]
+    ) -> Tuple[Dict[int, BulkRow], Dict[int, str]]:
+        """Rows of the valid employers and errors of the others, by position."""
+        # Emails taken by existing employers or by earlier items of the request,
+        # compared case-insensitively like the column's collation does
+        emails = {employer.email for employer in employers}
+        taken = {
+            email.lower()
+            for email, in db.query(EmployerModel.email)
+            .filter(EmployerModel.email.in_(emails))
+            .all()
+        }
+
+        rows, errors = {}, {}
+        for index, employer in enumerate(employers):
+            if employer.email.lower() in taken:
+                errors[index] = "Email already exists"
+            elif not provinces.get(db, employer.provinceId):
+                errors[index] = "Province not found"
+            else:
+                taken.add(employer.email.lower())
+                rows[index] = BulkRow(
+                    values={
+                        "email": employer.email,
+                        "name": employer.name,
+                        "province": employer.provinceId,
+                        "description": employer.description,
+                    }
+                )
+
+        return rows, errors
+
+    @staticmethod
+    def create_employers(
+        db: Session, employers: List[EmployerCreate]
+    ) -> BulkCreateResult:
+        rows, errors = EmployerController.prepare_employers(db, employers)
+        return bulk_insert(db, EmployerModel, "employer", rows, errors)
+
     @staticmethod
     def get_employer_by_id(db: Session, employer_id: int) -> EmployerOut:
         try:
-            db_employer = (
-                db.query(EmployerModel)
-                .options(
-                    joinedload(EmployerModel.province_data)
-                )  # Use the relationship name
-                .get(employer_id)
-            )
+            db_employer = db.query(EmployerModel).get(employer_id)
         except SQLAlchemyError as e:
             raise BadRequestException(
                 f"Database error while getting employer. Error: {e}"
@@ -80,12 +127,9 @@ class EmployerController:
 
         try:
             employer_dict = remove_private_attributes(db_employer)
-            employer_dict["provinceId"] = (
-                db_employer.province_data.id if db_employer.province_data else None
-            )
-            employer_dict["provinceName"] = (
-                db_employer.province_data.name if db_employer.province_data else None
-            )
+            province = provinces.get(db, db_employer.province)
+            employer_dict["provinceId"] = province.id if province else None
+            employer_dict["provinceName"] = province.name if province else None
             employer_out = EmployerOut.model_validate(employer_dict)
         except ValidationException as e:
             raise BadRequestException(f"Error validating employer data. Error: {e}")
@@ -96,26 +140,33 @@ class EmployerController:
 
     @staticmethod
     def get_employers(
-        db: Session, skip: int = 0, limit: int = 10
+        db: Session,
+        skip: int = 0,
+        limit: int = 10,
+        after: Optional[str] = None,
+        withCount: Optional[bool] = None,
+        exactCount: bool = False,
     ) -> Pagination[EmployerOut]:
         try:
-            employers = db.query(EmployerModel).offset(skip).limit(limit).all()
-            total_employers = db.query(EmployerModel).count()
+            page_rows = fetch_page(
+                db.query(EmployerModel),
+                EmployerModel.id,
+                skip,
+                limit,
+                after,
+                withCount,
+                exactCount,
+            )
             employers_out = []
-            for employer in employers:
+            for employer in page_rows.rows:
                 employer_dict = remove_private_attributes(employer)
-                employer_dict["provinceId"] = (
-                    employer.province_data.id if employer.province_data else None
-                )
-                employer_dict["provinceName"] = (
-                    employer.province_data.name if employer.province_data else None
-                )
+                province = provinces.get(db, employer.province)
+                employer_dict["provinceId"] = province.id if province else None
+                employer_dict["provinceName"] = province.name if province else None
                 employer_out = EmployerOut.model_validate(employer_dict)
                 employers_out.append(employer_out)
 
-            result = Pagination[EmployerOut].create(
-                employers_out, skip, limit, total_employers
-            )
+            result = Pagination[EmployerOut].from_page(employers_out, page_rows, limit)
         except SQLAlchemyError as e:
             raise BadRequestException(
                 f"Database error while getting employers. Error: {e}"
@@ -142,6 +193,10 @@ class EmployerController:
             db_employer.description = employer.description
             db.commit()
             db.refresh(db_employer)
+
+            # The employer's name is shown with its jobs
+            invalidate_records(db, "employer", [employer_id])
+            invalidate_records(db, "job", [job.id for job in db_employer.jobs_data])
         except IntegrityError:
             raise BadRequestException("Employer already exists")
         except SQLAlchemyError as e:
@@ -163,8 +218,23 @@ class EmployerController:
             raise NotFoundException(detail="Employer not found")
 
         try:
+            # The employer's jobs are deleted with it
+            db_jobs = list(db_employer.jobs_data)
+            job_ids = [job.id for job in db_jobs]
+
+            DailyStatController.record_deleted(db, EmployerModel, [db_employer])
+            DailyStatController.record_deleted(db, JobModel, db_jobs)
             db.delete(db_employer)
             db.commit()
+            row_counter.adjust(EmployerModel, -1)
+            row_counter.adjust(JobModel, -len(job_ids))
+            invalidate_records(db, "employer", [employer_id], counts_changed=True)
+            invalidate_records(db, "job", job_ids, counts_changed=True)
+
+            for job_id in job_ids:
+                job_index.remove(job_id)
+                job_text_index.remove(job_id)
+            mark_index_stale(db, "job", job_ids)
         except SQLAlchemyError as e:
             raise BadRequestException(
                 f"Database error while deleting employer. Error: {e}"
@@ -0,0 +1,87 @@
+import csv
+import io
+import os
+from enum import Enum
+from typing import AsyncIterator, Callable, Iterable, List, Type
+from dotenv import load_dotenv
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import select
+from src.app.config.database.mysql import AsyncMySQLConnection
+
+load_dotenv()
+
+# Exports stream a whole table in one response. The rows are read through a
+# server-side cursor, EXPORT_BATCH_SIZE at a time, and each batch is hydrated
+# and written out before the next one is read, so memory does not grow with
+# the table. MySQL does not allow other queries on a connection while it
+# streams a result, so the batches are hydrated on a second session.
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _csv_row(record: BaseModel, columns: List[str]) -> list:
+    row = record.model_dump(mode="json")
+    # Lists of fields/provinces are written as their names
+    return [
+        (
+            "|".join(item["name"] for item in row[column])
+            if isinstance(row[column], list)
+            else row[column]
+        )
+        for column in columns
+    ]
+
+
+def _csv(rows: Iterable[Iterable]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+async def _export(
+    model, hydrate: Callable, schema: Type[BaseModel], format: ExportFormat
+) -> AsyncIterator[bytes]:
+    columns = list(schema.model_fields)
+    if format == ExportFormat.CSV:
+        yield _csv([columns])
+
+    connection = AsyncMySQLConnection()
+    async with connection.SessionLocal() as stream_db, connection.SessionLocal() as db:
+        result = await stream_db.stream_scalars(
+            select(model)
+            .order_by(model.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for batch in result.partitions():
+            records = await db.run_sync(hydrate, batch)
+            if format == ExportFormat.CSV:
+                yield _csv(_csv_row(record, columns) for record in records)
+            else:
+                yield "".join(
+                    record.model_dump_json() + "\n" for record in records
+                ).encode()
+
+
+def export_response(
+    model, hydrate: Callable, schema: Type[BaseModel], format: ExportFormat, name: str
+) -> StreamingResponse:
+    """Stream every record of the model as NDJSON or CSV, in id order."""
+    return StreamingResponse(
+        _export(model, hydrate, schema, format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{format.value}"'
+        },
+    )
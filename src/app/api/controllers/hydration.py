@@ -0,0 +1,158 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from src.app.api.models.job_model import Job as JobModel
+from src.app.api.models.resume_model import Resume as ResumeModel
+from src.app.api.models.employer_model import Employer as EmployerModel
+from src.app.api.models.seeker_model import Seeker as SeekerModel
+from src.app.api.schemas.job_schema import JobOut
+from src.app.api.schemas.resume_schema import ResumeOut
+from src.app.api.schemas.seeker_schema import SeekerOut
+from src.app.api.models.association_model import (
+    job_field_table,
+    job_province_table,
+    resume_field_table,
+    resume_province_table,
+)
+from src.app.utils.utils import remove_private_attributes
+from src.app.utils.reference_data import ReferenceTable, job_fields, provinces
+
+
+# Hydration resolves the related rows of a whole page in a constant number of
+# bulk queries (one per related table) instead of one query per row. Fields
+# and provinces are named from the in-memory reference data, only the links
+# to them are queried.
+
+
+def _load_links(
+    db: Session,
+    owner_column,
+    target_column,
+    reference: ReferenceTable,
+    owner_ids: Iterable[int],
+) -> Dict[int, List[BaseModel]]:
+    links = defaultdict(list)
+    owner_ids = set(owner_ids)
+    if not owner_ids:
+        return links
+
+    target_ids = defaultdict(list)
+    rows = (
+        db.query(owner_column, target_column).filter(owner_column.in_(owner_ids)).all()
+    )
+    for owner_id, target_id in rows:
+        target_ids[owner_id].append(target_id)
+
+    for owner_id, ids in target_ids.items():
+        links[owner_id] = reference.find(db, ids)
+    return links
+
+
+def load_job_fields(db: Session, job_ids: Iterable[int]) -> Dict[int, List[BaseModel]]:
+    return _load_links(
+        db, job_field_table.c.job_id, job_field_table.c.field_id, job_fields, job_ids
+    )
+
+
+def load_job_provinces(
+    db: Session, job_ids: Iterable[int]
+) -> Dict[int, List[BaseModel]]:
+    return _load_links(
+        db,
+        job_province_table.c.job_id,
+        job_province_table.c.province_id,
+        provinces,
+        job_ids,
+    )
+
+
+def load_resume_fields(
+    db: Session, resume_ids: Iterable[int]
+) -> Dict[int, List[BaseModel]]:
+    return _load_links(
+        db,
+        resume_field_table.c.resume_id,
+        resume_field_table.c.field_id,
+        job_fields,
+        resume_ids,
+    )
+
+
+def load_resume_provinces(
+    db: Session, resume_ids: Iterable[int]
+) -> Dict[int, List[BaseModel]]:
+    return _load_links(
+        db,
+        resume_province_table.c.resume_id,
+        resume_province_table.c.province_id,
+        provinces,
+        resume_ids,
+    )
+
+
+def _load_names(db: Session, model, ids: Iterable[int]) -> Dict[int, str]:
+    ids = set(ids)
+    if not ids:
+        return {}
+
+    rows = db.query(model.id, model.name).filter(model.id.in_(ids)).all()
+    return {row.id: row.name for row in rows}
+
+
+def hydrate_jobs(db: Session, db_jobs: List[JobModel]) -> List[JobOut]:
+    job_ids = [job.id for job in db_jobs]
+    employers = _load_names(db, EmployerModel, (job.employer_id for job in db_jobs))
+    job_field_links = load_job_fields(db, job_ids)
+    job_province_links = load_job_provinces(db, job_ids)
+
+    jobs_out = []
+    for job in db_jobs:
+        job_dict = remove_private_attributes(job)
+        if job.employer_id in employers:
+            job_dict["employerId"] = job.employer_id
+            job_dict["employerName"] = employers[job.employer_id]
+
+        job_dict["expiredAt"] = job_dict["expired_at"]
+        job_dict["fields"] = job_field_links[job.id]
+        job_dict["provinces"] = job_province_links[job.id]
+
+        jobs_out.append(JobOut.model_validate(job_dict))
+
+    return jobs_out
+
+
+def hydrate_resumes(db: Session, db_resumes: List[ResumeModel]) -> List[ResumeOut]:
+    resume_ids = [resume.id for resume in db_resumes]
+    seekers = _load_names(db, SeekerModel, (resume.seeker_id for resume in db_resumes))
+    resume_field_links = load_resume_fields(db, resume_ids)
+    resume_province_links = load_resume_provinces(db, resume_ids)
+
+    resumes_out = []
+    for resume in db_resumes:
+        resume_dict = remove_private_attributes(resume)
+        if resume.seeker_id in seekers:
+            resume_dict["seekerId"] = resume.seeker_id
+            resume_dict["seekerName"] = seekers[resume.seeker_id]
+
+        resume_dict["careerObj"] = resume_dict["career_obj"]
+        resume_dict["fields"] = resume_field_links[resume.id]
+        resume_dict["provinces"] = resume_province_links[resume.id]
+
+        resumes_out.append(ResumeOut.model_validate(resume_dict))
+
+    return resumes_out
+
+
+def hydrate_seekers(db: Session, db_seekers: List[SeekerModel]) -> List[SeekerOut]:
+    seekers_out = []
+    for seeker in db_seekers:
+        seeker_dict = remove_private_attributes(seeker)
+
+        province = provinces.get(db, seeker.province)
+        seeker_dict["provinceId"] = province.id if province else None
+        seeker_dict["provinceName"] = province.name if province else None
+
+        seekers_out.append(SeekerOut.model_validate(seeker_dict))
+
+    return seekers_out
@@ -1,20 +1,38 @@
+import heapq
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from src.app.api.models.job_model import Job as JobModel
 from src.app.api.schemas.job_schema import JobCreate, JobOut, JobUpdate
+from src.app.api.schemas.bulk_schema import BulkCreateResult
 from src.app.api.models.employer_model import Employer as EmployerModel
-from src.app.api.models.job_field_model import JobField as JobFieldModel
-from src.app.api.models.province_model import Province as ProvinceModel
 from src.app.common.custom_exception import (
     NotFoundException,
     BadRequestException,
     ValidationException,
 )
-from src.app.common.pagination import Pagination
+from src.app.api.controllers.hydration import hydrate_jobs
+from src.app.api.controllers.daily_stat_controller import DailyStatController
+from src.app.api.controllers.bulk import (
+    JOB_LINKS,
+    BulkRow,
+    bulk_insert,
+    existing_ids,
+)
+from src.app.common.pagination import Pagination, fetch_page
+from src.app.utils.row_count import row_counter
+from src.app.utils.reference_data import job_fields, provinces
+from src.app.config.cache.invalidation import invalidate_records, mark_index_stale
+from src.app.utils.matching_index import job_index
+from src.app.utils.text_index import job_text_index, tokenize
+from src.app.config.logging.logging_config import logger
+from src.app.api.models.association_model import job_field_table, job_province_table
 from src.app.utils.utils import (
     remove_private_attributes,
-    extract_ids,
     format_str_ids,
+    escape_like,
 )
 
 
@@ -26,16 +44,12 @@ class JobController:
         if not db_employer:
             raise NotFoundException(detail="Employer not found")
 
-        db_fields = (
-            db.query(JobFieldModel).filter(JobFieldModel.id.in_(job.fieldIds)).all()
-        )
+        db_fields = job_fields.attach(db, job.fieldIds)
 
         if not db_fields:
             raise NotFoundException(detail="Field not found")
 
-        db_provinces = (
-            db.query(ProvinceModel).filter(ProvinceModel.id.in_(job.provinceIds)).all()
-        )
+        db_provinces = provinces.attach(db, job.provinceIds)
 
         if not db_provinces:
             raise NotFoundException(detail="Province not found")
@@ -50,12 +64,28 @@ class JobController:
                 fields=format_str_ids(job.fieldIds),
                 provinces=format_str_ids(job.provinceIds),
                 expired_at=job.expiredAt,
+                fields_data=db_fields,
+                provinces_data=db_provinces,
             )
 
             db.add(new_job)
+            DailyStatController.record(db, JobModel, 1)
 
             db.commit()
             db.refresh(new_job)
+            row_counter.adjust(JobModel, 1)
+            invalidate_records(db, "job", [], counts_changed=True)
+
+            job_index.add(
+                new_job.id,
+                new_job.employer_id,
+                new_job.salary,
+                [field.id for field in db_fields],
+                [province.id for province in db_provinces],
+                new_job.expired_at,
+            )
+            job_text_index.add(new_job.id, new_job.title, new_job.description)
+            mark_index_stale(db, "job", [new_job.id])
         except SQLAlchemyError as e:
             raise BadRequestException(f"Database error while creating job. Error: {e}")
         except ValidationException as e:
@@ -63,6 +93,69 @@ class JobController:
 
         return "Job created successfully"
 
+    @staticmethod
+    def prepare_jobs(
+        db: Session, jobs: List[JobCreate]
+    ) -> Tuple[Dict[int, BulkRow], Dict[int, str]]:
+        """Rows of the valid jobs and errors of the others, by position."""
+        employer_ids = existing_ids(db, EmployerModel, (job.employerId for job in jobs))
+
+        rows, errors = {}, {}
+        for index, job in enumerate(jobs):
+            field_ids = [field.id for field in job_fields.find(db, job.fieldIds)]
+            province_ids = [
+                province.id for province in provinces.find(db, job.provinceIds)
+            ]
+
+            if job.employerId not in employer_ids:
+                errors[index] = "Employer not found"
+            elif not field_ids:
+                errors[index] = "Field not found"
+            elif not province_ids:
+                errors[index] = "Province not found"
+            else:
+                rows[index] = BulkRow(
+                    values={
+                        "employer_id": job.employerId,
+                        "title": job.title,
+                        "quantity": job.quantity,
+                        "description": job.description,
+                        "salary": job.salary,
+                        "fields": format_str_ids(job.fieldIds),
+                        "provinces": format_str_ids(job.provinceIds),
+                        "expired_at": job.expiredAt,
+                    },
+                    field_ids=field_ids,
+                    province_ids=province_ids,
+                )
+
+        return rows, errors
+
+    @staticmethod
+    def create_jobs(db: Session, jobs: List[JobCreate]) -> BulkCreateResult:
+        rows, errors = JobController.prepare_jobs(db, jobs)
+        result = bulk_insert(db, JobModel, "job", rows, errors, JOB_LINKS)
+
+        for item in result.items:
+            if item.id is not None:
+                row = rows[item.index]
+                job_index.add(
+                    item.id,
+                    row.values["employer_id"],
+                    row.values["salary"],
+                    row.field_ids,
+                    row.province_ids,
+                    row.values["expired_at"],
+                )
+                job_text_index.add(
+                    item.id, row.values["title"], row.values["description"]
+                )
+        mark_index_stale(
+            db, "job", [item.id for item in result.items if item.id is not None]
+        )
+
+        return result
+
     @staticmethod
     def get_job_by_id(db: Session, job_id: int) -> JobOut:
         try:
@@ -71,93 +164,191 @@ class JobController:
             if not db_job:
                 raise NotFoundException(detail="Job not found")
 
-            job_dict = remove_private_attributes(db_job)
+            job_out = hydrate_jobs(db, [db_job])[0]
 
-            employer = db.query(EmployerModel).get(job_dict["employer_id"])
-            if employer:
-                job_dict["employerId"] = employer.id
-                job_dict["employerName"] = employer.name
-
-            job_dict["expiredAt"] = job_dict["expired_at"]
+        except SQLAlchemyError as e:
+            raise BadRequestException(f"Database error while getting job. Error: {e}")
 
-            job_field_db_ids = extract_ids(db_job.fields)
-            job_province_db_ids = extract_ids(db_job.provinces)
+        return job_out
 
-            db_job_fields = (
-                db.query(JobFieldModel)
-                .filter(JobFieldModel.id.in_(job_field_db_ids))
-                .all()
-            )
-            db_job_provinces = (
-                db.query(ProvinceModel)
-                .filter(ProvinceModel.id.in_(job_province_db_ids))
-                .all()
+    @staticmethod
+    def get_jobs(
+        db: Session,
+        skip: int = 0,
+        limit: int = 10,
+        after: Optional[str] = None,
+        withCount: Optional[bool] = None,
+        exactCount: bool = False,
+    ) -> Pagination[JobOut]:
+        try:
+            page_rows = fetch_page(
+                db.query(JobModel),
+                JobModel.id,
+                skip,
+                limit,
+                after,
+                withCount,
+                exactCount,
             )
+            jobs_out = hydrate_jobs(db, page_rows.rows)
 
-            job_fields_dict = [
-                remove_private_attributes(field) for field in db_job_fields
-            ]
-            job_provinces_dict = [
-                remove_private_attributes(province) for province in db_job_provinces
-            ]
-
-            job_dict["fields"] = job_fields_dict
-            job_dict["provinces"] = job_provinces_dict
+            result = Pagination[JobOut].from_page(jobs_out, page_rows, limit)
+        except SQLAlchemyError as e:
+            raise BadRequestException(f"Database error while getting jobs. Error: {e}")
+        except ValidationException as e:
+            raise ValidationException(f"Error validating job data. Error: {e}")
 
-            job_out = JobOut.model_validate(job_dict)
+        return result
 
+    @staticmethod
+    def build_search_index(db: Session) -> None:
+        # The same jobs as the matching index, whose filters serve the search
+        try:
+            job_text_index.load(
+                db.query(JobModel.id, JobModel.title, JobModel.description)
+                .filter(JobModel.expired_at > datetime.now())
+                .yield_per(10000)
+            )
         except SQLAlchemyError as e:
-            raise BadRequestException(f"Database error while getting job. Error: {e}")
+            raise BadRequestException(
+                f"Database error while building job search index. Error: {e}"
+            )
 
-        return job_out
+        logger.info(f"Job search index built: {job_text_index.stats()}")
 
     @staticmethod
-    def get_jobs(db: Session, skip: int = 0, limit: int = 10) -> Pagination[JobOut]:
+    def refresh_search_index(db: Session, job_ids: List[int]) -> None:
+        """Reload the jobs in the search index, removing deleted or expired ones."""
         try:
-            jobs = db.query(JobModel).offset(skip).limit(limit).all()
-            total_jobs = db.query(JobModel).count()
-            jobs_out = []
-            for job in jobs:
-                job_dict = remove_private_attributes(job)
-                employer = db.query(EmployerModel).get(job_dict["employer_id"])
-                if employer:
-                    job_dict["employerId"] = employer.id
-                    job_dict["employerName"] = employer.name
-
-                job_dict["expiredAt"] = job_dict["expired_at"]
-
-                job_field_db_ids = extract_ids(job.fields)
-                job_province_db_ids = extract_ids(job.provinces)
-
-                db_job_fields = (
-                    db.query(JobFieldModel)
-                    .filter(JobFieldModel.id.in_(job_field_db_ids))
-                    .all()
+            documents = {
+                id: (title, description)
+                for id, title, description in db.query(
+                    JobModel.id, JobModel.title, JobModel.description
+                ).filter(JobModel.id.in_(job_ids), JobModel.expired_at > datetime.now())
+            }
+        except SQLAlchemyError as e:
+            raise BadRequestException(
+                f"Database error while refreshing job search index. Error: {e}"
+            )
+
+        job_text_index.refresh(job_ids, documents)
+
+    @staticmethod
+    def _search_jobs_from_index(
+        q: str,
+        fieldIds: Optional[List[int]],
+        provinceIds: Optional[List[int]],
+        minSalary: Optional[int],
+        maxSalary: Optional[int],
+        skip: int,
+        limit: int,
+    ) -> Tuple[List[int], int]:
+        scores = job_text_index.scores(q)
+        job_ids = job_index.filter(
+            scores.keys(),
+            fieldIds,
+            provinceIds,
+            minSalary,
+            maxSalary,
+            active_at=datetime.now(),
+        )
+        ranked = heapq.nlargest(skip + limit, job_ids, key=lambda id: (scores[id], id))
+        return ranked[skip:], len(job_ids)
+
+    @staticmethod
+    def _search_jobs_from_db(
+        db: Session,
+        q: str,
+        fieldIds: Optional[List[int]],
+        provinceIds: Optional[List[int]],
+        minSalary: Optional[int],
+        maxSalary: Optional[int],
+        skip: int,
+        limit: int,
+    ) -> Tuple[List[int], int]:
+        # Unranked, newest first, the words are matched as typed
+        patterns = [f"%{escape_like(word)}%" for word in q.split()]
+        query = db.query(JobModel.id).filter(
+            JobModel.expired_at > datetime.now(),
+            or_(
+                *(JobModel.title.ilike(pattern, escape="\\") for pattern in patterns),
+                *(
+                    JobModel.description.ilike(pattern, escape="\\")
+                    for pattern in patterns
+                ),
+            ),
+        )
+        if fieldIds is not None:
+            query = query.filter(
+                JobModel.id.in_(
+                    db.query(job_field_table.c.job_id).filter(
+                        job_field_table.c.field_id.in_(fieldIds)
+                    )
                 )
-                db_job_provinces = (
-                    db.query(ProvinceModel)
-                    .filter(ProvinceModel.id.in_(job_province_db_ids))
-                    .all()
+            )
+        if provinceIds is not None:
+            query = query.filter(
+                JobModel.id.in_(
+                    db.query(job_province_table.c.job_id).filter(
+                        job_province_table.c.province_id.in_(provinceIds)
+                    )
                 )
+            )
+        if minSalary is not None:
+            query = query.filter(JobModel.salary >= minSalary)
+        if maxSalary is not None:
+            query = query.filter(JobModel.salary <= maxSalary)
+
+        job_ids = [
+            id
+            for id, in query.order_by(JobModel.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        ]
+        return job_ids, query.count()
 
-                job_fields_dict = [
-                    remove_private_attributes(field) for field in db_job_fields
-                ]
-                job_provinces_dict = [
-                    remove_private_attributes(province) for province in db_job_provinces
-                ]
-
-                job_dict["fields"] = job_fields_dict
-                job_dict["provinces"] = job_provinces_dict
+    @staticmethod
+    def search_jobs(
+        db: Session,
+        q: str,
+        fieldIds: Optional[List[int]] = None,
+        provinceIds: Optional[List[int]] = None,
+        minSalary: Optional[int] = None,
+        maxSalary: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 10,
+    ) -> Pagination[JobOut]:
+        """
+        Jobs that have not expired whose title or description contains words
+        of q, best matches first (BM25), with at least one of the fields, one
+        of the provinces and a salary in [minSalary, maxSalary] when given.
+        """
+        if not tokenize(q):
+            return Pagination[JobOut].create([], skip // limit + 1, limit, 0)
 
-                job_out = JobOut.model_validate(job_dict)
-                jobs_out.append(job_out)
+        try:
+            filters = (fieldIds, provinceIds, minSalary, maxSalary, skip, limit)
+            if job_text_index.ready and job_index.ready:
+                job_ids, total = JobController._search_jobs_from_index(q, *filters)
+            else:
+                job_ids, total = JobController._search_jobs_from_db(db, q, *filters)
+
+            # Hydrated in the order of the ranking
+            positions = {id: position for position, id in enumerate(job_ids)}
+            db_jobs = sorted(
+                db.query(JobModel).filter(JobModel.id.in_(job_ids)).all(),
+                key=lambda job: positions[job.id],
+            )
+            jobs_out = hydrate_jobs(db, db_jobs)
 
-            result = Pagination[JobOut].create(jobs_out, skip, limit, total_jobs)
+            result = Pagination[JobOut].create(
+                jobs_out, skip // limit + 1, limit, total
+            )
         except SQLAlchemyError as e:
-            raise BadRequestException(f"Database error while getting jobs. Error: {e}")
-        except ValidationException as e:
-            raise ValidationException(f"Error validating job data. Error: {e}")
+            raise BadRequestException(
+                f"Database error while searching jobs. Error: {e}"
+            )
 
         return result
 
@@ -175,17 +366,8 @@ class JobController:
         if not db_employer:
             raise NotFoundException(detail="Employer not found")
 
-        job_field_db_ids = extract_ids(db_job.fields)
-        job_province_db_ids = extract_ids(db_job.provinces)
-
-        db_job_fields = (
-            db.query(JobFieldModel).filter(JobFieldModel.id.in_(job_field_db_ids)).all()
-        )
-        db_job_provinces = (
-            db.query(ProvinceModel)
-            .filter(ProvinceModel.id.in_(job_province_db_ids))
-            .all()
-        )
+        db_job_fields = job_fields.attach(db, job.fieldIds)
+        db_job_provinces = provinces.attach(db, job.provinceIds)
 
         if not db_job_fields:
             raise NotFoundException(detail="Field not found")
@@ -200,9 +382,23 @@ class JobController:
             db_job.salary = job.salary
             db_job.fields = format_str_ids(job.fieldIds)
             db_job.provinces = format_str_ids(job.provinceIds)
+            db_job.fields_data = db_job_fields
+            db_job.provinces_data = db_job_provinces
             db_job.expired_at = job.expiredAt
 
             db.commit()
+            invalidate_records(db, "job", [job_id])
+
+            job_index.add(
+                db_job.id,
+                db_job.employer_id,
+                db_job.salary,
+                [field.id for field in db_job_fields],
+                [province.id for province in db_job_provinces],
+                db_job.expired_at,
+            )
+            job_text_index.add(db_job.id, db_job.title, db_job.description)
+            mark_index_stale(db, "job", [job_id])
         except SQLAlchemyError as e:
             raise BadRequestException(f"Database error while updating job. Error: {e}")
         except ValidationException as e:
@@ -218,8 +414,15 @@ class JobController:
             raise NotFoundException(detail="Job not found")
 
         try:
+            DailyStatController.record_deleted(db, JobModel, [db_job])
             db.delete(db_job)
             db.commit()
+            row_counter.adjust(JobModel, -1)
+            invalidate_records(db, "job", [job_id], counts_changed=True)
+
+            job_index.remove(job_id)
+            job_text_index.remove(job_id)
+            mark_index_stale(db, "job", [job_id])
         except SQLAlchemyError as e:
             raise BadRequestException(f"Database error while deleting job. Error: {e}")
 
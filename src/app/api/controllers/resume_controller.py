@@ -1,17 +1,28 @@
+from typing import Dict, List, Optional, Tuple
 from src.app.api.models.resume_model import Resume as ResumeModel
 from src.app.api.schemas.resume_schema import ResumeCreate, ResumeOut, ResumeUpdate
+from src.app.api.schemas.bulk_schema import BulkCreateResult
 from src.app.api.models.seeker_model import Seeker as SeekerModel
-from src.app.api.models.job_field_model import JobField as JobFieldModel
-from src.app.api.models.province_model import Province as ProvinceModel
 from src.app.common.custom_exception import (
     NotFoundException,
     BadRequestException,
     ValidationException,
 )
-from src.app.common.pagination import Pagination
+from src.app.api.controllers.hydration import hydrate_resumes
+from src.app.api.controllers.daily_stat_controller import DailyStatController
+from src.app.api.controllers.bulk import (
+    RESUME_LINKS,
+    BulkRow,
+    bulk_insert,
+    existing_ids,
+)
+from src.app.common.pagination import Pagination, fetch_page
+from src.app.utils.row_count import row_counter
+from src.app.utils.reference_data import job_fields, provinces
+from src.app.config.cache.invalidation import invalidate_records, mark_index_stale
+from src.app.utils.matching_index import resume_index
 from src.app.utils.utils import (
     remove_private_attributes,
-    extract_ids,
     format_str_ids,
 )
 from sqlalchemy.orm import Session
@@ -26,18 +37,12 @@ class ResumeController:
         if not db_seeker:
             raise NotFoundException(detail="Seeker not found")
 
-        db_fields = (
-            db.query(JobFieldModel).filter(JobFieldModel.id.in_(resume.fieldIds)).all()
-        )
+        db_fields = job_fields.attach(db, resume.fieldIds)
 
         if not db_fields:
             raise NotFoundException(detail="Field not found")
 
-        db_provinces = (
-            db.query(ProvinceModel)
-            .filter(ProvinceModel.id.in_(resume.provinceIds))
-            .all()
-        )
+        db_provinces = provinces.attach(db, resume.provinceIds)
 
         if not db_provinces:
             raise NotFoundException(detail="Province not found")
@@ -50,12 +55,26 @@ class ResumeController:
                 salary=resume.salary,
                 fields=format_str_ids(resume.fieldIds),
                 provinces=format_str_ids(resume.provinceIds),
+                fields_data=db_fields,
+                provinces_data=db_provinces,
             )
 
             db.add(new_resume)
+            DailyStatController.record(db, ResumeModel, 1)
 
             db.commit()
             db.refresh(new_resume)
+            row_counter.adjust(ResumeModel, 1)
+            invalidate_records(db, "resume", [], counts_changed=True)
+
+            resume_index.add(
+                new_resume.id,
+                new_resume.seeker_id,
+                new_resume.salary,
+                [field.id for field in db_fields],
+                [province.id for province in db_provinces],
+            )
+            mark_index_stale(db, "resume", [new_resume.id])
         except SQLAlchemyError as e:
             raise BadRequestException(
                 f"Database error while creating resume. Error: {e}"
@@ -68,48 +87,73 @@ class ResumeController:
         return "Resume created successfully"
 
     @staticmethod
-    def get_resume_by_id(db: Session, resume_id: int) -> ResumeOut:
-        try:
-            db_resume = db.query(ResumeModel).get(resume_id)
-
-            if not db_resume:
-                raise NotFoundException(detail="Resume not found")
-
-            resume_dict = remove_private_attributes(db_resume)
+    def prepare_resumes(
+        db: Session, resumes: List[ResumeCreate]
+    ) -> Tuple[Dict[int, BulkRow], Dict[int, str]]:
+        """Rows of the valid resumes and errors of the others, by position."""
+        seeker_ids = existing_ids(
+            db, SeekerModel, (resume.seekerId for resume in resumes)
+        )
 
-            seeker = db.query(SeekerModel).get(resume_dict["seeker_id"])
-            if seeker:
-                resume_dict["seekerId"] = seeker.id
-                resume_dict["seekerName"] = seeker.name
+        rows, errors = {}, {}
+        for index, resume in enumerate(resumes):
+            field_ids = [field.id for field in job_fields.find(db, resume.fieldIds)]
+            province_ids = [
+                province.id for province in provinces.find(db, resume.provinceIds)
+            ]
 
-            resume_dict["careerObj"] = resume_dict["career_obj"]
+            if resume.seekerId not in seeker_ids:
+                errors[index] = "Seeker not found"
+            elif not field_ids:
+                errors[index] = "Field not found"
+            elif not province_ids:
+                errors[index] = "Province not found"
+            else:
+                rows[index] = BulkRow(
+                    values={
+                        "seeker_id": resume.seekerId,
+                        "career_obj": resume.careerObj,
+                        "title": resume.title,
+                        "salary": resume.salary,
+                        "fields": format_str_ids(resume.fieldIds),
+                        "provinces": format_str_ids(resume.provinceIds),
+                    },
+                    field_ids=field_ids,
+                    province_ids=province_ids,
+                )
 
-            resume_field_db_ids = extract_ids(db_resume.fields)
-            resume_province_db_ids = extract_ids(db_resume.provinces)
+        return rows, errors
 
-            db_resume_fields = (
-                db.query(JobFieldModel)
-                .filter(JobFieldModel.id.in_(resume_field_db_ids))
-                .all()
-            )
+    @staticmethod
+    def create_resumes(db: Session, resumes: List[ResumeCreate]) -> BulkCreateResult:
+        rows, errors = ResumeController.prepare_resumes(db, resumes)
+        result = bulk_insert(db, ResumeModel, "resume", rows, errors, RESUME_LINKS)
+
+        for item in result.items:
+            if item.id is not None:
+                row = rows[item.index]
+                resume_index.add(
+                    item.id,
+                    row.values["seeker_id"],
+                    row.values["salary"],
+                    row.field_ids,
+                    row.province_ids,
+                )
+        mark_index_stale(
+            db, "resume", [item.id for item in result.items if item.id is not None]
+        )
 
-            db_resume_provinces = (
-                db.query(ProvinceModel)
-                .filter(ProvinceModel.id.in_(resume_province_db_ids))
-                .all()
-            )
+        return result
 
-            resume_fields_dict = [
-                remove_private_attributes(field) for field in db_resume_fields
-            ]
-            resume_provinces_dict = [
-                remove_private_attributes(province) for province in db_resume_provinces
-            ]
+    @staticmethod
+    def get_resume_by_id(db: Session, resume_id: int) -> ResumeOut:
+        try:
+            db_resume = db.query(ResumeModel).get(resume_id)
 
-            resume_dict["fields"] = resume_fields_dict
-            resume_dict["provinces"] = resume_provinces_dict
+            if not db_resume:
+                raise NotFoundException(detail="Resume not found")
 
-            resume_out = ResumeOut.model_validate(resume_dict)
+            resume_out = hydrate_resumes(db, [db_resume])[0]
 
         except SQLAlchemyError as e:
             raise BadRequestException(
@@ -120,54 +164,26 @@ class ResumeController:
 
     @staticmethod
     def get_resumes(
-        db: Session, skip: int = 0, limit: int = 10
+        db: Session,
+        skip: int = 0,
+        limit: int = 10,
+        after: Optional[str] = None,
+        withCount: Optional[bool] = None,
+        exactCount: bool = False,
     ) -> Pagination[ResumeOut]:
         try:
-            db_resumes = db.query(ResumeModel).offset(skip).limit(limit).all()
-            total_resumes = db.query(ResumeModel).count()
-            resumes_out = []
-            for db_resume in db_resumes:
-                resume_dict = remove_private_attributes(db_resume)
-
-                seeker = db.query(SeekerModel).get(resume_dict["seeker_id"])
-                if seeker:
-                    resume_dict["seekerId"] = seeker.id
-                    resume_dict["seekerName"] = seeker.name
-
-                resume_dict["careerObj"] = resume_dict["career_obj"]
-
-                resume_field_db_ids = extract_ids(db_resume.fields)
-                resume_province_db_ids = extract_ids(db_resume.provinces)
-
-                db_resume_fields = (
-                    db.query(JobFieldModel)
-                    .filter(JobFieldModel.id.in_(resume_field_db_ids))
-                    .all()
-                )
-
-                db_resume_provinces = (
-                    db.query(ProvinceModel)
-                    .filter(ProvinceModel.id.in_(resume_province_db_ids))
-                    .all()
-                )
-
-                resume_fields_dict = [
-                    remove_private_attributes(field) for field in db_resume_fields
-                ]
-                resume_provinces_dict = [
-                    remove_private_attributes(province)
-                    for province in db_resume_provinces
-                ]
-
-                resume_dict["fields"] = resume_fields_dict
-                resume_dict["provinces"] = resume_provinces_dict
-
-                resume_out = ResumeOut.model_validate(resume_dict)
-                resumes_out.append(resume_out)
-
-            result = Pagination[ResumeOut].create(
-                resumes_out, skip, limit, total_resumes
+            page_rows = fetch_page(
+                db.query(ResumeModel),
+                ResumeModel.id,
+                skip,
+                limit,
+                after,
+                withCount,
+                exactCount,
             )
+            resumes_out = hydrate_resumes(db, page_rows.rows)
+
+            result = Pagination[ResumeOut].from_page(resumes_out, page_rows, limit)
         except SQLAlchemyError as e:
             raise BadRequestException(
                 f"Database error while getting resume. Error: {e}"
@@ -193,18 +209,9 @@ class ResumeController:
         if not db_seeker:
             raise NotFoundException(detail="Seeker not found")
 
-        job_field_db_ids = extract_ids(db_resume.fields)
-        job_province_db_ids = extract_ids(db_resume.provinces)
+        db_resume_fields = job_fields.attach(db, resume.fieldIds)
 
-        db_resume_fields = (
-            db.query(JobFieldModel).filter(JobFieldModel.id.in_(job_field_db_ids)).all()
-        )
-
-        db_resume_provinces = (
-            db.query(ProvinceModel)
-            .filter(ProvinceModel.id.in_(job_province_db_ids))
-            .all()
-        )
+        db_resume_provinces = provinces.attach(db, resume.provinceIds)
 
         if not db_resume_fields:
             raise NotFoundException(detail="Field not found")
@@ -218,8 +225,20 @@ class ResumeController:
             db_resume.salary = resume.salary
             db_resume.fields = format_str_ids(resume.fieldIds)
             db_resume.provinces = format_str_ids(resume.provinceIds)
+            db_resume.fields_data = db_resume_fields
+            db_resume.provinces_data = db_resume_provinces
 
             db.commit()
+            invalidate_records(db, "resume", [resume_id])
+
+            resume_index.add(
+                db_resume.id,
+                db_resume.seeker_id,
+                db_resume.salary,
+                [field.id for field in db_resume_fields],
+                [province.id for province in db_resume_provinces],
+            )
+            mark_index_stale(db, "resume", [resume_id])
         except SQLAlchemyError as e:
             raise BadRequestException(
                 f"Database error while updating resume. Error: {e}"
@@ -239,8 +258,14 @@ class ResumeController:
             raise NotFoundException(detail="Resume not found")
 
         try:
+            DailyStatController.record_deleted(db, ResumeModel, [db_resume])
             db.delete(db_resume)
             db.commit()
+            row_counter.adjust(ResumeModel, -1)
+            invalidate_records(db, "resume", [resume_id], counts_changed=True)
+
+            resume_index.remove(resume_id)
+            mark_index_stale(db, "resume", [resume_id])
         except SQLAlchemyError as e:
             raise BadRequestException(
                 f"Database error while deleting resume. Error: {e}"
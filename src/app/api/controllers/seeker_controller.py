@@ -1,19 +1,26 @@
+from typing import Dict, List, Optional, Tuple
 from src.app.api.models.seeker_model import Seeker as SeekerModel
 from src.app.api.schemas.seeker_schema import SeekerCreate, SeekerOut, SeekerUpdate
-from src.app.api.models.province_model import Province as ProvinceModel
-from sqlalchemy.orm import Session, joinedload
+from src.app.api.schemas.bulk_schema import BulkCreateResult
+from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from src.app.common.custom_exception import BadRequestException, NotFoundException
 from pydantic import ValidationError
-from src.app.utils.utils import remove_private_attributes
-from src.app.common.pagination import Pagination
+from src.app.api.controllers.hydration import hydrate_seekers
+from src.app.api.controllers.daily_stat_controller import DailyStatController
+from src.app.api.controllers.bulk import BulkRow, bulk_insert
+from src.app.common.pagination import Pagination, fetch_page
+from src.app.utils.row_count import row_counter
+from src.app.utils.reference_data import provinces
+from src.app.utils.matching_index import resume_index
+from src.app.config.cache.invalidation import invalidate_records, mark_index_stale
 
 
 class SeekerController:
     @staticmethod
     def create_seeker(db: Session, seeker: SeekerCreate) -> str:
         # Check if province exists
-        db_province = db.query(ProvinceModel).get(seeker.provinceId)
+        db_province = provinces.get(db, seeker.provinceId)
 
         if not db_province:
             raise NotFoundException(detail="Province not found")
@@ -27,8 +34,11 @@ class SeekerController:
             )
 
             db.add(db_seeker)
+            DailyStatController.record(db, SeekerModel, 1)
             db.commit()
             db.refresh(db_seeker)
+            row_counter.adjust(SeekerModel, 1)
+            invalidate_records(db, "seeker", [], counts_changed=True)
         except IntegrityError:
             raise BadRequestException("Seeker already exists")
         except SQLAlchemyError as e:
@@ -40,14 +50,36 @@ class SeekerController:
 
         return "Seeker created successfully"
 
+    @staticmethod
+    def prepare_seekers(
+        db: Session, seekers: List[SeekerCreate]
+    ) -> Tuple[Dict[int, BulkRow], Dict[int, str]]:
+        """Rows of the valid seekers and errors of the others, by position."""
+        rows, errors = {}, {}
+        for index, seeker in enumerate(seekers):
+            if not provinces.get(db, seeker.provinceId):
+                errors[index] = "Province not found"
+            else:
+                rows[index] = BulkRow(
+                    values={
+                        "name": seeker.name,
+                        "birthday": seeker.birthday,
+                        "address": seeker.address,
+                        "province": seeker.provinceId,
+                    }
+                )
+
+        return rows, errors
+
+    @staticmethod
+    def create_seekers(db: Session, seekers: List[SeekerCreate]) -> BulkCreateResult:
+        rows, errors = SeekerController.prepare_seekers(db, seekers)
+        return bulk_insert(db, SeekerModel, "seeker", rows, errors)
+
     @staticmethod
     def get_seeker_by_id(db: Session, seeker_id: int) -> SeekerOut:
         try:
-            db_seeker = (
-                db.query(SeekerModel)
-                .options(joinedload(SeekerModel.province_data))
-                .get(seeker_id)
-            )
+            db_seeker = db.query(SeekerModel).get(seeker_id)
         except SQLAlchemyError as e:
             raise BadRequestException(
                 f"Database error while getting seeker. Error: {e}"
@@ -57,14 +89,7 @@ class SeekerController:
             raise NotFoundException(detail="Seeker not found")
 
         try:
-            seeker_dict = remove_private_attributes(db_seeker)
-            seeker_dict["provinceId"] = (
-                db_seeker.province_data.id if db_seeker.province_data else None
-            )
-            seeker_dict["provinceName"] = (
-                db_seeker.province_data.name if db_seeker.province_data else None
-            )
-            seeker_out = SeekerOut.model_validate(seeker_dict)
+            seeker_out = hydrate_seekers(db, [db_seeker])[0]
         except ValidationError as e:
             raise BadRequestException(f"Error validating seeker data. Error: {e}")
 
@@ -72,27 +97,26 @@ class SeekerController:
 
     @staticmethod
     def get_seekers(
-        db: Session, skip: int = 0, limit: int = 100
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[str] = None,
+        withCount: Optional[bool] = None,
+        exactCount: bool = False,
     ) -> Pagination[SeekerOut]:
         try:
-            seekers = db.query(SeekerModel).offset(skip).limit(limit).all()
-            total_seekers = db.query(SeekerModel).count()
-            seekers_out = []
-            for seeker in seekers:
-                seeker_dict = remove_private_attributes(seeker)
-
-                seeker_dict["provinceId"] = (
-                    seeker.province_data.id if seeker.province_data else None
-                )
-                seeker_dict["provinceName"] = (
-                    seeker.province_data.name if seeker.province_data else None
-                )
-                seeker_out = SeekerOut.model_validate(seeker_dict)
-                seekers_out.append(seeker_out)
-
-            result = Pagination[SeekerOut].create(
-                seekers_out, skip, limit, total_seekers
+            page_rows = fetch_page(
+                db.query(SeekerModel),
+                SeekerModel.id,
+                skip,
+                limit,
+                after,
+                withCount,
+                exactCount,
             )
+            seekers_out = hydrate_seekers(db, page_rows.rows)
+
+            result = Pagination[SeekerOut].from_page(seekers_out, page_rows, limit)
         except SQLAlchemyError as e:
             raise BadRequestException(
                 f"Database error while getting seekers. Error: {e}"
@@ -110,7 +134,7 @@ class SeekerController:
             if not db_seeker:
                 raise NotFoundException(detail="Seeker not found")
 
-            db_province = db.query(ProvinceModel).get(seeker.provinceId)
+            db_province = provinces.get(db, seeker.provinceId)
 
             if not db_province:
                 raise NotFoundException(detail="Province not found")
@@ -122,6 +146,12 @@ class SeekerController:
 
             db.commit()
             db.refresh(db_seeker)
+
+            # The seeker's name is shown with its resumes
+            invalidate_records(db, "seeker", [seeker_id])
+            invalidate_records(
+                db, "resume", [resume.id for resume in db_seeker.resume_data]
+            )
         except SQLAlchemyError as e:
             raise BadRequestException(
                 f"Database error while updating seeker. Error: {e}"
@@ -139,8 +169,19 @@ class SeekerController:
             raise NotFoundException(detail="Seeker not found")
 
         try:
+            resume_ids = [resume.id for resume in db_seeker.resume_data]
+
+            DailyStatController.record_deleted(db, SeekerModel, [db_seeker])
             db.delete(db_seeker)
             db.commit()
+            row_counter.adjust(SeekerModel, -1)
+            invalidate_records(db, "seeker", [seeker_id], counts_changed=True)
+            invalidate_records(db, "resume", resume_ids)
+
+            # The seeker's resumes are deleted with it
+            for resume_id in resume_ids:
+                resume_index.remove(resume_id)
+            mark_index_stale(db, "resume", resume_ids)
         except SQLAlchemyError as e:
             raise BadRequestException(
                 f"Database error while deleting seeker. Error: {e}"
@@ -1,11 +1,10 @@
-from typing import List
-from passlib.context import CryptContext
+from typing import List, Optional
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from src.app.api.schemas.user_schema import UserCreate, UserUpdate, UserOut
 from src.app.api.models.user_model import User as UserModel
 from src.app.utils.jwt import create_access_token
-import logging
 from src.app.utils.utils import remove_private_attributes
 from src.app.common.custom_exception import (
     CredentialsException,
@@ -13,33 +12,32 @@ from src.app.common.custom_exception import (
     BadRequestException,
 )
 from src.app.api.schemas.access_token_schema import Payload
-from src.app.common.pagination import Pagination
-
-
-logging.getLogger("passlib").setLevel(logging.ERROR)
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+from src.app.common.pagination import Pagination, fetch_page
+from src.app.utils.row_count import row_counter
+from src.app.config.cache.invalidation import auth_user_key, mark_stale
+from src.app.utils.password_hasher import password_hasher
 
 
 class UserController:
     @staticmethod
-    def authenticate_user(db: Session, username: str, password: str) -> Payload:
+    def get_user_by_username(db: Session, username: str) -> UserModel:
         user = db.query(UserModel).filter(UserModel.username == username).first()
 
         if not user:
             raise NotFoundException("User not found. Please register")
-        if not verify_password(password, user.hashed_password):
+        return user
+
+    @staticmethod
+    async def authenticate_user(
+        db: AsyncSession, username: str, password: str
+    ) -> Payload:
+        # Async, the password is verified off the event loop by password_hasher
+        user = await db.run_sync(UserController.get_user_by_username, username)
+
+        if not await password_hasher.verify(password, user.hashed_password):
             raise CredentialsException("Incorrect username or password")
 
-        access_token = create_access_token(data={"sub": user.id})
+        access_token = create_access_token(data={"sub": user.id, "role": user.role})
         token_data = Payload(
             access_token=access_token,
             token_type="bearer",
@@ -49,11 +47,9 @@ class UserController:
         return token_data
 
     @staticmethod
-    def create_user(db: Session, user: UserCreate) -> UserOut:
-        # Hash the password
-        hashed_password = get_password_hash(user.password)
-
-        # Create the user
+    def create_user(db: Session, user: UserCreate, hashed_password: str) -> UserOut:
+        # Create the user, its password is hashed by the caller off the event
+        # loop (see password_hasher)
         new_user = UserModel(
             username=user.username,
             # email=user.email,
@@ -66,6 +62,7 @@ class UserController:
         try:
             db.commit()
             db.refresh(new_user)
+            row_counter.adjust(UserModel, 1)
         except IntegrityError as e:
             raise BadRequestException("User already exists")
         except SQLAlchemyError as e:
@@ -96,16 +93,32 @@ class UserController:
             raise BadRequestException(f"Failed to retrieve user: {e}")
 
     @staticmethod
-    def get_users(db: Session, skip: int = 0, limit: int = 10) -> Pagination[UserOut]:
+    def get_users(
+        db: Session,
+        skip: int = 0,
+        limit: int = 10,
+        after: Optional[str] = None,
+        withCount: Optional[bool] = None,
+        exactCount: bool = False,
+    ) -> Pagination[UserOut]:
         try:
-            users = db.query(UserModel).offset(skip).limit(limit).all()
-            total_users = db.query(UserModel).count()
+            page_rows = fetch_page(
+                db.query(UserModel),
+                UserModel.id,
+                skip,
+                limit,
+                after,
+                withCount,
+                exactCount,
+            )
             users_out = []
-            for user in users:
+            for user in page_rows.rows:
                 user_dict = remove_private_attributes(user)
                 user_out = UserOut.model_validate(user_dict)
                 users_out.append(user_out)
-            return Pagination[UserOut].create(users_out, skip, limit, total_users)
+            return Pagination[UserOut].from_page(users_out, page_rows, limit)
+        except BadRequestException:
+            raise
         except SQLAlchemyError:
             raise BadRequestException("Failed to retrieve users")
         except Exception as e:
@@ -129,6 +142,7 @@ class UserController:
 
             db.commit()
             db.refresh(db_user)
+            mark_stale(db, keys=[auth_user_key(user_id)])
         except SQLAlchemyError:
             raise BadRequestException("Failed to update user")
         except Exception as e:
@@ -145,6 +159,8 @@ class UserController:
         db.delete(user)
         try:
             db.commit()
+            row_counter.adjust(UserModel, -1)
+            mark_stale(db, keys=[auth_user_key(user_id)])
         except SQLAlchemyError:
             db.rollback()
             raise BadRequestException("Failed to delete user")
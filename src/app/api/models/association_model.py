@@ -0,0 +1,79 @@
+from sqlalchemy import Table, Column, Integer, BigInteger, ForeignKey, Index
+from src.app.config.database.mysql import Base
+
+# Many-to-many links between jobs/resumes and fields/provinces. They replace the
+# "-1-2-3-" strings in jobs.fields, jobs.provinces, resume.fields and
+# resume.provinces, which are still written for backward compatibility.
+# The primary key serves lookups by owner, the reverse index serves matching.
+
+job_field_table = Table(
+    "job_job_field",
+    Base.metadata,
+    Column(
+        "job_id",
+        BigInteger,
+        ForeignKey("jobs.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "field_id",
+        Integer,
+        ForeignKey("job_field.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Index("ix_job_job_field_field_id_job_id", "field_id", "job_id"),
+)
+
+job_province_table = Table(
+    "job_job_province",
+    Base.metadata,
+    Column(
+        "job_id",
+        BigInteger,
+        ForeignKey("jobs.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "province_id",
+        Integer,
+        ForeignKey("job_province.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Index("ix_job_job_province_province_id_job_id", "province_id", "job_id"),
+)
+
+resume_field_table = Table(
+    "resume_job_field",
+    Base.metadata,
+    Column(
+        "resume_id",
+        BigInteger,
+        ForeignKey("resume.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "field_id",
+        Integer,
+        ForeignKey("job_field.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Index("ix_resume_job_field_field_id_resume_id", "field_id", "resume_id"),
+)
+
+resume_province_table = Table(
+    "resume_job_province",
+    Base.metadata,
+    Column(
+        "resume_id",
+        BigInteger,
+        ForeignKey("resume.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "province_id",
+        Integer,
+        ForeignKey("job_province.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Index("ix_resume_job_province_province_id_resume_id", "province_id", "resume_id"),
+)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, Date
+from src.app.config.database.mysql import Base
+
+
+class DailyStat(Base):
+    __tablename__ = "daily_stats"
+
+    date = Column(Date, primary_key=True)
+    num_employer = Column(Integer, nullable=False, default=0)
+    num_job = Column(Integer, nullable=False, default=0)
+    num_seeker = Column(Integer, nullable=False, default=0)
+    num_resume = Column(Integer, nullable=False, default=0)
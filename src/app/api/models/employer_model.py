@@ -11,7 +11,7 @@ class Employer(Base):
     name = Column(String, nullable=False)
     province = Column(Integer, ForeignKey("job_province.id"), nullable=False)
     description = Column(String)
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, default=func.now(), index=True)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
     from .job_model import Job
@@ -1,6 +1,10 @@
 from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, func
 from sqlalchemy.orm import relationship
 from src.app.config.database.mysql import Base
+from src.app.api.models.association_model import (
+    job_field_table,
+    job_province_table,
+)
 
 
 class Job(Base):
@@ -11,11 +15,17 @@ class Job(Base):
     title = Column(String, nullable=False)
     quantity = Column(Integer, nullable=False)
     description = Column(String, nullable=False)
-    salary = Column(Integer, nullable=False)
+    salary = Column(Integer, nullable=False, index=True)
     fields = Column(String, nullable=False)
     provinces = Column(String, nullable=False)
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, default=func.now(), index=True)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
-    expired_at = Column(DateTime, nullable=False)
+    expired_at = Column(DateTime, nullable=False, index=True)
 
     employer_data = relationship("Employer", back_populates="jobs_data")
+    fields_data = relationship(
+        "JobField", secondary=job_field_table, passive_deletes=True
+    )
+    provinces_data = relationship(
+        "Province", secondary=job_province_table, passive_deletes=True
+    )
@@ -1,19 +1,29 @@
 from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, func
 from sqlalchemy.orm import relationship
 from src.app.config.database.mysql import Base
+from src.app.api.models.association_model import (
+    resume_field_table,
+    resume_province_table,
+)
 
 
 class Resume(Base):
     __tablename__ = "resume"
 
     id = Column(BigInteger, primary_key=True, autoincrement=True, index=True)
-    seeker_id = Column(BigInteger, ForeignKey("seeker.id"), nullable=False)
+    seeker_id = Column(BigInteger, ForeignKey("seeker.id"), nullable=False, index=True)
     career_obj = Column(String, nullable=False)
     title = Column(String, nullable=False)
-    salary = Column(Integer, nullable=False)
+    salary = Column(Integer, nullable=False, index=True)
     fields = Column(String, nullable=False)
     provinces = Column(String, nullable=False)
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, default=func.now(), index=True)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
     seeker_data = relationship("Seeker", back_populates="resume_data")
+    fields_data = relationship(
+        "JobField", secondary=resume_field_table, passive_deletes=True
+    )
+    provinces_data = relationship(
+        "Province", secondary=resume_province_table, passive_deletes=True
+    )
@@ -11,7 +11,7 @@ class Seeker(Base):
     birthday = Column(String, nullable=False)  # yyyy-MM-dd
     address = Column(String, nullable=False)
     province = Column(Integer, ForeignKey("job_province.id"), nullable=False)
-    created_at = Column(DateTime, default=func.now())
+    created_at = Column(DateTime, default=func.now(), index=True)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
     from src.app.api.models.resume_model import Resume
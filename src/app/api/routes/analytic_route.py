@@ -1,15 +1,18 @@
-import json
 from fastapi import APIRouter, Depends, Query, status
 from datetime import date
 from src.app.common.api_response import ApiResponse
 from src.app.api.controllers.analytic_controller import AnalyticController
+from typing import List, Optional
 from src.app.api.schemas.analytic_schema import (
     InputTimeFrame,
+    MatchingIndexStats,
     OverallStatistic,
+    SuitableJobs,
     SuitableSeekers,
 )
-from src.app.config.cache.redis import get_redis_cache, set_redis_cache
-from src.app.dependencies import get_current_admin, identify_consumer, get_db
+from src.app.config.cache.route_cache import cached
+from src.app.dependencies import get_current_admin, identify_consumer, get_async_db
+from src.app.common.custom_exception import BadRequestException
 
 
 router = APIRouter(
@@ -26,10 +29,11 @@ input_time_frame = InputTimeFrame(fromDate=date(2022, 1, 1), toDate=date(2022, 1
     status_code=status.HTTP_200_OK,
     response_model=ApiResponse[OverallStatistic],
 )
+@cached("{fromDate}_{toDate}", namespace="overall_statistic")
 async def get_overall_statistic(
     fromDate: date = input_time_frame.fromDate,
     toDate: date = input_time_frame.toDate,
-    db=Depends(get_db),
+    db=Depends(get_async_db),
 ):
     """
     Retrieve the overall statistic within a specified time frame.
@@ -42,17 +46,9 @@ async def get_overall_statistic(
     Returns:
         ApiResponse[OverallStatistic]: The API response containing the overall statistic.
     """
-    cache_key = f"overall_statistic_{fromDate}_{toDate}"
-    cached_statistic = await get_redis_cache(cache_key)
-
-    if cached_statistic is not None:
-        cached_statistic = json.loads(cached_statistic)
-        return ApiResponse[OverallStatistic].success_with_object(
-            object=cached_statistic
-        )
-
-    statistic = AnalyticController.get_overall_statistic(db, fromDate, toDate)
-    await set_redis_cache(cache_key, statistic.model_dump_json())
+    statistic = await db.run_sync(
+        AnalyticController.get_overall_statistic, fromDate, toDate
+    )
     return ApiResponse[OverallStatistic].success_with_object(object=statistic)
 
 
@@ -61,17 +57,73 @@ async def get_overall_statistic(
     status_code=status.HTTP_200_OK,
     response_model=ApiResponse[SuitableSeekers],
 )
+@cached("{job_id}_page_{page}_size_{pageSize}", namespace="suitable_seekers")
 async def get_suitable_seekers(
     job_id: int = Query(..., gt=0),
-    db=Depends(get_db),
+    page: int = Query(1, ge=1),
+    pageSize: int = Query(10, ge=1, le=500),
+    db=Depends(get_async_db),
 ):
-    cache_key = f"suitable_seekers_{job_id}"
-    cached_seekers = await get_redis_cache(cache_key)
+    seekers = await db.run_sync(
+        AnalyticController.find_suitable_seekers, job_id, page, pageSize
+    )
+    return ApiResponse[SuitableSeekers].success_with_object(object=seekers)
 
-    if cached_seekers is not None:
-        cached_seekers = json.loads(cached_seekers)
-        return ApiResponse[SuitableSeekers].success_with_object(object=cached_seekers)
 
-    seekers = AnalyticController.find_suitable_seekers(db, job_id)
-    await set_redis_cache(cache_key, seekers.model_dump_json())
-    return ApiResponse[SuitableSeekers].success_with_object(object=seekers)
+@router.get(
+    "/suitable-jobs",
+    status_code=status.HTTP_200_OK,
+    response_model=ApiResponse[SuitableJobs],
+)
+@cached(
+    "{resume_id}_{seeker_id}_after_{after}_limit_{limit}",
+    namespace="suitable_jobs",
+    # Not served once one of the jobs has expired
+    expires_at=lambda response: min(
+        (job.expiredAt for job in response.object.jobs), default=None
+    ),
+)
+async def get_suitable_jobs(
+    resume_id: Optional[int] = Query(None, gt=0),
+    seeker_id: Optional[int] = Query(None, gt=0),
+    after: Optional[int] = Query(None, gt=0),
+    limit: int = Query(10, ge=1, le=500),
+    db=Depends(get_async_db),
+):
+    """
+    Retrieve the active jobs suitable for a resume, or for any resume of a seeker.
+
+    Args:
+        resume_id (int): The resume to match.
+        seeker_id (int): The seeker whose resumes to match.
+        after (int): The nextAfter value of the previous page.
+        limit (int): The maximum number of jobs to return.
+        db: The database dependency.
+
+    Returns:
+        ApiResponse[SuitableJobs]: The API response containing the suitable jobs.
+    """
+    if resume_id is None and seeker_id is None:
+        raise BadRequestException("Either resume_id or seeker_id is required")
+
+    jobs = await db.run_sync(
+        AnalyticController.find_suitable_jobs, resume_id, seeker_id, after, limit
+    )
+    return ApiResponse[SuitableJobs].success_with_object(object=jobs)
+
+
+@router.get(
+    "/matching-index",
+    status_code=status.HTTP_200_OK,
+    response_model=ApiResponse[List[MatchingIndexStats]],
+)
+async def get_matching_index_stats():
+    """
+    Retrieve the size and approximate memory usage of the in-memory matching indexes.
+
+    Returns:
+        ApiResponse[List[MatchingIndexStats]]: The API response containing the index stats.
+    """
+    return ApiResponse[List[MatchingIndexStats]].success_with_object(
+        object=AnalyticController.get_matching_index_stats()
+    )
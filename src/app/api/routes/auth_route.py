@@ -4,9 +4,10 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.app.utils.jwt import create_access_token
-from src.app.dependencies import get_db
+from src.app.utils.password_hasher import password_hasher
+from src.app.dependencies import get_async_db
 from src.app.api.controllers.user_controller import UserController
 from src.app.api.schemas.user_schema import UserCreate
 from src.app.common.token_response import TokenResponse
@@ -23,15 +24,18 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 )
 async def register(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     user = UserCreate(username=form_data.username, password=form_data.password)
-    new_user = UserController.create_user(db, user=user)
+    hashed_password = await password_hasher.hash(user.password)
+    new_user = await db.run_sync(
+        UserController.create_user, user=user, hashed_password=hashed_password
+    )
 
     expires_delta = timedelta(days=float(os.getenv("JWT_LIFETIME_DAYS")))
 
     access_token = create_access_token(
-        data={"sub": new_user.id},
+        data={"sub": new_user.id, "role": new_user.role},
         expires_delta=expires_delta,
     )
 
@@ -51,15 +55,15 @@ async def register(
 )
 async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    authenticated_user = UserController.authenticate_user(
+    authenticated_user = await UserController.authenticate_user(
         db, form_data.username, form_data.password
     )
 
     access_token_lifespan = timedelta(days=float(os.getenv("JWT_LIFETIME_DAYS")))
     access_token = create_access_token(
-        data={"sub": authenticated_user.user_id},
+        data={"sub": authenticated_user.user_id, "role": authenticated_user.role},
         expires_delta=access_token_lifespan,
     )
 
@@ -1,5 +1,5 @@
-import json
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, Depends, status, Query
 from src.app.api.controllers.employer_controller import EmployerController
 from src.app.api.schemas.employer_schema import (
@@ -7,10 +7,11 @@ from src.app.api.schemas.employer_schema import (
     EmployerUpdate,
     EmployerOut,
 )
+from src.app.api.schemas.bulk_schema import BulkCreate, BulkCreateResult
 from src.app.common.api_response import ApiResponse
 from src.app.common.pagination import Pagination
-from src.app.dependencies import get_db, get_current_user, identify_consumer
-from src.app.config.cache.redis import get_redis_cache, set_redis_cache
+from src.app.dependencies import get_async_db, get_current_user, identify_consumer
+from src.app.config.cache.route_cache import cached
 
 router = APIRouter(
     prefix="/api/v1/employers",
@@ -26,13 +27,26 @@ router = APIRouter(
 )
 async def create_employer(
     employer: EmployerCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     return ApiResponse.success_message_only(
-        message=EmployerController.create_employer(db, employer)
+        message=await db.run_sync(EmployerController.create_employer, employer)
     )
 
 
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=ApiResponse[BulkCreateResult],
+)
+async def create_employers(
+    employers: BulkCreate[EmployerCreate],
+    db: AsyncSession = Depends(get_async_db),
+):
+    result = await db.run_sync(EmployerController.create_employers, employers.items)
+    return ApiResponse[BulkCreateResult].success_with_object(object=result)
+
+
 @router.patch(
     "/{employer_id}",
     status_code=status.HTTP_200_OK,
@@ -41,10 +55,12 @@ async def create_employer(
 async def update_employer(
     employer_id: int,
     employer: EmployerUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     return ApiResponse.success_message_only(
-        message=EmployerController.update_employer_by_id(db, employer_id, employer)
+        message=await db.run_sync(
+            EmployerController.update_employer_by_id, employer_id, employer
+        )
     )
 
 
@@ -53,22 +69,26 @@ async def update_employer(
     status_code=status.HTTP_200_OK,
     response_model=ApiResponse[Pagination[EmployerOut]],
 )
+@cached(
+    "page_{page}_size_{pageSize}_after_{after}_count_{withCount}_{exactCount}",
+    namespace="employers",
+)
 async def get_all_employers(
     page: int = Query(1, ge=1),
     pageSize: int = Query(10, ge=1, le=500),
-    db: Session = Depends(get_db),
+    after: Optional[str] = Query(None),
+    withCount: Optional[bool] = Query(None),
+    exactCount: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    cache_key = f"employers_page_{page}_size_{pageSize}"
-    cached_employers = await get_redis_cache(cache_key)
-
-    if cached_employers is not None:
-        cached_employers = json.loads(cached_employers)
-        return ApiResponse[Pagination[EmployerOut]].success_with_object(
-            object=cached_employers
-        )
-
-    employers = EmployerController.get_employers(db, page, pageSize)
-    await set_redis_cache(cache_key, employers.model_dump_json())
+    employers = await db.run_sync(
+        EmployerController.get_employers,
+        (page - 1) * pageSize,
+        pageSize,
+        after,
+        withCount,
+        exactCount,
+    )
     return ApiResponse[Pagination[EmployerOut]].success_with_object(object=employers)
 
 
@@ -77,16 +97,11 @@ async def get_all_employers(
     status_code=status.HTTP_200_OK,
     response_model=ApiResponse[EmployerOut],
 )
-async def get_employer_by_employer_id(employer_id: int, db: Session = Depends(get_db)):
-    cache_key = f"employer_{employer_id}"
-    cached_employee = await get_redis_cache(cache_key)
-
-    if cached_employee is not None:
-        cached_employee = json.loads(cached_employee)
-        return ApiResponse[EmployerOut].success_with_object(object=cached_employee)
-
-    employer = EmployerController.get_employer_by_id(db, employer_id)
-    await set_redis_cache(cache_key, employer.model_dump_json())
+@cached("employer_{employer_id}")
+async def get_employer_by_employer_id(
+    employer_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    employer = await db.run_sync(EmployerController.get_employer_by_id, employer_id)
     return ApiResponse[EmployerOut].success_with_object(object=employer)
 
 
@@ -95,7 +110,9 @@ async def get_employer_by_employer_id(employer_id: int, db: Session = Depends(ge
     status_code=status.HTTP_200_OK,
     response_model=ApiResponse,
 )
-async def delete_employer_by_id(employer_id: int, db: Session = Depends(get_db)):
+async def delete_employer_by_id(
+    employer_id: int, db: AsyncSession = Depends(get_async_db)
+):
     return ApiResponse.success_message_only(
-        message=EmployerController.delete_employer_by_id(db, employer_id)
+        message=await db.run_sync(EmployerController.delete_employer_by_id, employer_id)
     )
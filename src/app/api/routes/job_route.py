@@ -1,11 +1,23 @@
-from fastapi import APIRouter, Depends, status, Query
+import hashlib
 import json
+from typing import List, Optional
+from fastapi import APIRouter, Depends, status, Query
+from fastapi.responses import StreamingResponse
 from src.app.api.controllers.job_controller import JobController
 from src.app.api.schemas.job_schema import JobCreate, JobOut, JobUpdate
+from src.app.api.schemas.bulk_schema import BulkCreate, BulkCreateResult
+from src.app.api.controllers.export import ExportFormat, export_response
+from src.app.api.controllers.hydration import hydrate_jobs
+from src.app.api.models.job_model import Job as JobModel
 from src.app.common.api_response import ApiResponse
 from src.app.common.pagination import Pagination
-from src.app.dependencies import get_db, get_current_user, identify_consumer
-from src.app.config.cache.redis import get_redis_cache, set_redis_cache
+from src.app.dependencies import (
+    get_async_db,
+    get_current_admin,
+    get_current_user,
+    identify_consumer,
+)
+from src.app.config.cache.route_cache import cached
 
 router = APIRouter(
     prefix="/api/v1/jobs",
@@ -19,25 +31,107 @@ router = APIRouter(
     status_code=status.HTTP_201_CREATED,
     response_model=ApiResponse,
 )
-async def create_job(job: JobCreate, db=Depends(get_db)):
-    return ApiResponse.success_message_only(message=JobController.create_job(db, job))
+async def create_job(job: JobCreate, db=Depends(get_async_db)):
+    return ApiResponse.success_message_only(
+        message=await db.run_sync(JobController.create_job, job)
+    )
+
+
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=ApiResponse[BulkCreateResult],
+)
+async def create_jobs(
+    jobs: BulkCreate[JobCreate],
+    db=Depends(get_async_db),
+):
+    result = await db.run_sync(JobController.create_jobs, jobs.items)
+    return ApiResponse[BulkCreateResult].success_with_object(object=result)
 
 
 @router.get(
-    "/{job_id}",
+    "/export",
     status_code=status.HTTP_200_OK,
-    response_model=ApiResponse[JobOut],
+    response_class=StreamingResponse,
+    dependencies=[Depends(get_current_admin)],
 )
-async def get_job_by_id(job_id: int, db=Depends(get_db)):
-    cache_key = f"job_{job_id}"
-    cached_job = await get_redis_cache(cache_key)
+async def export_jobs(format: ExportFormat = Query(ExportFormat.NDJSON)):
+    """
+    Stream all jobs as NDJSON (one JobOut per line) or CSV, where the
+    fields and provinces are the names joined by "|".
+    """
+    return export_response(JobModel, hydrate_jobs, JobOut, format, "jobs")
+
+
+def _search_key(db, **params) -> str:
+    # The query is free text, its hash keeps the key short and safe
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+    return f"search_{digest}"
 
-    if cached_job is not None:
-        cached_job = json.loads(cached_job)
-        return ApiResponse[JobOut].success_with_object(object=cached_job)
 
-    job = JobController.get_job_by_id(db, job_id)
-    await set_redis_cache(cache_key, job.model_dump_json())
+@router.get(
+    "/search",
+    status_code=status.HTTP_200_OK,
+    response_model=ApiResponse[Pagination[JobOut]],
+)
+@cached(
+    _search_key,
+    namespace="jobs",
+    # Not served once one of the jobs has expired
+    expires_at=lambda response: min(
+        (job.expiredAt for job in response.object.data), default=None
+    ),
+)
+async def search_jobs(
+    q: str = Query(..., min_length=1, max_length=200),
+    fieldIds: Optional[List[int]] = Query(None),
+    provinceIds: Optional[List[int]] = Query(None),
+    minSalary: Optional[int] = Query(None, ge=0),
+    maxSalary: Optional[int] = Query(None, ge=0),
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    db=Depends(get_async_db),
+):
+    """
+    Search the jobs that have not expired by the words of their title and
+    description, best matches first. Accents are ignored ("ha noi" finds
+    "Hà Nội").
+
+    Args:
+        q (str): The words to search for.
+        fieldIds (List[int]): Only jobs in at least one of these fields.
+        provinceIds (List[int]): Only jobs in at least one of these provinces.
+        minSalary (int): The minimum salary.
+        maxSalary (int): The maximum salary.
+        page (int): The page number.
+        limit (int): The maximum number of jobs per page.
+        db: The database dependency.
+
+    Returns:
+        ApiResponse[Pagination[JobOut]]: The API response containing the jobs.
+    """
+    jobs = await db.run_sync(
+        JobController.search_jobs,
+        q,
+        fieldIds,
+        provinceIds,
+        minSalary,
+        maxSalary,
+        (page - 1) * limit,
+        limit,
+    )
+    return ApiResponse[Pagination[JobOut]].success_with_object(object=jobs)
+
+
+@router.get(
+    "/{job_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=ApiResponse[JobOut],
+)
+@cached("job_{job_id}")
+async def get_job_by_id(job_id: int, db=Depends(get_async_db)):
+    job = await db.run_sync(JobController.get_job_by_id, job_id)
     return ApiResponse[JobOut].success_with_object(object=job)
 
 
@@ -46,20 +140,21 @@ async def get_job_by_id(job_id: int, db=Depends(get_db)):
     status_code=status.HTTP_200_OK,
     response_model=ApiResponse[Pagination[JobOut]],
 )
+@cached(
+    "page_{page}_limit_{limit}_after_{after}_count_{withCount}_{exactCount}",
+    namespace="jobs",
+)
 async def get_jobs(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1),
-    db=Depends(get_db),
+    after: Optional[str] = Query(None),
+    withCount: Optional[bool] = Query(None),
+    exactCount: bool = Query(False),
+    db=Depends(get_async_db),
 ):
-    cache_key = f"jobs_page_{page}_limit_{limit}"
-    cached_jobs = await get_redis_cache(cache_key)
-
-    if cached_jobs is not None:
-        cached_jobs = json.loads(cached_jobs)
-        return ApiResponse[Pagination[JobOut]].success_with_object(object=cached_jobs)
-
-    jobs = JobController.get_jobs(db, page, limit)
-    await set_redis_cache(cache_key, jobs.model_dump_json())
+    jobs = await db.run_sync(
+        JobController.get_jobs, (page - 1) * limit, limit, after, withCount, exactCount
+    )
     return ApiResponse[Pagination[JobOut]].success_with_object(object=jobs)
 
 
@@ -68,9 +163,9 @@ async def get_jobs(
     status_code=status.HTTP_200_OK,
     response_model=ApiResponse,
 )
-async def update_job(job_id: int, job: JobUpdate, db=Depends(get_db)):
+async def update_job(job_id: int, job: JobUpdate, db=Depends(get_async_db)):
     return ApiResponse.success_message_only(
-        message=JobController.update_job_by_id(db, job_id, job)
+        message=await db.run_sync(JobController.update_job_by_id, job_id, job)
     )
 
 
@@ -79,7 +174,7 @@ async def update_job(job_id: int, job: JobUpdate, db=Depends(get_db)):
     status_code=status.HTTP_200_OK,
     response_model=ApiResponse,
 )
-async def delete_job(job_id: int, db=Depends(get_db)):
+async def delete_job(job_id: int, db=Depends(get_async_db)):
     return ApiResponse.success_message_only(
-        message=JobController.delete_job_by_id(db, job_id)
+        message=await db.run_sync(JobController.delete_job_by_id, job_id)
     )
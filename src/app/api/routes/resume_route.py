@@ -1,11 +1,21 @@
-import json
+from typing import Optional
 from fastapi import APIRouter, Depends, status, Query
+from fastapi.responses import StreamingResponse
 from src.app.api.controllers.resume_controller import ResumeController
 from src.app.api.schemas.resume_schema import ResumeCreate, ResumeOut, ResumeUpdate
+from src.app.api.schemas.bulk_schema import BulkCreate, BulkCreateResult
+from src.app.api.controllers.export import ExportFormat, export_response
+from src.app.api.controllers.hydration import hydrate_resumes
+from src.app.api.models.resume_model import Resume as ResumeModel
 from src.app.common.api_response import ApiResponse
 from src.app.common.pagination import Pagination
-from src.app.dependencies import get_db, get_current_user, identify_consumer
-from src.app.config.cache.redis import get_redis_cache, set_redis_cache
+from src.app.dependencies import (
+    get_async_db,
+    get_current_admin,
+    get_current_user,
+    identify_consumer,
+)
+from src.app.config.cache.route_cache import cached
 
 router = APIRouter(
     prefix="/api/v1/resumes",
@@ -19,27 +29,47 @@ router = APIRouter(
     status_code=status.HTTP_201_CREATED,
     response_model=ApiResponse,
 )
-async def create_resume(resume: ResumeCreate, db=Depends(get_db)):
+async def create_resume(resume: ResumeCreate, db=Depends(get_async_db)):
     return ApiResponse.success_message_only(
-        message=ResumeController.create_resume(db, resume)
+        message=await db.run_sync(ResumeController.create_resume, resume)
     )
 
 
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=ApiResponse[BulkCreateResult],
+)
+async def create_resumes(
+    resumes: BulkCreate[ResumeCreate],
+    db=Depends(get_async_db),
+):
+    result = await db.run_sync(ResumeController.create_resumes, resumes.items)
+    return ApiResponse[BulkCreateResult].success_with_object(object=result)
+
+
 @router.get(
-    "/{resume_id}",
+    "/export",
     status_code=status.HTTP_200_OK,
-    response_model=ApiResponse,
+    response_class=StreamingResponse,
+    dependencies=[Depends(get_current_admin)],
 )
-async def get_resume_by_id(resume_id: int, db=Depends(get_db)):
-    cache_key = f"resume_{resume_id}"
-    cached_resume = await get_redis_cache(cache_key)
+async def export_resumes(format: ExportFormat = Query(ExportFormat.NDJSON)):
+    """
+    Stream all resumes as NDJSON (one ResumeOut per line) or CSV, where the
+    fields and provinces are the names joined by "|".
+    """
+    return export_response(ResumeModel, hydrate_resumes, ResumeOut, format, "resumes")
 
-    if cached_resume is not None:
-        cached_resume = json.loads(cached_resume)
-        return ApiResponse.success_with_object(object=cached_resume)
 
-    resume = ResumeController.get_resume_by_id(db, resume_id)
-    await set_redis_cache(cache_key, resume.model_dump_json())
+@router.get(
+    "/{resume_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=ApiResponse,
+)
+@cached("resume_{resume_id}")
+async def get_resume_by_id(resume_id: int, db=Depends(get_async_db)):
+    resume = await db.run_sync(ResumeController.get_resume_by_id, resume_id)
     return ApiResponse.success_with_object(object=resume)
 
 
@@ -48,22 +78,26 @@ async def get_resume_by_id(resume_id: int, db=Depends(get_db)):
     status_code=status.HTTP_200_OK,
     response_model=ApiResponse[Pagination[ResumeOut]],
 )
+@cached(
+    "page_{page}_limit_{limit}_after_{after}_count_{withCount}_{exactCount}",
+    namespace="resumes",
+)
 async def get_resumes(
     page: int = Query(1, gt=0),
     limit: int = Query(10, gt=0),
-    db=Depends(get_db),
+    after: Optional[str] = Query(None),
+    withCount: Optional[bool] = Query(None),
+    exactCount: bool = Query(False),
+    db=Depends(get_async_db),
 ):
-    cache_key = f"resumes_page_{page}_limit_{limit}"
-    cached_resumes = await get_redis_cache(cache_key)
-
-    if cached_resumes is not None:
-        cached_resumes = json.loads(cached_resumes)
-        return ApiResponse[Pagination[ResumeOut]].success_with_object(
-            object=cached_resumes
-        )
-
-    resumes = ResumeController.get_resumes(db, page, limit)
-    await set_redis_cache(cache_key, resumes.model_dump_json())
+    resumes = await db.run_sync(
+        ResumeController.get_resumes,
+        (page - 1) * limit,
+        limit,
+        after,
+        withCount,
+        exactCount,
+    )
     return ApiResponse[Pagination[ResumeOut]].success_with_object(object=resumes)
 
 
@@ -72,9 +106,11 @@ async def get_resumes(
     status_code=status.HTTP_200_OK,
     response_model=ApiResponse,
 )
-async def update_resume(resume_id: int, resume: ResumeUpdate, db=Depends(get_db)):
+async def update_resume(resume_id: int, resume: ResumeUpdate, db=Depends(get_async_db)):
     return ApiResponse.success_message_only(
-        message=ResumeController.update_resume_by_id(db, resume_id, resume)
+        message=await db.run_sync(
+            ResumeController.update_resume_by_id, resume_id, resume
+        )
     )
 
 
@@ -83,7 +119,7 @@ async def update_resume(resume_id: int, resume: ResumeUpdate, db=Depends(get_db)
     status_code=status.HTTP_200_OK,
     response_model=ApiResponse,
 )
-async def delete_resume(resume_id: int, db=Depends(get_db)):
+async def delete_resume(resume_id: int, db=Depends(get_async_db)):
     return ApiResponse.success_message_only(
-        message=ResumeController.delete_resume_by_id(db, resume_id)
+        message=await db.run_sync(ResumeController.delete_resume_by_id, resume_id)
     )
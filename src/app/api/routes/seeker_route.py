@@ -1,11 +1,21 @@
-import json
+from typing import Optional
 from fastapi import APIRouter, Depends, status, Query
+from fastapi.responses import StreamingResponse
 from src.app.api.controllers.seeker_controller import SeekerController
 from src.app.api.schemas.seeker_schema import SeekerCreate, SeekerOut, SeekerUpdate
+from src.app.api.schemas.bulk_schema import BulkCreate, BulkCreateResult
+from src.app.api.controllers.export import ExportFormat, export_response
+from src.app.api.controllers.hydration import hydrate_seekers
+from src.app.api.models.seeker_model import Seeker as SeekerModel
 from src.app.common.api_response import ApiResponse
 from src.app.common.pagination import Pagination
-from src.app.dependencies import get_db, get_current_user, identify_consumer
-from src.app.config.cache.redis import get_redis_cache, set_redis_cache
+from src.app.dependencies import (
+    get_async_db,
+    get_current_admin,
+    get_current_user,
+    identify_consumer,
+)
+from src.app.config.cache.route_cache import cached
 
 router = APIRouter(
     prefix="/api/v1/seekers",
@@ -19,27 +29,44 @@ router = APIRouter(
     status_code=status.HTTP_201_CREATED,
     response_model=ApiResponse,
 )
-async def create_seeker(seeker: SeekerCreate, db=Depends(get_db)):
+async def create_seeker(seeker: SeekerCreate, db=Depends(get_async_db)):
     return ApiResponse.success_message_only(
-        message=SeekerController.create_seeker(db, seeker)
+        message=await db.run_sync(SeekerController.create_seeker, seeker)
     )
 
 
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=ApiResponse[BulkCreateResult],
+)
+async def create_seekers(
+    seekers: BulkCreate[SeekerCreate],
+    db=Depends(get_async_db),
+):
+    result = await db.run_sync(SeekerController.create_seekers, seekers.items)
+    return ApiResponse[BulkCreateResult].success_with_object(object=result)
+
+
 @router.get(
-    "/{seeker_id}",
+    "/export",
     status_code=status.HTTP_200_OK,
-    response_model=ApiResponse[SeekerOut],
+    response_class=StreamingResponse,
+    dependencies=[Depends(get_current_admin)],
 )
-async def get_seeker_by_id(seeker_id: int, db=Depends(get_db)):
-    cache_key = f"seeker_{seeker_id}"
-    cached_seeker = await get_redis_cache(cache_key)
+async def export_seekers(format: ExportFormat = Query(ExportFormat.NDJSON)):
+    """Stream all seekers as NDJSON (one SeekerOut per line) or CSV."""
+    return export_response(SeekerModel, hydrate_seekers, SeekerOut, format, "seekers")
 
-    if cached_seeker is not None:
-        cached_seeker = json.loads(cached_seeker)
-        return ApiResponse[SeekerOut].success_with_object(object=cached_seeker)
 
-    seeker = SeekerController.get_seeker_by_id(db, seeker_id)
-    await set_redis_cache(cache_key, seeker.model_dump_json())
+@router.get(
+    "/{seeker_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=ApiResponse[SeekerOut],
+)
+@cached("seeker_{seeker_id}")
+async def get_seeker_by_id(seeker_id: int, db=Depends(get_async_db)):
+    seeker = await db.run_sync(SeekerController.get_seeker_by_id, seeker_id)
     return ApiResponse[SeekerOut].success_with_object(object=seeker)
 
 
@@ -48,22 +75,26 @@ async def get_seeker_by_id(seeker_id: int, db=Depends(get_db)):
     status_code=status.HTTP_200_OK,
     response_model=ApiResponse[Pagination[SeekerOut]],
 )
+@cached(
+    "page_{page}_size_{pageSize}_after_{after}_count_{withCount}_{exactCount}",
+    namespace="seekers",
+)
 async def get_seekers(
     page: int = Query(1, ge=1),
     pageSize: int = Query(10, ge=1, le=500),
-    db=Depends(get_db),
+    after: Optional[str] = Query(None),
+    withCount: Optional[bool] = Query(None),
+    exactCount: bool = Query(False),
+    db=Depends(get_async_db),
 ):
-    cache_key = f"seekers_page_{page}_size_{pageSize}"
-    cached_seekers = await get_redis_cache(cache_key)
-
-    if cached_seekers is not None:
-        cached_seekers = json.loads(cached_seekers)
-        return ApiResponse[Pagination[SeekerOut]].success_with_object(
-            object=cached_seekers
-        )
-
-    seekers = SeekerController.get_seekers(db, page, pageSize)
-    await set_redis_cache(cache_key, seekers.model_dump_json())
+    seekers = await db.run_sync(
+        SeekerController.get_seekers,
+        (page - 1) * pageSize,
+        pageSize,
+        after,
+        withCount,
+        exactCount,
+    )
     return ApiResponse[Pagination[SeekerOut]].success_with_object(object=seekers)
 
 
@@ -72,9 +103,11 @@ async def get_seekers(
     status_code=status.HTTP_200_OK,
     response_model=ApiResponse,
 )
-async def update_seeker(seeker_id: int, seeker: SeekerUpdate, db=Depends(get_db)):
+async def update_seeker(seeker_id: int, seeker: SeekerUpdate, db=Depends(get_async_db)):
     return ApiResponse.success_message_only(
-        message=SeekerController.update_seeker_by_id(db, seeker_id, seeker)
+        message=await db.run_sync(
+            SeekerController.update_seeker_by_id, seeker_id, seeker
+        )
     )
 
 
@@ -83,7 +116,7 @@ async def update_seeker(seeker_id: int, seeker: SeekerUpdate, db=Depends(get_db)
     status_code=status.HTTP_200_OK,
     response_model=ApiResponse,
 )
-async def delete_seeker(seeker_id: int, db=Depends(get_db)):
+async def delete_seeker(seeker_id: int, db=Depends(get_async_db)):
     return ApiResponse.success_message_only(
-        message=SeekerController.delete_seeker_by_id(db, seeker_id)
+        message=await db.run_sync(SeekerController.delete_seeker_by_id, seeker_id)
     )
@@ -1,12 +1,13 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.app.api.controllers.user_controller import UserController
-from src.app.api.schemas.user_schema import UserUpdate, UserOut
+from src.app.api.schemas.user_schema import CurrentUser, UserUpdate, UserOut
 from src.app.common.pagination import Pagination
 from src.app.common.api_response import ApiResponse
 from src.app.dependencies import (
     get_current_user,
-    get_db,
+    get_async_db,
     get_current_admin,
     identify_consumer,
 )
@@ -24,12 +25,12 @@ router = APIRouter(
 )
 async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserOut = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     if current_user.role != "admin" and current_user.id != user_id:
         raise ForbiddenException
-    user = UserController.get_user_by_id(db, user_id=user_id)
+    user = await db.run_sync(UserController.get_user_by_id, user_id=user_id)
     return ApiResponse[UserOut].success_with_object(object=user)
 
 
@@ -42,9 +43,19 @@ async def get_user(
 async def get_all_users(
     page: int = Query(1, ge=1),
     pageSize: int = Query(10, ge=1, le=500),
-    db: Session = Depends(get_db),
+    after: Optional[str] = Query(None),
+    withCount: Optional[bool] = Query(None),
+    exactCount: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    users = UserController.get_users(db, page, pageSize)
+    users = await db.run_sync(
+        UserController.get_users,
+        (page - 1) * pageSize,
+        pageSize,
+        after,
+        withCount,
+        exactCount,
+    )
     return ApiResponse[Pagination[UserOut]].success_with_object(object=users)
 
 
@@ -56,14 +67,16 @@ async def get_all_users(
 async def update_user(
     user_id: int,
     user: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: UserOut = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     if current_user.id != user_id:
         raise ForbiddenException
 
     return ApiResponse[UserOut].success_message_only(
-        message=UserController.update_user_by_id(db, user_id=user_id, user=user)
+        message=await db.run_sync(
+            UserController.update_user_by_id, user_id=user_id, user=user
+        )
     )
 
 
@@ -72,12 +85,12 @@ async def update_user(
 )
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserOut = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     if current_user.id != user_id and current_user.role != "admin":
         raise ForbiddenException
 
     return ApiResponse[str].success_message_only(
-        message=UserController.delete_user_by_id(db, user_id=user_id)
+        message=await db.run_sync(UserController.delete_user_by_id, user_id=user_id)
     )
@@ -1,8 +1,9 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 from datetime import date
 from src.app.api.schemas.job_schema import JobOut
 from src.app.api.schemas.seeker_schema import SeekerOut
+from src.app.common.pagination import PaginationMeta
 
 
 class InputTimeFrame(BaseModel):
@@ -28,3 +29,20 @@ class OverallStatistic(BaseModel):
 
 class SuitableSeekers(JobOut):
     seekers: List[SeekerOut]
+    pagination: PaginationMeta
+
+
+class SuitableJobs(BaseModel):
+    resumeIds: List[int]
+    jobs: List[JobOut]
+    nextAfter: Optional[int] = None
+
+
+class MatchingIndexStats(BaseModel):
+    name: str
+    ready: bool
+    numEntries: int
+    numFields: int
+    numProvinces: int
+    numPostings: int
+    approxBytes: int
@@ -0,0 +1,27 @@
+import os
+from dotenv import load_dotenv
+from pydantic import BaseModel, Field
+from typing import Generic, List, Optional, TypeVar
+
+load_dotenv()
+
+ItemT = TypeVar("ItemT")
+
+# Largest number of records accepted by a bulk create request
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "10000"))
+
+
+class BulkCreate(BaseModel, Generic[ItemT]):
+    items: List[ItemT] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BulkItemResult(BaseModel):
+    index: int = Field(..., description="Position of the item in the request")
+    id: Optional[int] = Field(None, description="Id of the created record")
+    error: Optional[str] = Field(None, description="Why the item was not created")
+
+
+class BulkCreateResult(BaseModel):
+    created: int
+    failed: int
+    items: List[BulkItemResult]
@@ -20,9 +20,13 @@ class UserUpdate(UserBase):
     role: Optional[UserRole]
 
 
-class UserOut(BaseModel):
+class CurrentUser(BaseModel):
+    # Authenticated user, the fields may come from the claims of the token
     id: int
     role: UserRole
+
+
+class UserOut(CurrentUser):
     created_at: datetime
     updated_at: datetime
 
@@ -49,6 +49,15 @@ class BadRequestException(ApiException):
         )
 
 
+class ServiceUnavailableException(ApiException):
+    def __init__(self, detail: str = "Service unavailable. Try again later."):
+        super().__init__(
+            status_code=ErrorCode.SERVICE_UNAVAILABLE.value,
+            detail=detail,
+            errorCode=ErrorCode.SERVICE_UNAVAILABLE,
+        )
+
+
 class UnprocessableEntityException(ApiException):
     def __init__(self, detail: str = "Unprocessable entity"):
         super().__init__(
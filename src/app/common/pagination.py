@@ -1,15 +1,91 @@
+import base64
+import binascii
+import json
 from math import ceil
-from typing import Type, TypeVar, Generic, List
+from typing import Type, TypeVar, Generic, List, NamedTuple, Optional
 from pydantic import BaseModel
+from .custom_exception import BadRequestException
+from src.app.utils.row_count import row_counter
 
 DataT = TypeVar("DataT")
 
 
 class PaginationMeta(BaseModel):
-    page: int
+    page: Optional[int] = None
     pageSize: int
-    totalElements: int
-    totalPages: int
+    totalElements: Optional[int] = None
+    totalPages: Optional[int] = None
+    nextCursor: Optional[str] = None
+
+
+# Cursors are opaque to clients: base64 of the JSON list of the sort key values
+# of the last row of the previous page
+def encode_cursor(*values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise BadRequestException("Invalid cursor")
+
+    if not isinstance(values, list) or not values:
+        raise BadRequestException("Invalid cursor")
+    return values
+
+
+class PageRows(NamedTuple):
+    rows: list
+    page: Optional[int]
+    totalElements: Optional[int]
+    nextCursor: Optional[str]
+
+
+def fetch_page(
+    query,
+    id_column,
+    skip: int = 0,
+    limit: int = 10,
+    after: Optional[str] = None,
+    withCount: Optional[bool] = None,
+    exactCount: bool = False,
+) -> PageRows:
+    """
+    Fetch one page of the unfiltered query of a table in ascending id order.
+
+    With an "after" cursor the page starts right after the row it points to
+    (keyset pagination, constant cost at any depth), otherwise after skipping
+    "skip" rows. The total is included when withCount is set, by default only
+    in offset mode. It comes from the row counter, which may lag behind recent
+    writes, unless exactCount asks for a fresh COUNT(*).
+    """
+    if withCount is None:
+        withCount = after is None or exactCount
+    totalElements = (
+        row_counter.count(query, id_column.class_, exactCount) if withCount else None
+    )
+
+    if after is not None:
+        values = decode_cursor(after)
+        if len(values) != 1 or not isinstance(values[0], int):
+            raise BadRequestException("Invalid cursor")
+
+        last_id = values[0]
+        page = None
+        query = query.filter(id_column > last_id).order_by(id_column)
+    else:
+        page = skip // limit + 1
+        query = query.order_by(id_column).offset(skip)
+
+    # One extra row tells whether there is a next page
+    rows = query.limit(limit + 1).all()
+    nextCursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        nextCursor = encode_cursor(rows[-1].id)
+
+    return PageRows(rows, page, totalElements, nextCursor)
 
 
 class Pagination(BaseModel, Generic[DataT]):
@@ -25,18 +101,39 @@ class Pagination(BaseModel, Generic[DataT]):
     def create(
         cls: Type["Pagination[DataT]"],
         data: List[DataT],
-        page: int,
+        page: Optional[int],
         pageSize: int,
-        totalElements: int,
+        totalElements: Optional[int],
+        nextCursor: Optional[str] = None,
     ) -> "Pagination[DataT]":
         pagination = PaginationMeta(
             page=page,
             pageSize=pageSize,
             totalElements=totalElements,
-            totalPages=cls.totalPages(totalElements, pageSize),
+            totalPages=(
+                cls.totalPages(totalElements, pageSize)
+                if totalElements is not None
+                else None
+            ),
+            nextCursor=nextCursor,
         )
         return cls(data=data, pagination=pagination)
 
+    @classmethod
+    def from_page(
+        cls: Type["Pagination[DataT]"],
+        data: List[DataT],
+        page_rows: PageRows,
+        pageSize: int,
+    ) -> "Pagination[DataT]":
+        return cls.create(
+            data,
+            page_rows.page,
+            pageSize,
+            page_rows.totalElements,
+            page_rows.nextCursor,
+        )
+
     class ConfigDict:
         json_schema_extra = {
             "example": {
@@ -51,6 +148,7 @@ class Pagination(BaseModel, Generic[DataT]):
                     "pageSize": 10,
                     "totalElements": 1,
                     "totalPages": 1,
+                    "nextCursor": None,
                 },
             }
         }
@@ -0,0 +1,80 @@
+from typing import Iterable
+from sqlalchemy.orm import Session
+
+# Cached results are invalidated in two ways:
+# - entity keys ("response_job_1", "response_employer_2", ...) are deleted,
+# - pages of lists and analytic results live in versioned namespaces: their
+#   keys embed the namespace version, which is bumped to make all of them stale
+#   at once (the old keys then expire on their own).
+#
+# Controllers only record what their changes make stale on the session; the
+# records are applied once the request's database work is done, see
+# dependencies.get_async_db.
+#
+# Each worker also keeps in-memory indexes of the resumes and jobs, which its
+# writes update in place. The ids of the records whose index entries changed
+# are recorded too: every worker reloads their entries before the namespaces
+# are bumped, see redis.publish_index_refresh.
+
+# Prefix of the keys of cached API responses
+RESPONSE_KEY_PREFIX = "response_"
+
+STALE_KEYS = "stale_cache_keys"
+STALE_NAMESPACES = "stale_cache_namespaces"
+STALE_INDEX_IDS = "stale_index_ids"
+
+# Namespaces of the cached results that show each kind of record
+DERIVED_NAMESPACES = {
+    "employer": ("employers", "jobs", "suitable_seekers", "suitable_jobs"),
+    "job": ("jobs", "suitable_seekers", "suitable_jobs"),
+    "seeker": ("seekers", "resumes", "suitable_seekers", "suitable_jobs"),
+    "resume": ("resumes", "suitable_seekers", "suitable_jobs"),
+}
+
+# Namespace of the results counting records per day
+COUNT_NAMESPACE = "overall_statistic"
+
+
+def entity_key(kind: str, id: int) -> str:
+    return f"{RESPONSE_KEY_PREFIX}{kind}_{id}"
+
+
+def auth_user_key(id: int) -> str:
+    # Authenticated users, kept in the local cache only (see dependencies)
+    return f"auth_user_{id}"
+
+
+def mark_stale(
+    db: Session, keys: Iterable[str] = (), namespaces: Iterable[str] = ()
+) -> None:
+    db.info.setdefault(STALE_KEYS, set()).update(keys)
+    db.info.setdefault(STALE_NAMESPACES, set()).update(namespaces)
+
+
+def invalidate_records(
+    db: Session, kind: str, ids: Iterable[int], counts_changed: bool = False
+) -> None:
+    """
+    Record that records of a kind changed: their entity keys and the results
+    derived from them are stale, as well as the per-day counts when records
+    were created or deleted.
+    """
+    namespaces = list(DERIVED_NAMESPACES[kind])
+    if counts_changed:
+        namespaces.append(COUNT_NAMESPACE)
+    mark_stale(db, (entity_key(kind, id) for id in ids), namespaces)
+
+
+def mark_index_stale(db: Session, kind: str, ids: Iterable[int]) -> None:
+    """Record that the index entries of records of a kind changed."""
+    ids = set(ids)
+    if ids:
+        db.info.setdefault(STALE_INDEX_IDS, {}).setdefault(kind, set()).update(ids)
+
+
+def pop_stale(db: Session):
+    return (
+        db.info.pop(STALE_KEYS, set()),
+        db.info.pop(STALE_NAMESPACES, set()),
+        db.info.pop(STALE_INDEX_IDS, {}),
+    )
@@ -0,0 +1,98 @@
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, NamedTuple, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class LocalCacheEntry(NamedTuple):
+    value: Any
+    size: int
+    expires_at: float
+
+
+class LocalCache:
+    """
+    In-process LRU cache with a time to live, kept in front of Redis.
+
+    A hit costs no network round-trip. The cache is bounded both in number of
+    entries and in bytes, the size of an entry being given by the caller
+    (the length of its payload). Values are shared between requests and must
+    not be mutated.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        self._entries: "OrderedDict[str, LocalCacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    self._pop(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(
+        self, key: str, value: Any, size: int, ttl_seconds: Optional[float] = None
+    ) -> None:
+        if size > self.max_bytes:
+            return
+
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = LocalCacheEntry(
+                value, size, time.monotonic() + ttl_seconds
+            )
+            self._bytes += size
+
+            # Evict the least recently used entries
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "numEntries": len(self._entries),
+                "numBytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Usage
+local_cache = LocalCache(
+    max_entries=int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", "10000")),
+    max_bytes=int(os.getenv("LOCAL_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    ttl_seconds=float(os.getenv("LOCAL_CACHE_TTL", "30")),
+)
@@ -1,41 +1,470 @@
 from src.app.config.logging.logging_config import logger
+from src.app.config.cache.local_cache import local_cache
+import asyncio
+import json
+import math
+import random
+import time
 import redis
+import redis.asyncio as aioredis
 import os
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+)
 from dotenv import load_dotenv
 
 load_dotenv()
 
 host = os.getenv("REDIS_HOST", "localhost")
-port = os.getenv("REDIS_PORT", 6379)
+port = int(os.getenv("REDIS_PORT", 6379))
 password = os.getenv("REDIS_PASSWORD")
+pool_size = int(os.getenv("REDIS_POOL_SIZE", "50"))
+# Seconds to wait for a free connection of the pool
+pool_timeout = float(os.getenv("REDIS_POOL_TIMEOUT", "1"))
+socket_timeout = float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.5"))
+connect_timeout = float(os.getenv("REDIS_CONNECT_TIMEOUT", "1"))
+# Cached results are invalidated on writes, the TTL only reclaims memory
+cache_ttl = int(os.getenv("CACHE_TTL_SECONDS", str(6 * 3600)))
+# Seconds an expired result is still served while it is recomputed
+stale_ttl = int(os.getenv("CACHE_STALE_SECONDS", "300"))
+# Early refresh eagerness, 1 is the usual value, higher refreshes earlier
+refresh_beta = float(os.getenv("CACHE_REFRESH_BETA", "1"))
+# Lifetime of the lock of a result being computed
+lock_seconds = float(os.getenv("CACHE_LOCK_SECONDS", "10"))
+lock_poll_seconds = 0.05
+# Seconds a write waits for every worker to update its in-memory indexes
+index_sync_seconds = float(os.getenv("INDEX_SYNC_SECONDS", "2"))
+index_sync_poll_seconds = 0.005
+
+# Check connection
+try:
+    with redis.Redis(
+        host=host,
+        port=port,
+        password=password,
+        db=0,
+        socket_connect_timeout=connect_timeout,
+    ) as check_client:
+        if check_client.ping():
+            logger.info(f"Connected to Redis server at {host} on port {port}")
+except redis.ConnectionError:
+    logger.error("Error connecting to Redis server: ", exc_info=True)
+    exit(1)
 
-# Set up Redis client
-redis_client = redis.Redis(
+# Set up Redis client, requests share the connections of a bounded pool and
+# wait for a free one instead of opening more
+redis_pool = aioredis.BlockingConnectionPool(
     host=host,
     port=port,
     password=password,
     db=0,
     decode_responses=True,
+    max_connections=pool_size,
+    timeout=pool_timeout,
+    socket_timeout=socket_timeout,
+    socket_connect_timeout=connect_timeout,
 )
+redis_client = aioredis.Redis(connection_pool=redis_pool)
 
-# Check connection
-try:
-    if redis_client.ping():
-        logger.info(f"Connected to Redis server at {host} on port {port}")
-except redis.ConnectionError:
-    logger.error("Error connecting to Redis server: ", exc_info=True)
-    exit(1)
+
+# Cache failures are never fatal: reads miss and writes are skipped
 
 
 async def get_redis_cache(key: str):
     try:
-        return redis_client.get(key)
+        return await redis_client.get(key)
     except redis.RedisError:
         return None
 
 
-async def set_redis_cache(key: str, value: str, ex_seconds: int = 3600):
+async def set_redis_cache(key: str, value: str, ex_seconds: int = cache_ttl):
     try:
-        redis_client.set(key, value, ex=ex_seconds)
+        await redis_client.set(key, value, ex=ex_seconds)
     except redis.RedisError:
         pass
+
+
+async def mget_redis_cache(keys: List[str]) -> List[Optional[str]]:
+    if not keys:
+        return []
+    try:
+        return await redis_client.mget(keys)
+    except redis.RedisError:
+        return [None] * len(keys)
+
+
+async def mset_redis_cache(values: Dict[str, str], ex_seconds: int = cache_ttl):
+    # MSET has no expiry, so the SETs are sent in one pipeline round-trip
+    if not values:
+        return
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key, value in values.items():
+                pipe.set(key, value, ex=ex_seconds)
+            await pipe.execute()
+    except redis.RedisError:
+        pass
+
+
+# Two-tier cache: the in-process local cache (L1) in front of Redis (L2).
+# Deleted keys are published so that every worker drops them from its L1.
+# The channel also carries the changes of the in-memory indexes of the
+# workers: {"refreshIndexes": {kind: [id, ...]}} when records changed, and
+# {"rebuildIndexes": [kind, ...]} when records were written outside the API.
+INVALIDATION_CHANNEL = "cache_invalidation"
+REFRESH_INDEXES = "refreshIndexes"
+REBUILD_INDEXES = "rebuildIndexes"
+# Key the workers count their handling of an index message in
+ACK_KEY = "ackKey"
+
+
+class CacheEntry(NamedTuple):
+    payload: bytes
+    # Time (epoch seconds) until which the payload is fresh
+    fresh_until: float
+    # Seconds it took to compute the payload
+    compute_seconds: float
+
+    def should_refresh(self, now: float) -> bool:
+        # Probabilistic early expiration ("XFetch"): the closer to fresh_until
+        # and the slower to compute, the more likely a request refreshes the
+        # entry ahead of time, so that concurrent requests rarely all miss
+        early = -self.compute_seconds * refresh_beta * math.log(1 - random.random())
+        return now + early >= self.fresh_until
+
+
+def _encode_entry(entry: CacheEntry) -> str:
+    return f"{entry.fresh_until} {entry.compute_seconds}\n{entry.payload.decode()}"
+
+
+def _decode_entry(value: str) -> Optional[CacheEntry]:
+    try:
+        header, payload = value.split("\n", 1)
+        fresh_until, compute_seconds = map(float, header.split(" "))
+    except ValueError:
+        return None
+    return CacheEntry(payload.encode(), fresh_until, compute_seconds)
+
+
+async def get_cache(key: str) -> Optional[CacheEntry]:
+    entry = local_cache.get(key)
+    if entry is not None:
+        return entry
+
+    value = await get_redis_cache(key)
+    entry = _decode_entry(value) if value is not None else None
+    if entry is not None:
+        local_cache.set(key, entry, len(entry.payload))
+    return entry
+
+
+async def set_cache(key: str, entry: CacheEntry, ex_seconds: int):
+    local_cache.set(
+        key, entry, len(entry.payload), min(local_cache.ttl_seconds, ex_seconds)
+    )
+    await set_redis_cache(key, _encode_entry(entry), ex_seconds)
+
+
+class Expiring(NamedTuple):
+    """A computed payload that must not be served after expires_in seconds."""
+
+    payload: bytes
+    expires_in: float
+
+
+# Requests computing a key in this process, and the futures of their results
+_in_flight: Dict[str, "asyncio.Future[bytes]"] = {}
+
+
+async def _compute_and_set(
+    key: str, compute: Callable[[], Awaitable[Union[bytes, Expiring]]], ttl: int
+) -> bytes:
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+    try:
+        started = time.monotonic()
+        payload = await compute()
+        compute_seconds = time.monotonic() - started
+
+        # Neither fresh nor stale past the expiry of the payload
+        fresh_seconds, keep_seconds = ttl, ttl + stale_ttl
+        if isinstance(payload, Expiring):
+            payload, expires_in = payload
+            fresh_seconds = min(fresh_seconds, expires_in)
+            keep_seconds = min(keep_seconds, math.floor(expires_in))
+
+        if keep_seconds > 0:
+            entry = CacheEntry(payload, time.time() + fresh_seconds, compute_seconds)
+            await set_cache(key, entry, keep_seconds)
+        future.set_result(payload)
+        return payload
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark the exception as retrieved when nobody else waits for it
+        future.exception()
+        raise
+    finally:
+        del _in_flight[key]
+
+
+async def _acquire_lock(key: str) -> Optional[str]:
+    token = os.urandom(8).hex()
+    try:
+        acquired = await redis_client.set(
+            f"lock_{key}", token, nx=True, px=int(lock_seconds * 1000)
+        )
+    except redis.RedisError:
+        # Without Redis, each process computes on its own
+        return token
+    return token if acquired else None
+
+
+async def _release_lock(key: str, token: str):
+    try:
+        await redis_client.eval(RELEASE_LOCK_SCRIPT, 1, f"lock_{key}", token)
+    except redis.RedisError:
+        pass
+
+
+# Delete the lock only if it is still ours, it may have expired meanwhile
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+async def get_or_compute(
+    key: str,
+    compute: Callable[[], Awaitable[Union[bytes, Expiring]]],
+    ttl: int = cache_ttl,
+) -> bytes:
+    """
+    Cached payload of the key, computed by compute() when missing.
+
+    Concurrent misses of a key are coalesced: within a process they wait for
+    the request computing it, across processes the request holding a Redis
+    lock computes it while the others poll the cache. Once fresh for ttl
+    seconds, an entry is still served for stale_ttl seconds while a single
+    request recomputes it (stale-while-revalidate); that request may also
+    refresh it slightly ahead of time (probabilistic early expiration).
+    A payload returned as Expiring is kept no longer than its expiry.
+    """
+    entry = await get_cache(key)
+    if entry is not None:
+        if not entry.should_refresh(time.time()) or key in _in_flight:
+            return entry.payload
+
+        # Refresh unless another process does, serving the stale payload
+        token = await _acquire_lock(key)
+        if token is None:
+            return entry.payload
+        try:
+            return await _compute_and_set(key, compute, ttl)
+        finally:
+            await _release_lock(key, token)
+
+    if key in _in_flight:
+        return await asyncio.shield(_in_flight[key])
+
+    token = await _acquire_lock(key)
+    if token is None:
+        # Another process computes the key, wait for its result
+        deadline = time.monotonic() + lock_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(lock_poll_seconds)
+            entry = await get_cache(key)
+            if entry is not None:
+                return entry.payload
+            if key in _in_flight:
+                return await asyncio.shield(_in_flight[key])
+        return await _compute_and_set(key, compute, ttl)
+
+    try:
+        return await _compute_and_set(key, compute, ttl)
+    finally:
+        await _release_lock(key, token)
+
+
+async def delete_cache(*keys: str):
+    if not keys:
+        return
+
+    local_cache.delete(*keys)
+    try:
+        await redis_client.delete(*keys)
+        await redis_client.publish(INVALIDATION_CHANNEL, json.dumps(keys))
+    except redis.RedisError:
+        logger.warning(f"Error invalidating cache keys {keys}", exc_info=True)
+
+
+# Versioned namespaces, see config.cache.invalidation
+
+
+def _version_key(namespace: str) -> str:
+    return f"cache_version_{namespace}"
+
+
+async def versioned_key(namespace: str, suffix: str) -> str:
+    """Cache key of a result in the current version of the namespace."""
+    version_key = _version_key(namespace)
+    version = local_cache.get(version_key)
+    if version is None:
+        version = int(await get_redis_cache(version_key) or 0)
+        local_cache.set(version_key, version, len(version_key))
+    return f"{namespace}_v{version}_{suffix}"
+
+
+async def bump_namespaces(*namespaces: str):
+    if not namespaces:
+        return
+
+    version_keys = [_version_key(namespace) for namespace in namespaces]
+    local_cache.delete(*version_keys)
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for version_key in version_keys:
+                pipe.incr(version_key)
+            await pipe.execute()
+        await redis_client.publish(INVALIDATION_CHANNEL, json.dumps(version_keys))
+    except redis.RedisError:
+        logger.warning(f"Error bumping cache namespaces {namespaces}", exc_info=True)
+
+
+async def _publish_and_wait(message: dict) -> None:
+    """
+    Publish an index message and wait, at most index_sync_seconds, until
+    every worker listening has handled it.
+    """
+    ack_key = f"index_ack_{os.urandom(8).hex()}"
+    try:
+        receivers = await redis_client.publish(
+            INVALIDATION_CHANNEL, json.dumps({**message, ACK_KEY: ack_key})
+        )
+        deadline = time.monotonic() + index_sync_seconds
+        while int(await redis_client.get(ack_key) or 0) < receivers:
+            if time.monotonic() >= deadline:
+                logger.warning(f"Workers did not all handle index message {message}")
+                return
+            await asyncio.sleep(index_sync_poll_seconds)
+    except redis.RedisError:
+        logger.warning(f"Error publishing index message {message}", exc_info=True)
+
+
+async def publish_index_refresh(ids: Dict[str, Iterable[int]]):
+    """
+    Ask every worker to reload the index entries of the ids, per kind of
+    records, from the database, and wait until they did.
+    """
+    if ids:
+        await _publish_and_wait(
+            {
+                REFRESH_INDEXES: {
+                    kind: sorted(kind_ids) for kind, kind_ids in ids.items()
+                }
+            }
+        )
+
+
+async def publish_index_rebuild(*kinds: str):
+    """
+    Ask every worker to rebuild its in-memory indexes of the kinds of records,
+    and wait until they stopped using them.
+    """
+    if kinds:
+        await _publish_and_wait({REBUILD_INDEXES: list(kinds)})
+
+
+async def apply_invalidations(keys, namespaces, index_ids=None):
+    # The cached results computed from the indexes are only made stale once
+    # every worker updated its indexes, or they could be recomputed by a
+    # worker that misses the change
+    await publish_index_refresh(index_ids or {})
+    await delete_cache(*keys)
+    await bump_namespaces(*namespaces)
+
+
+class IndexHandlers(NamedTuple):
+    # Rebuilds the indexes of the kinds, all of them when None; called in
+    # the listener, it must only schedule the rebuild
+    rebuild: Callable[[Optional[List[str]]], None]
+    # Reloads the index entries of the ids per kind
+    refresh: Callable[[Dict[str, List[int]]], Awaitable[None]]
+
+
+async def _handle_invalidation(data: str, index_handlers: Optional[IndexHandlers]):
+    message = json.loads(data)
+    if not isinstance(message, dict):
+        local_cache.delete(*message)
+        return
+
+    try:
+        if index_handlers is not None:
+            if REFRESH_INDEXES in message:
+                await index_handlers.refresh(message[REFRESH_INDEXES])
+            else:
+                index_handlers.rebuild(message[REBUILD_INDEXES])
+    finally:
+        # The publisher waits for every worker, even those that failed
+        if ACK_KEY in message:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.incr(message[ACK_KEY])
+                pipe.expire(message[ACK_KEY], 60)
+                await pipe.execute()
+
+
+async def listen_cache_invalidation(index_handlers: Optional[IndexHandlers] = None):
+    """
+    Drop the keys deleted by any worker from the local cache, and apply the
+    changes of the indexes with index_handlers, until cancelled.
+    """
+    disconnected = False
+    while True:
+        try:
+            async with redis_client.pubsub() as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                if disconnected and index_handlers is not None:
+                    # Index messages may have been missed while disconnected
+                    index_handlers.rebuild(None)
+                disconnected = False
+
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message is None:
+                        continue
+
+                    # A bad message must not stop the listener, the local
+                    # cache would never be invalidated again
+                    try:
+                        await _handle_invalidation(message["data"], index_handlers)
+                    except redis.RedisError:
+                        raise
+                    except Exception:
+                        logger.error(
+                            f"Error handling cache invalidation {message['data']!r}",
+                            exc_info=True,
+                        )
+        except redis.RedisError:
+            # Invalidations may have been missed while disconnected
+            logger.warning("Cache invalidation listener disconnected", exc_info=True)
+            local_cache.clear()
+            disconnected = True
+            await asyncio.sleep(1)
+
+
+async def close_redis_cache():
+    await redis_client.aclose()
+    await redis_pool.disconnect()
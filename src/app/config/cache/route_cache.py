@@ -0,0 +1,59 @@
+import functools
+from datetime import datetime
+from typing import Callable, Optional, Union
+from fastapi import Response
+from src.app.common.api_response import ApiResponse
+from src.app.config.cache.invalidation import RESPONSE_KEY_PREFIX
+from src.app.config.cache.redis import (
+    Expiring,
+    cache_ttl,
+    get_or_compute,
+    versioned_key,
+)
+
+
+def cached(
+    key: Union[str, Callable[..., str]],
+    namespace: Optional[str] = None,
+    ttl: int = cache_ttl,
+    expires_at: Optional[Callable[[ApiResponse], Optional[datetime]]] = None,
+):
+    """
+    Cache the serialized response of a GET route.
+
+    key is a format string over the route's parameters ("job_{job_id}") or a
+    function of them returning the key. With a namespace, the key lives in its
+    current version (see config.cache.invalidation). Concurrent misses run the
+    route once (see get_or_compute). A hit is sent as is, without parsing or
+    validating it, so the route must return an ApiResponse whose serialization
+    matches its response_model.
+
+    Results that depend on the time, such as lists of jobs that have not
+    expired, give expires_at: the time, taken from the response, after which
+    it must not be served any more (None when it does not expire).
+    """
+
+    def decorator(route):
+        @functools.wraps(route)
+        async def wrapper(**kwargs):
+            suffix = key(**kwargs) if callable(key) else key.format(**kwargs)
+            cache_key = (
+                await versioned_key(namespace, f"{RESPONSE_KEY_PREFIX}{suffix}")
+                if namespace is not None
+                else f"{RESPONSE_KEY_PREFIX}{suffix}"
+            )
+
+            async def compute() -> Union[bytes, Expiring]:
+                response: ApiResponse = await route(**kwargs)
+                payload = response.model_dump_json().encode()
+                expiry = expires_at(response) if expires_at is not None else None
+                if expiry is None:
+                    return payload
+                return Expiring(payload, (expiry - datetime.now()).total_seconds())
+
+            payload = await get_or_compute(cache_key, compute, ttl)
+            return Response(content=payload, media_type="application/json")
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,212 @@
+import asyncio
+import csv
+import json
+import time
+from itertools import islice
+from typing import (
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    TextIO,
+    Tuple,
+    Type,
+    get_origin,
+)
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy.orm import Session
+from src.app.api.controllers.bulk import (
+    BULK_CHUNK_SIZE,
+    JOB_LINKS,
+    RESUME_LINKS,
+    LinkTables,
+    bulk_insert,
+)
+from src.app.api.controllers.employer_controller import EmployerController
+from src.app.api.controllers.job_controller import JobController
+from src.app.api.controllers.resume_controller import ResumeController
+from src.app.api.controllers.seeker_controller import SeekerController
+from src.app.api.models.employer_model import Employer as EmployerModel
+from src.app.api.models.job_model import Job as JobModel
+from src.app.api.models.resume_model import Resume as ResumeModel
+from src.app.api.models.seeker_model import Seeker as SeekerModel
+from src.app.api.schemas.employer_schema import EmployerCreate
+from src.app.api.schemas.job_schema import JobCreate
+from src.app.api.schemas.resume_schema import ResumeCreate
+from src.app.api.schemas.seeker_schema import SeekerCreate
+from src.app.config.cache.invalidation import pop_stale
+from src.app.config.cache.redis import (
+    apply_invalidations,
+    close_redis_cache,
+    publish_index_rebuild,
+)
+from src.app.config.logging.logging_config import logger
+
+# Usage: python import_data.py {employers,jobs,seekers,resumes} FILE
+#
+# Loads CSV or NDJSON files of records in the format of the create endpoints
+# (the *Create schemas; in CSV, fieldIds and provinceIds are ids joined by "|").
+# The file is read batch by batch, so memory does not grow with its size. Each
+# batch is validated in one call, then goes through the bulk create path of the
+# API: foreign keys checked in set-based queries, chunked multi-row INSERTs and
+# one commit per chunk. Invalid records are counted, and written with their line
+# number to the errors file when one is given.
+#
+# Once the import is done, running API workers are asked to rebuild their
+# in-memory matching and search indexes of the imported kind of records; they
+# answer from SQL queries until the rebuild is done.
+
+
+class ImportTarget(NamedTuple):
+    schema: Type[BaseModel]
+    model: type
+    kind: str
+    prepare: Callable
+    links: Optional[LinkTables] = None
+
+
+TARGETS = {
+    "employers": ImportTarget(
+        EmployerCreate, EmployerModel, "employer", EmployerController.prepare_employers
+    ),
+    "jobs": ImportTarget(
+        JobCreate, JobModel, "job", JobController.prepare_jobs, JOB_LINKS
+    ),
+    "seekers": ImportTarget(
+        SeekerCreate, SeekerModel, "seeker", SeekerController.prepare_seekers
+    ),
+    "resumes": ImportTarget(
+        ResumeCreate,
+        ResumeModel,
+        "resume",
+        ResumeController.prepare_resumes,
+        RESUME_LINKS,
+    ),
+}
+
+FORMATS = ("csv", "ndjson")
+
+
+def read_records(file: TextIO, format: str, schema: Type[BaseModel]) -> Iterator:
+    """Line number and raw record (a dict, or the JSON text) of each record."""
+    if format == "ndjson":
+        for line_number, line in enumerate(file, 1):
+            if line.strip():
+                yield line_number, line
+        return
+
+    list_columns = [
+        name
+        for name, field in schema.model_fields.items()
+        if get_origin(field.annotation) is list
+    ]
+    reader = csv.DictReader(file)
+    for record in reader:
+        for column in list_columns:
+            value = record.get(column)
+            record[column] = value.split("|") if value else []
+        yield reader.line_num, record
+
+
+def _error_message(e: ValidationError) -> str:
+    messages = []
+    for error in e.errors():
+        location = ".".join(str(part) for part in error["loc"])
+        messages.append(f"{location}: {error['msg']}" if location else error["msg"])
+    return "; ".join(messages)
+
+
+def validate_batch(
+    schema: Type[BaseModel], adapter: TypeAdapter, format: str, raws: list
+) -> Tuple[dict, dict]:
+    """
+    Items and errors of the raw records, by position. The whole batch is
+    validated in one call, records are only validated one by one to find the
+    invalid ones of a batch that fails.
+    """
+    try:
+        if format == "ndjson":
+            items = adapter.validate_json("[" + ",".join(raws) + "]")
+        else:
+            items = adapter.validate_python(raws)
+        return dict(enumerate(items)), {}
+    except ValidationError:
+        pass
+
+    items, errors = {}, {}
+    for index, raw in enumerate(raws):
+        try:
+            if format == "ndjson":
+                items[index] = schema.model_validate_json(raw)
+            else:
+                items[index] = schema.model_validate(raw)
+        except ValidationError as e:
+            errors[index] = _error_message(e)
+    return items, errors
+
+
+def import_file(
+    db: Session,
+    target: ImportTarget,
+    file: TextIO,
+    format: str,
+    batch_size: int = BULK_CHUNK_SIZE,
+    errors_file: Optional[TextIO] = None,
+) -> Tuple[int, int]:
+    """Import the records of the file, returns the numbers created and failed."""
+    adapter = TypeAdapter(List[target.schema])
+    records = read_records(file, format, target.schema)
+    created = failed = 0
+    start = time.monotonic()
+
+    while batch := list(islice(records, batch_size)):
+        line_numbers = [line_number for line_number, _ in batch]
+        items, errors = validate_batch(
+            target.schema, adapter, format, [raw for _, raw in batch]
+        )
+
+        # Positions in the batch of the valid items, to report their errors
+        positions = sorted(items)
+        rows, row_errors = target.prepare(db, [items[i] for i in positions])
+        result = bulk_insert(
+            db, target.model, target.kind, rows, row_errors, target.links
+        )
+        errors.update(
+            (positions[item.index], item.error)
+            for item in result.items
+            if item.error is not None
+        )
+
+        created += result.created
+        failed += len(errors)
+        if errors_file is not None:
+            for position, error in sorted(errors.items()):
+                record = {"line": line_numbers[position], "error": error}
+                errors_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        elapsed = max(time.monotonic() - start, 1e-6)
+        logger.info(
+            f"Imported {created} {target.kind}s, {failed} failed "
+            f"({(created + failed) / elapsed:.0f} records/s)"
+        )
+
+    return created, failed
+
+
+def apply_cache_invalidations(db: Session, kind: str) -> None:
+    # The results cached by the API that show the imported records are stale,
+    # and so are the indexes they are computed from. The rebuild is published
+    # first, so that workers stop using the indexes before recomputing them.
+    async def apply():
+        try:
+            # The imported records are not in the index ids, whole indexes
+            # are rebuilt
+            keys, namespaces, _ = pop_stale(db)
+            if namespaces:
+                await publish_index_rebuild(kind)
+            await apply_invalidations(keys, namespaces)
+        finally:
+            await close_redis_cache()
+
+    asyncio.run(apply())
@@ -0,0 +1,171 @@
+from datetime import date
+from sqlalchemy import func, inspect
+from sqlalchemy.orm import Session
+from src.app.config.database.mysql import Base, MySQLConnection
+from src.app.config.logging.logging_config import logger
+from src.app.api.models.employer_model import Employer as EmployerModel
+from src.app.api.models.job_model import Job as JobModel
+from src.app.api.models.seeker_model import Seeker as SeekerModel
+from src.app.api.models.resume_model import Resume as ResumeModel
+from src.app.api.models.job_field_model import JobField as JobFieldModel
+from src.app.api.models.province_model import Province as ProvinceModel
+from src.app.api.models.daily_stat_model import DailyStat as DailyStatModel
+from src.app.api.controllers.daily_stat_controller import (
+    DAILY_STAT_COLUMNS,
+    DailyStatController,
+)
+from src.app.api.models.association_model import (
+    job_field_table,
+    job_province_table,
+    resume_field_table,
+    resume_province_table,
+)
+from src.app.utils.utils import extract_ids
+
+# Usage: python -m src.app.config.database.migrations
+#
+# Creates the job/resume <-> field/province association tables (with their
+# indexes) and the daily_stats rollup, adds the indexes declared on the models
+# to the tables imported from the database dump, backfills the association
+# tables from the legacy "-1-2-3-" string columns and recomputes daily_stats.
+# Safe to run repeatedly: existing indexes and links are skipped and the rollup
+# is rebuilt from the source tables.
+
+NEW_TABLES = [
+    job_field_table,
+    job_province_table,
+    resume_field_table,
+    resume_province_table,
+    DailyStatModel.__table__,
+]
+
+
+INDEXED_TABLES = [
+    EmployerModel.__table__,
+    JobModel.__table__,
+    SeekerModel.__table__,
+    ResumeModel.__table__,
+]
+
+
+def create_new_tables(engine) -> None:
+    Base.metadata.create_all(bind=engine, tables=NEW_TABLES)
+
+
+def create_missing_indexes(engine) -> None:
+    # create_all() skips existing tables, so indexes added to their models later
+    # have to be created one by one
+    inspector = inspect(engine)
+    for table in INDEXED_TABLES:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        primary_key = [column.name for column in table.primary_key.columns]
+        for index in table.indexes:
+            # The primary key is already indexed by the dump
+            if [column.name for column in index.columns] == primary_key:
+                continue
+            if index.name not in existing:
+                index.create(bind=engine)
+                logger.info(f"Created index {index.name} on {table.name}")
+
+
+def _backfill(
+    db: Session,
+    model,
+    field_table,
+    province_table,
+    owner_key: str,
+    field_ids: set,
+    province_ids: set,
+    chunk_size: int,
+) -> int:
+    last_id = 0
+    total = 0
+    while True:
+        rows = (
+            db.query(model.id, model.fields, model.provinces)
+            .filter(model.id > last_id)
+            .order_by(model.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        # Skip ids that point to deleted fields/provinces to satisfy the FKs
+        field_links = [
+            {owner_key: row.id, "field_id": id}
+            for row in rows
+            for id in set(extract_ids(row.fields or ""))
+            if id in field_ids
+        ]
+        province_links = [
+            {owner_key: row.id, "province_id": id}
+            for row in rows
+            for id in set(extract_ids(row.provinces or ""))
+            if id in province_ids
+        ]
+
+        if field_links:
+            db.execute(field_table.insert().prefix_with("IGNORE"), field_links)
+        if province_links:
+            db.execute(province_table.insert().prefix_with("IGNORE"), province_links)
+        db.commit()
+
+        last_id = rows[-1].id
+        total += len(rows)
+        logger.info(f"Backfilled {total} rows of {model.__tablename__}")
+
+    return total
+
+
+def backfill_associations(db: Session, chunk_size: int = 1000) -> None:
+    field_ids = {id for id, in db.query(JobFieldModel.id).all()}
+    province_ids = {id for id, in db.query(ProvinceModel.id).all()}
+
+    _backfill(
+        db,
+        JobModel,
+        job_field_table,
+        job_province_table,
+        "job_id",
+        field_ids,
+        province_ids,
+        chunk_size,
+    )
+    _backfill(
+        db,
+        ResumeModel,
+        resume_field_table,
+        resume_province_table,
+        "resume_id",
+        field_ids,
+        province_ids,
+        chunk_size,
+    )
+
+
+def reconcile_daily_stats(db: Session) -> None:
+    first_dates = []
+    for model in DAILY_STAT_COLUMNS:
+        first_created_at = db.query(func.min(model.created_at)).scalar()
+        if first_created_at is not None:
+            first_dates.append(first_created_at.date())
+
+    if not first_dates:
+        return
+
+    num_days = DailyStatController.reconcile(db, min(first_dates), date.today())
+    logger.info(f"Recomputed {num_days} days of daily_stats")
+
+
+if __name__ == "__main__":
+    connection = MySQLConnection()
+    create_new_tables(connection.engine)
+    create_missing_indexes(connection.engine)
+
+    db = connection.SessionLocal()
+    try:
+        backfill_associations(db)
+        reconcile_daily_stats(db)
+    finally:
+        db.close()
@@ -2,6 +2,7 @@ import os
 import urllib
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from src.app.config.database.base_mysql import Base
 from src.app.config.logging.logging_config import logger
@@ -9,6 +10,15 @@ from src.app.config.logging.logging_config import logger
 load_dotenv()
 
 
+def database_url(driver: str):
+    host = os.getenv("MYSQL_HOST", "localhost")
+    user = os.getenv("MYSQL_USER")
+    password = urllib.parse.quote_plus(os.getenv("MYSQL_PASSWORD"))
+    db_name = os.getenv("MYSQL_DATABASE")
+    port = os.getenv("MYSQL_PORT", 3306)
+    return host, port, f"{driver}://{user}:{password}@{host}:{port}/{db_name}"
+
+
 class MySQLConnection:
     _instance = None
 
@@ -23,12 +33,7 @@ class MySQLConnection:
             return
         self._initialized = True
 
-        host = os.getenv("MYSQL_HOST", "localhost")
-        user = os.getenv("MYSQL_USER")
-        password = urllib.parse.quote_plus(os.getenv("MYSQL_PASSWORD"))
-        db_name = os.getenv("MYSQL_DATABASE")
-        port = os.getenv("MYSQL_PORT", 3306)
-        DB_URL = f"mysql+mysqlconnector://{user}:{password}@{host}:{port}/{db_name}"
+        host, port, DB_URL = database_url("mysql+mysqlconnector")
 
         try:
             self.engine = create_engine(
@@ -52,5 +57,42 @@ class MySQLConnection:
         Base.metadata.create_all(bind=self.engine)
 
 
+class AsyncMySQLConnection:
+    """
+    Async engine and sessions (aiomysql driver) used by the API routes, so
+    waiting on MySQL does not block the event loop. The controllers are
+    synchronous code and run on the session through AsyncSession.run_sync.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AsyncMySQLConnection, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+
+        _, _, DB_URL = database_url("mysql+aiomysql")
+
+        # The engine connects lazily, the tables are created by MySQLConnection
+        self.engine = create_async_engine(
+            url=DB_URL,
+            pool_pre_ping=True,
+            pool_size=int(os.getenv("MYSQL_POOL_SIZE", "20")),
+            max_overflow=int(os.getenv("MYSQL_MAX_OVERFLOW", "80")),
+            pool_timeout=float(os.getenv("MYSQL_POOL_TIMEOUT", "30")),
+            echo=os.getenv("ENV") == "Development",
+        )
+        self.SessionLocal = async_sessionmaker(
+            autocommit=False, autoflush=False, bind=self.engine
+        )
+
+
 # Usage
 db = MySQLConnection()
+async_db = AsyncMySQLConnection()
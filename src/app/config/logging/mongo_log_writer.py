@@ -0,0 +1,204 @@
+import asyncio
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from bson.errors import BSONError
+from dotenv import load_dotenv
+from prometheus_client import Counter, Gauge
+from pymongo.errors import BulkWriteError, PyMongoError
+from src.app.config.database.mongodb import mongo_db
+from src.app.config.logging.logging_config import logger
+
+load_dotenv()
+
+LOG_RECORDS_QUEUED = Gauge(
+    "mongo_log_records_queued", "Request log records waiting to be written"
+)
+LOG_RECORDS_WRITTEN = Counter(
+    "mongo_log_records_written_total", "Request log records written to MongoDB"
+)
+LOG_RECORDS_DROPPED = Counter(
+    "mongo_log_records_dropped_total",
+    "Request log records dropped",
+    ["reason"],
+)
+
+
+def decode_response_body(record: dict) -> None:
+    """
+    Parse the raw response body captured by the logging middleware: a whole
+    JSON body is stored as a document, anything else as text.
+    """
+    body = record.get("response_body")
+    if not isinstance(body, bytes):
+        return
+
+    if not record.get("response_body_truncated"):
+        try:
+            record["response_body"] = json.loads(body)
+            return
+        except ValueError:
+            pass
+    record["response_body"] = body.decode(errors="replace")
+
+
+class MongoLogWriter:
+    """
+    Writes request logs to MongoDB in batches, off the request path.
+
+    Requests only put their record in a bounded queue. A background task
+    takes up to batch_size records, or whatever arrived within
+    flush_interval seconds, and writes them with one insert_many per
+    collection in a worker thread. When the queue is full a request waits up
+    to put_timeout seconds for room (0 never waits), then its record is
+    dropped, so a slow or unreachable MongoDB never slows down the API.
+    """
+
+    def __init__(
+        self,
+        db,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        put_timeout: float = 0,
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.max_queue = max_queue
+        # Created in the event loop that serves the requests (see _get_queue)
+        self._queue: "Optional[asyncio.Queue[Optional[Tuple[str, dict]]]]" = None
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+
+    def _get_queue(self) -> "asyncio.Queue[Optional[Tuple[str, dict]]]":
+        # Not created at import time: before Python 3.10 a queue is bound to
+        # the event loop current when it is created, which may not be the one
+        # serving the requests
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.max_queue)
+        return self._queue
+
+    async def enqueue(self, collection: str, record: dict) -> bool:
+        if self.put_timeout <= 0:
+            return self.enqueue_nowait(collection, record)
+
+        queue = self._get_queue()
+        try:
+            await asyncio.wait_for(queue.put((collection, record)), self.put_timeout)
+        except asyncio.TimeoutError:
+            self._drop(1, "queue_full")
+            return False
+
+        LOG_RECORDS_QUEUED.set(queue.qsize())
+        return True
+
+    def enqueue_nowait(self, collection: str, record: dict) -> bool:
+        queue = self._get_queue()
+        try:
+            queue.put_nowait((collection, record))
+        except asyncio.QueueFull:
+            self._drop(1, "queue_full")
+            return False
+
+        LOG_RECORDS_QUEUED.set(queue.qsize())
+        return True
+
+    def start(self) -> None:
+        """Start the background task, in the event loop serving the requests."""
+        if self._task is None:
+            self._get_queue()
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Write the records still queued and stop the background task."""
+        if self._queue is None:
+            return
+
+        if self._task is not None:
+            # Queued after every record, the background task stops on it
+            await self._queue.put(None)
+            await self._task
+            self._task = None
+
+        while not self._queue.empty():
+            await self._write(self._take_ready(self.batch_size))
+        # The next start may run in another event loop
+        self._queue = None
+
+    async def _run(self) -> None:
+        closing = False
+        while not closing:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            closing = batch[-1] is None
+            await self._write([item for item in batch if item is not None])
+
+    def _take_ready(self, limit: int) -> List[Tuple[str, dict]]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _write(self, batch: List[Tuple[str, dict]]) -> None:
+        LOG_RECORDS_QUEUED.set(self._queue.qsize())
+        records: Dict[str, List[dict]] = defaultdict(list)
+        for collection, record in batch:
+            records[collection].append(record)
+
+        for collection, documents in records.items():
+            try:
+                # pymongo blocks, keep it off the event loop
+                await asyncio.to_thread(self._insert, collection, documents)
+                written = len(documents)
+            except BulkWriteError as e:
+                # Unordered, the documents without an error were written
+                logger.error(f"Error inserting logs into MongoDB: {e}")
+                written = e.details["nInserted"]
+            except (PyMongoError, BSONError) as e:
+                logger.error(f"Error inserting logs into MongoDB: {e}")
+                written = 0
+
+            if written < len(documents):
+                self._drop(len(documents) - written, "write_error")
+            self.written += written
+            LOG_RECORDS_WRITTEN.inc(written)
+
+    def _insert(self, collection: str, documents: List[dict]) -> None:
+        for document in documents:
+            decode_response_body(document)
+        self.db[collection].insert_many(documents, ordered=False)
+
+    def _drop(self, count: int, reason: str) -> None:
+        self.dropped += count
+        LOG_RECORDS_DROPPED.labels(reason).inc(count)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+
+# Usage
+mongo_log_writer = MongoLogWriter(
+    mongo_db,
+    max_queue=int(os.getenv("MONGO_LOG_MAX_QUEUE", "10000")),
+    batch_size=int(os.getenv("MONGO_LOG_BATCH_SIZE", "500")),
+    flush_interval=float(os.getenv("MONGO_LOG_FLUSH_INTERVAL", "1")),
+    put_timeout=float(os.getenv("MONGO_LOG_PUT_TIMEOUT", "0")),
+)
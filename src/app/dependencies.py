@@ -1,14 +1,26 @@
+import os
+from dotenv import load_dotenv
 from fastapi import Depends, Request
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 from typing import Annotated
-from src.app.config.database.mysql import MySQLConnection
+from src.app.config.database.mysql import AsyncMySQLConnection, MySQLConnection
 from src.app.api.controllers.user_controller import UserController
-from src.app.utils.jwt import decode_access_token
-from src.app.api.schemas.user_schema import UserOut, UserBase
+from src.app.utils.jwt import AUTH_CACHE_TTL, decode_access_token_cached
+from src.app.api.schemas.user_schema import CurrentUser, UserBase
 from src.app.api.models.user_model import UserRole
 from src.app.common.custom_exception import CredentialsException, ForbiddenException
+from src.app.config.cache.invalidation import auth_user_key, pop_stale
+from src.app.config.cache.local_cache import local_cache
+from src.app.config.cache.redis import apply_invalidations
+
+load_dotenv()
+
+# Trust the role claim of the tokens instead of loading the user: no database
+# query for authentication, but a role change or a deletion is only seen once
+# the tokens issued before it expire
+TRUST_TOKEN_CLAIMS = os.getenv("AUTH_TRUST_TOKEN_CLAIMS", "false").lower() == "true"
 
 
 def get_db():
@@ -19,14 +31,33 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    # Controllers are called with "await db.run_sync(Controller.method, ...)"
+    db = AsyncMySQLConnection().SessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+        # Sync the indexes and drop the cached results made stale by the
+        # request, before responding
+        await apply_invalidations(*pop_stale(db))
+
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
 async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_db)
-) -> UserOut:
+    request: Request,
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: AsyncSession = Depends(get_async_db),
+) -> CurrentUser:
+    # Resolved once per request
+    current_user = getattr(request.state, "current_user", None)
+    if current_user is not None:
+        return current_user
+
     try:
-        payload = decode_access_token(token)
+        payload = decode_access_token_cached(token)
         user_id: int = payload.get("sub")
 
         if user_id is None:
@@ -34,10 +65,23 @@ async def get_current_user(
     except JWTError:
         raise CredentialsException
 
-    user = UserController.get_user_by_id(db, user_id=user_id)
-    if user is None:
-        raise CredentialsException
-    return user
+    role = payload.get("role")
+    if TRUST_TOKEN_CLAIMS and role is not None:
+        current_user = CurrentUser(id=user_id, role=role)
+    else:
+        # Dropped from the cache of every worker when the user changes
+        key = auth_user_key(user_id)
+        current_user = local_cache.get(key)
+        if current_user is None:
+            current_user = await db.run_sync(
+                UserController.get_user_by_id, user_id=user_id
+            )
+            if current_user is None:
+                raise CredentialsException
+            local_cache.set(key, current_user, len(key), AUTH_CACHE_TTL)
+
+    request.state.current_user = current_user
+    return current_user
 
 
 def identify_consumer(
@@ -47,7 +91,7 @@ def identify_consumer(
 
 
 async def get_current_admin(
-    current_user: Annotated[UserOut, Depends(get_current_user)]
+    current_user: Annotated[CurrentUser, Depends(get_current_user)]
 ):
     if current_user.role != UserRole.ADMIN:
         raise ForbiddenException()
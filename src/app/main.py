@@ -1,6 +1,10 @@
+import asyncio
 import os
 import socket
 import sentry_sdk
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
@@ -12,12 +16,28 @@ from src.app.api.routes.resume_route import router as resume_route
 from src.app.api.routes.analytic_route import router as analytic_route
 from src.app.api.routes.user_route import router as user_route
 from src.app.api.routes.auth_route import router as auth_route
-from src.app.middleware.api_logging import api_logging_middleware
-from src.app.middleware.exception import unified_exception_middleware
+from src.app.middleware.api_logging import ApiLoggingMiddleware
+from src.app.middleware.exception import UnifiedExceptionMiddleware
+from src.app.api.controllers.analytic_controller import AnalyticController
+from src.app.api.controllers.job_controller import JobController
+from src.app.api.controllers.bulk import insert_id_step
+from src.app.config.database.mysql import AsyncMySQLConnection, MySQLConnection
+from src.app.config.cache.redis import (
+    IndexHandlers,
+    close_redis_cache,
+    listen_cache_invalidation,
+)
 from src.app.config.logging.logging_config import logger
+from src.app.config.logging.mongo_log_writer import mongo_log_writer
+from src.app.utils.password_hasher import password_hasher
+from src.app.utils.reference_data import load_reference_data
+from src.app.utils.matching_index import job_index, resume_index
+from src.app.utils.text_index import job_text_index
 
 HOST_NAME = socket.gethostname()
 PORT = os.getenv("PORT", 8000)
+# Seconds between two removals of the expired jobs from the job indexes
+INDEX_PRUNE_SECONDS = float(os.getenv("INDEX_PRUNE_SECONDS", 600))
 
 # Set up Sentry for error tracking
 sentry_sdk.init(
@@ -32,8 +52,155 @@ sentry_sdk.init(
     profiles_sample_rate=1.0,
 )
 
+
+class ManagedIndex(NamedTuple):
+    index: Any
+    # Loads the whole index
+    build: Callable
+    # Reloads the entries of some records
+    refresh: Callable
+
+
+# In-memory indexes of each kind of records, with the functions loading them
+INDEXES = {
+    "resume": [
+        ManagedIndex(
+            resume_index,
+            AnalyticController.build_resume_index,
+            AnalyticController.refresh_resume_index,
+        )
+    ],
+    "job": [
+        ManagedIndex(
+            job_index,
+            AnalyticController.build_job_index,
+            AnalyticController.refresh_job_index,
+        ),
+        ManagedIndex(
+            job_text_index,
+            JobController.build_search_index,
+            JobController.refresh_search_index,
+        ),
+    ],
+}
+
+# Index rebuilds running in the background
+index_rebuilds = set()
+
+
+def rebuild_indexes(kinds: List[str]) -> None:
+    db = MySQLConnection().SessionLocal()
+    try:
+        for kind in kinds:
+            for managed in INDEXES.get(kind, ()):
+                managed.build(db)
+    except Exception:
+        # The indexes stay not ready, matching and search use SQL queries
+        logger.error(f"Error rebuilding indexes of {kinds}: ", exc_info=True)
+    finally:
+        db.close()
+
+
+def schedule_index_rebuild(kinds: Optional[List[str]]) -> None:
+    # Records were written outside the API (see import_data.py), or changes
+    # were missed while disconnected from Redis (kinds is None): stop using
+    # the indexes, which miss them, until they are reloaded
+    kinds = list(INDEXES) if kinds is None else kinds
+    for kind in kinds:
+        for managed in INDEXES.get(kind, ()):
+            managed.index.ready = False
+
+    task = asyncio.create_task(asyncio.to_thread(rebuild_indexes, kinds))
+    index_rebuilds.add(task)
+    task.add_done_callback(index_rebuilds.discard)
+
+
+def refresh_indexes(changes: Dict[str, List[int]]) -> None:
+    db = MySQLConnection().SessionLocal()
+    try:
+        for kind, ids in changes.items():
+            for managed in INDEXES.get(kind, ()):
+                managed.refresh(db, ids)
+    finally:
+        db.close()
+
+
+async def apply_index_refresh(changes: Dict[str, List[int]]) -> None:
+    # Records were written through the API, on this worker or another one
+    try:
+        await asyncio.to_thread(refresh_indexes, changes)
+    except Exception:
+        logger.error(f"Error refreshing indexes of {list(changes)}: ", exc_info=True)
+        schedule_index_rebuild(list(changes))
+
+
+async def prune_indexes() -> None:
+    # Matching and search skip the expired jobs, but the indexes would keep
+    # them forever
+    while True:
+        await asyncio.sleep(INDEX_PRUNE_SECONDS)
+        expired_ids = job_index.prune(datetime.now())
+        for job_id in expired_ids:
+            job_text_index.remove(job_id)
+        if expired_ids:
+            logger.info(f"Pruned {len(expired_ids)} expired jobs from the job indexes")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the reference data and build the in-memory matching and search
+    # indexes before serving requests
+    db = MySQLConnection().SessionLocal()
+    try:
+        load_reference_data(db)
+    except Exception:
+        # Loaded on first use instead
+        logger.error("Error loading reference data: ", exc_info=True)
+
+    try:
+        # Warns when bulk creation cannot take the ids of multi-row INSERTs
+        insert_id_step(db)
+    except Exception:
+        # Checked on first use instead
+        logger.error("Error reading auto-increment settings: ", exc_info=True)
+        db.rollback()
+
+    try:
+        AnalyticController.build_resume_index(db)
+        AnalyticController.build_job_index(db)
+    except Exception:
+        # Matching falls back to SQL queries while the index is not ready
+        logger.error("Error building matching indexes: ", exc_info=True)
+
+    try:
+        JobController.build_search_index(db)
+    except Exception:
+        # Search falls back to SQL queries while the index is not ready
+        logger.error("Error building job search index: ", exc_info=True)
+    finally:
+        db.close()
+
+    # Keep the local cache of this worker in sync with the other workers
+    invalidation_listener = asyncio.create_task(
+        listen_cache_invalidation(
+            IndexHandlers(schedule_index_rebuild, apply_index_refresh)
+        )
+    )
+    index_pruner = asyncio.create_task(prune_indexes())
+    mongo_log_writer.start()
+
+    yield
+
+    invalidation_listener.cancel()
+    index_pruner.cancel()
+    await mongo_log_writer.close()
+    password_hasher.close()
+    await AsyncMySQLConnection().engine.dispose()
+    await close_redis_cache()
+
+
 # Create a FastAPI app
-app = FastAPI(title="Recruitment Service", version="0.0.1")
+app = FastAPI(title="Recruitment Service", version="0.0.1", lifespan=lifespan)
 
 # Prometheus Instrumentator
 Instrumentator().instrument(app).expose(app)
@@ -54,9 +221,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Set up error handling middleware
-app.middleware("http")(unified_exception_middleware)
-app.middleware("http")(api_logging_middleware)
+# Set up error handling and logging middleware, the logging one comes first and
+# logs the error responses
+app.add_middleware(UnifiedExceptionMiddleware)
+app.add_middleware(ApiLoggingMiddleware)
 
 
 # Root endpoint
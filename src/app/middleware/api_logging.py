@@ -1,82 +1,163 @@
-import os
-from dotenv import load_dotenv
 import json
+import os
+import random
 from time import time
-from fastapi import Request
-from fastapi.responses import JSONResponse
-from pymongo.errors import PyMongoError
-from src.app.config.database.mongodb import mongo_db
+from dotenv import load_dotenv
+from starlette.datastructures import QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from src.app.config.logging.logging_config import logger
+from src.app.config.logging.mongo_log_writer import mongo_log_writer
 
 load_dotenv()
 
-MONGODB_DATABASE = os.getenv("MONGODB_DATABASE")
+# Only log requests to the specified API routes
+LOG_ROUTES = ("/api/v1",)
+
+# Share of the 200/201 responses whose body is logged, and size of the part
+# of a body that is kept
+BODY_SAMPLE_RATE = float(os.getenv("API_LOG_BODY_SAMPLE_RATE", "1"))
+BODY_MAX_BYTES = int(os.getenv("API_LOG_BODY_MAX_BYTES", str(64 * 1024)))
+
+
+async def read_body(receive: Receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            return body
+        body += message.get("body", b"")
+        if not message.get("more_body", False):
+            return body
+
+
+def replay_body(body: bytes, receive: Receive) -> Receive:
+    """Receive callable giving the already read body to the application."""
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if replayed:
+            return await receive()
+        replayed = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return replay
+
 
+class ApiLoggingMiddleware:
+    """
+    Log the requests to the API routes, to the logger and to MongoDB.
 
-async def api_logging_middleware(request: Request, call_next):
-    # Only log requests to the specified API routes
-    log_routes = ["/api/v1"]
-    if not request.url.path.startswith(tuple(log_routes)):
-        return await call_next(request)
+    Request bodies are logged up to BODY_MAX_BYTES bytes. The response is
+    passed through as it streams. For a BODY_SAMPLE_RATE share of the 200/201
+    responses, the first BODY_MAX_BYTES bytes of the body are copied; the
+    record is queued once the body is sent and the copy is parsed by the log
+    writer in the background (see mongo_log_writer).
+    """
 
-    start = time()
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-    # Create log_dict
-    log_dict = {
-        "timestamp": f"{start:.3f}",
-        "method": request.method,
-        "path": request.url.path,
-        "query_params": dict(request.query_params),
-    }
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(LOG_ROUTES):
+            await self.app(scope, receive, send)
+            return
+
+        start = time()
+
+        # Create log_dict
+        log_dict = {
+            "timestamp": f"{start:.3f}",
+            "method": scope["method"],
+            "path": scope["path"],
+            "query_params": dict(QueryParams(scope["query_string"])),
+        }
+
+        # Attempt to log request body
+        if scope["method"] in ["POST", "PUT", "PATCH"]:
+            body = await read_body(receive)
+            log_dict.update(self.request_body(body))
+            receive = replay_body(body, receive)
+
+        collection = None
+        captured = None
+        truncated = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal collection, captured, truncated
+            if message["type"] == "http.response.start":
+                # Measure time until the response starts
+                log_dict["process_time"] = f"{time() - start:.3f}"
+                log_dict["status_code"] = message["status"]
+                collection = self.log(log_dict)
+                if (
+                    message["status"] in [200, 201]
+                    and random.random() < BODY_SAMPLE_RATE
+                ):
+                    captured = bytearray()
+
+            elif message["type"] == "http.response.body" and captured is not None:
+                if not truncated:
+                    chunk = message.get("body", b"")
+                    room = BODY_MAX_BYTES - len(captured)
+                    captured += chunk[:room]
+                    truncated = len(chunk) > room
+
+            await send(message)
 
-    # Attempt to log request body
-    if request.method in ["POST", "PUT", "PATCH"]:
         try:
-            log_dict["request_body"] = await request.json()
-        except json.JSONDecodeError as e:
-            log_dict["request_body"] = f"Unable to decode JSON: {e}"
-
-    # Process request and measure time
-    response = await call_next(request)
-    log_dict["process_time"] = f"{time() - start:.3f}"
-    log_dict["status_code"] = (
-        response.status_code
-    )  # Capture status code of the response
-
-    # Attempt to log response body if needed (for certain status codes)
-    if response.status_code in [200, 201]:
-        response_body = b""
-        async for chunk in response.body_iterator:
-            response_body += chunk
-
-        response_body_str = response_body.decode()
-        response_data = json.loads(response_body_str)
-        # logger.debug(f"Response body: {response_body.decode()}")
-
-        # Create a new response with the same data
-        response = JSONResponse(content=response_data, status_code=response.status_code)
-
-        # Log response body
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            # The client went away or the response failed halfway
+            if collection is not None:
+                mongo_log_writer.enqueue_nowait(
+                    collection, self.with_body(log_dict, captured, True)
+                )
+            raise
+
+        # The record is written to MongoDB in the background
+        if collection is not None:
+            await mongo_log_writer.enqueue(
+                collection, self.with_body(log_dict, captured, truncated)
+            )
+
+    @staticmethod
+    def request_body(body: bytes) -> dict:
+        # Capped like response bodies: a bulk request can hold thousands of
+        # records, more than a MongoDB document (16 MB)
+        if len(body) > BODY_MAX_BYTES:
+            return {
+                "request_body": body[:BODY_MAX_BYTES].decode(errors="replace"),
+                "request_body_truncated": True,
+            }
         try:
-            log_dict["response_body"] = response_data
-        except Exception as e:
-            log_dict["response_body"] = f"Unable to decode response body: {e}"
+            return {"request_body": json.loads(body)}
+        except ValueError as e:
+            return {"request_body": f"Unable to decode JSON: {e}"}
+
+    @staticmethod
+    def with_body(log_dict: dict, captured, truncated: bool) -> dict:
+        if captured is not None:
+            log_dict["response_body"] = bytes(captured)
+            if truncated:
+                log_dict["response_body_truncated"] = True
+        return log_dict
 
-    # Determine log level based on status code
-    try:
+    @staticmethod
+    def log(log_dict: dict) -> str:
+        """
+        Log the request at a level based on its status code, returns the
+        MongoDB collection of its record.
+        """
         if 400 <= log_dict["status_code"] < 500:
             logger.warning(f"Client error occurred", extra=log_dict)
-            mongo_db.client[MONGODB_DATABASE]["client_error_logs"].insert_one(log_dict)
+            return "client_error_logs"
         elif 500 <= log_dict["status_code"]:
             logger.error(f"Server error occurred", extra=log_dict)
-            mongo_db.client[MONGODB_DATABASE]["server_error_logs"].insert_one(log_dict)
+            return "server_error_logs"
         else:
             logger.info(
                 f"{log_dict['method']} {log_dict['path']} {log_dict['status_code']}",
                 extra=log_dict,
             )
-            mongo_db.client[MONGODB_DATABASE]["info_logs"].insert_one(log_dict)
-    except PyMongoError as e:
-        logger.error(f"Error inserting log into MongoDB: {e}")
-
-    return response
+            return "info_logs"
@@ -1,47 +1,78 @@
-import json
-from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi import Response, status
+from starlette.datastructures import QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from src.app.common.api_response import ApiResponse
 from src.app.common.custom_exception import ApiException
 from src.app.common.error_code import ErrorCode
 from src.app.config.logging.logging_config import logger
 
 
-async def unified_exception_middleware(request: Request, call_next):
-    # Create log context and default error response
-    log_context = {
-        "method": request.method,
-        "path": request.url.path,
-        "query_params": dict(request.query_params),
-    }
-    default_error_response = JSONResponse(
-        content=json.loads(
-            ApiResponse.error(
-                errorCode=ErrorCode.INTERNAL_ERR,
-                statusCode=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                message="Internal Server Error",
-            ).model_dump_json()
-        ),
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+def json_response(response: ApiResponse) -> Response:
+    return Response(
+        content=response.model_dump_json(),
+        status_code=response.statusCode,
+        media_type="application/json",
     )
 
-    try:
-        # Proceed with the next middleware or route handler
-        response = await call_next(request)
-    except ApiException as exc:
-        # Handle custom ApiException
-        logger.error(f"ApiException ({type(exc).__name__})", extra=log_context)
-        if exc.response:
-            content = json.loads(exc.response.model_dump_json())
-            status_code = exc.response.statusCode
-            response = JSONResponse(content=content, status_code=status_code)
-        else:
-            response = default_error_response
-    except Exception:
-        # Handle generic exceptions
-        logger.exception(
-            f"Unhandled exception occurred during request processing", extra=log_context
-        )
-        response = default_error_response
-
-    return response
+
+# Built once, a response can be sent any number of times
+DEFAULT_ERROR_RESPONSE = json_response(
+    ApiResponse.error(
+        errorCode=ErrorCode.INTERNAL_ERR,
+        statusCode=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        message="Internal Server Error",
+    )
+)
+
+
+class UnifiedExceptionMiddleware:
+    """Turn the exceptions raised while handling a request into ApiResponses."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            # Proceed with the next middleware or route handler
+            await self.app(scope, receive, send_wrapper)
+            return
+        except Exception as exc:
+            # Too late to send an error response once the response started
+            if response_started:
+                raise
+
+            # Create log context
+            log_context = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "query_params": dict(QueryParams(scope["query_string"])),
+            }
+            if isinstance(exc, ApiException):
+                # Handle custom ApiException
+                logger.error(f"ApiException ({type(exc).__name__})", extra=log_context)
+                response = (
+                    json_response(exc.response)
+                    if exc.response
+                    else DEFAULT_ERROR_RESPONSE
+                )
+            else:
+                # Handle generic exceptions
+                logger.exception(
+                    f"Unhandled exception occurred during request processing",
+                    extra=log_context,
+                )
+                response = DEFAULT_ERROR_RESPONSE
+
+        await response(scope, receive, send)
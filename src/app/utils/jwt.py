@@ -1,14 +1,19 @@
 from jose import jwt
 from datetime import datetime, timedelta
 from typing import Optional
+import hashlib
 import os
+import time
 from dotenv import load_dotenv
 from src.app.common.custom_exception import CredentialsException
+from src.app.config.cache.local_cache import local_cache
 
 load_dotenv()
 
 SECRET_KEY = os.getenv("JWT_SECRET")  # Import from environment variables for production
 ALGORITHM = "HS256"
+# Seconds a decoded token or an authenticated user is kept in the local cache
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
 
 
 class TokenCreationError(Exception):
@@ -44,3 +49,16 @@ def decode_access_token(token: str):
         raise CredentialsException("Invalid token")
     except Exception as e:
         raise CredentialsException(f"Error decoding token. Error: {e}")
+
+
+def decode_access_token_cached(token: str):
+    # Requests of a client carry the same token, its signature is verified
+    # once per AUTH_CACHE_TTL, and never used past its expiration
+    key = f"auth_token_{hashlib.sha256(token.encode()).hexdigest()}"
+    payload = local_cache.get(key)
+    if payload is None:
+        payload = decode_access_token(token)
+        ttl = min(AUTH_CACHE_TTL, payload.get("exp", 0) - time.time())
+        if ttl > 0:
+            local_cache.set(key, payload, len(key), ttl)
+    return payload
@@ -0,0 +1,250 @@
+import sys
+from datetime import datetime
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from threading import RLock
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+
+class IndexEntry(NamedTuple):
+    owner_id: int
+    salary: int
+    field_ids: Tuple[int, ...]
+    province_ids: Tuple[int, ...]
+    expired_at: Optional[datetime] = None
+
+
+class MatchingIndex:
+    """
+    Resident inverted index used to match resumes and jobs without scanning
+    their tables: one posting set of ids per field and per province, plus an
+    array of (salary, id) pairs kept sorted for salary range scans.
+
+    Each entry also remembers its owner (seeker of a resume, employer of a job)
+    so matches can be turned into distinct owners.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries: Dict[int, IndexEntry] = {}
+            self._fields: Dict[int, Set[int]] = defaultdict(set)
+            self._provinces: Dict[int, Set[int]] = defaultdict(set)
+            self._salaries: List[Tuple[int, int]] = []
+            self.ready = False
+
+    def load(self, entries: Iterable[Tuple[int, IndexEntry]]) -> None:
+        """Replace the whole index, then mark it ready to serve queries."""
+        with self._lock:
+            self.clear()
+            for id, entry in entries:
+                self._entries[id] = entry
+                for field_id in entry.field_ids:
+                    self._fields[field_id].add(id)
+                for province_id in entry.province_ids:
+                    self._provinces[province_id].add(id)
+            self._salaries = sorted(
+                (entry.salary, id) for id, entry in self._entries.items()
+            )
+            self.ready = True
+
+    def add(
+        self,
+        id: int,
+        owner_id: int,
+        salary: int,
+        field_ids: Iterable[int],
+        province_ids: Iterable[int],
+        expired_at: Optional[datetime] = None,
+    ) -> None:
+        """Insert an entry, replacing the previous version of the same id."""
+        entry = IndexEntry(
+            owner_id, salary, tuple(field_ids), tuple(province_ids), expired_at
+        )
+        with self._lock:
+            self.remove(id)
+            self._entries[id] = entry
+            for field_id in entry.field_ids:
+                self._fields[field_id].add(id)
+            for province_id in entry.province_ids:
+                self._provinces[province_id].add(id)
+            insort(self._salaries, (entry.salary, id))
+
+    def refresh(self, ids: Iterable[int], entries: Dict[int, IndexEntry]) -> None:
+        """Set the entries of the ids, removing the ids without an entry."""
+        with self._lock:
+            for id in ids:
+                if id in entries:
+                    self.add(id, *entries[id])
+                else:
+                    self.remove(id)
+
+    def remove(self, id: int) -> None:
+        with self._lock:
+            entry = self._entries.pop(id, None)
+            if entry is None:
+                return
+
+            for field_id in entry.field_ids:
+                self._discard(self._fields, field_id, id)
+            for province_id in entry.province_ids:
+                self._discard(self._provinces, province_id, id)
+            position = bisect_left(self._salaries, (entry.salary, id))
+            del self._salaries[position]
+
+    def prune(self, at: datetime) -> List[int]:
+        """Remove the entries expired at the given time, returning their ids."""
+        with self._lock:
+            expired_ids = [
+                id
+                for id, entry in self._entries.items()
+                if entry.expired_at is not None and entry.expired_at <= at
+            ]
+            if not expired_ids:
+                return expired_ids
+
+            for id in expired_ids:
+                entry = self._entries.pop(id)
+                for field_id in entry.field_ids:
+                    self._discard(self._fields, field_id, id)
+                for province_id in entry.province_ids:
+                    self._discard(self._provinces, province_id, id)
+            # One pass instead of a deletion from the array per entry
+            self._salaries = [
+                pair for pair in self._salaries if pair[1] in self._entries
+            ]
+            return expired_ids
+
+    @staticmethod
+    def _discard(postings: Dict[int, Set[int]], key: int, id: int) -> None:
+        ids = postings.get(key)
+        if ids is not None:
+            ids.discard(id)
+            if not ids:
+                del postings[key]
+
+    def _union(self, postings: Dict[int, Set[int]], keys: Iterable[int]) -> Set[int]:
+        return set().union(*(postings[key] for key in keys if key in postings))
+
+    def match(
+        self,
+        field_ids: Iterable[int],
+        province_ids: Iterable[int],
+        min_salary: Optional[int] = None,
+        max_salary: Optional[int] = None,
+        active_at: Optional[datetime] = None,
+    ) -> Set[int]:
+        """
+        Ids sharing at least one field and one province, whose salary lies in
+        [min_salary, max_salary] and, when active_at is given, which have not
+        expired at that time.
+        """
+        with self._lock:
+            by_field = self._union(self._fields, field_ids)
+            by_province = self._union(self._provinces, province_ids)
+            if len(by_field) > len(by_province):
+                by_field, by_province = by_province, by_field
+            candidates = by_field & by_province
+
+            if active_at is not None:
+                candidates = {
+                    id
+                    for id in candidates
+                    if self._entries[id].expired_at is None
+                    or self._entries[id].expired_at > active_at
+                }
+
+            if min_salary is None and max_salary is None:
+                return candidates
+
+            low = (
+                0 if min_salary is None else bisect_left(self._salaries, (min_salary,))
+            )
+            high = (
+                len(self._salaries)
+                if max_salary is None
+                else bisect_right(self._salaries, (max_salary, float("inf")))
+            )
+
+            # Walk whichever side is smaller: the salary range or the candidates
+            if high - low < len(candidates):
+                return {id for _, id in self._salaries[low:high] if id in candidates}
+
+            min_salary = float("-inf") if min_salary is None else min_salary
+            max_salary = float("inf") if max_salary is None else max_salary
+            return {
+                id
+                for id in candidates
+                if min_salary <= self._entries[id].salary <= max_salary
+            }
+
+    def filter(
+        self,
+        ids: Iterable[int],
+        field_ids: Optional[Iterable[int]] = None,
+        province_ids: Optional[Iterable[int]] = None,
+        min_salary: Optional[int] = None,
+        max_salary: Optional[int] = None,
+        active_at: Optional[datetime] = None,
+    ) -> Set[int]:
+        """
+        The given ids that are in the index and pass the given conditions,
+        which are those of match(); None means no condition.
+        """
+        with self._lock:
+            ids = {id for id in ids if id in self._entries}
+            if field_ids is not None:
+                ids &= self._union(self._fields, field_ids)
+            if province_ids is not None:
+                ids &= self._union(self._provinces, province_ids)
+
+            min_salary = float("-inf") if min_salary is None else min_salary
+            max_salary = float("inf") if max_salary is None else max_salary
+            return {
+                id
+                for id in ids
+                if min_salary <= self._entries[id].salary <= max_salary
+                and (
+                    active_at is None
+                    or self._entries[id].expired_at is None
+                    or self._entries[id].expired_at > active_at
+                )
+            }
+
+    def owners(self, ids: Iterable[int]) -> List[int]:
+        """Distinct owners of the given ids, sorted ascending."""
+        with self._lock:
+            return sorted(
+                {self._entries[id].owner_id for id in ids if id in self._entries}
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            postings = list(self._fields.values()) + list(self._provinces.values())
+            approx_bytes = (
+                sys.getsizeof(self._entries)
+                + sum(sys.getsizeof(entry) for entry in self._entries.values())
+                + sys.getsizeof(self._fields)
+                + sys.getsizeof(self._provinces)
+                + sum(sys.getsizeof(ids) for ids in postings)
+                + sys.getsizeof(self._salaries)
+                + len(self._salaries) * sys.getsizeof((0, 0))
+            )
+            return {
+                "name": self.name,
+                "ready": self.ready,
+                "numEntries": len(self._entries),
+                "numFields": len(self._fields),
+                "numProvinces": len(self._provinces),
+                "numPostings": sum(len(ids) for ids in postings),
+                "approxBytes": approx_bytes,
+            }
+
+
+# Usage
+resume_index = MatchingIndex("resume")
+job_index = MatchingIndex("job")
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from passlib.context import CryptContext
+from prometheus_client import Counter, Gauge, Histogram
+from src.app.common.custom_exception import ServiceUnavailableException
+
+load_dotenv()
+
+logging.getLogger("passlib").setLevel(logging.ERROR)
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+PASSWORD_HASH_PENDING = Gauge(
+    "password_hash_pending", "Password hashes running or waiting for a worker"
+)
+PASSWORD_HASH_WAIT_SECONDS = Histogram(
+    "password_hash_wait_seconds", "Seconds a password hash waited for a worker"
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total", "Password hashes rejected, too many pending"
+)
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords with bcrypt in a dedicated thread pool.
+
+    bcrypt is slow by design (a few hundred milliseconds) and releases the
+    GIL, so up to max_workers hashes run in parallel without blocking the
+    event loop. At most max_pending more wait for a worker; beyond that a
+    login burst is rejected with a 503 rather than queued for ever longer.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 64):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="password_hasher"
+        )
+        self._pending = 0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(pwd_context.verify, password, hashed_password)
+
+    async def _run(self, func, *args):
+        if self._pending >= self.max_workers + self.max_pending:
+            PASSWORD_HASH_REJECTED.inc()
+            raise ServiceUnavailableException("Too many login attempts, try again")
+
+        queued = time.monotonic()
+
+        def timed():
+            PASSWORD_HASH_WAIT_SECONDS.observe(time.monotonic() - queued)
+            return func(*args)
+
+        self._pending += 1
+        PASSWORD_HASH_PENDING.set(self._pending)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, timed
+            )
+        finally:
+            self._pending -= 1
+            PASSWORD_HASH_PENDING.set(self._pending)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Usage
+password_hasher = PasswordHasher(
+    max_workers=int(
+        os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+    ),
+    max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64")),
+)
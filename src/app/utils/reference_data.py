@@ -0,0 +1,98 @@
+import os
+import time
+from typing import Iterable, List, NamedTuple, Optional
+from dotenv import load_dotenv
+from pydantic import BaseModel
+from sqlalchemy.orm import Session, make_transient_to_detached
+from src.app.api.models.job_field_model import JobField as JobFieldModel
+from src.app.api.models.province_model import Province as ProvinceModel
+from src.app.api.schemas.job_field_schema import FieldBase
+from src.app.api.schemas.province_schema import ProvinceBase
+
+load_dotenv()
+
+
+class ReferenceEntry(NamedTuple):
+    # Detached row, merged into the sessions that link records to it
+    instance: object
+    item: BaseModel
+
+
+class ReferenceTable:
+    """
+    Rows of a small, nearly static table kept in memory, so that validating
+    and hydrating records referencing them needs no query.
+
+    Entries live in a list indexed by id. The list is loaded on first use and
+    reloaded by the first lookup after max_age seconds; a reload replaces it
+    at once, so lookups from other threads see the old or the new rows, and
+    bumps version when the rows changed.
+    """
+
+    def __init__(self, model, schema, max_age: float = 300):
+        self.model = model
+        self.schema = schema
+        self.max_age = max_age
+        self.version = 0
+        self._entries: Optional[List[Optional[ReferenceEntry]]] = None
+        self._loaded_at = 0.0
+
+    def load(self, db: Session) -> None:
+        # Columns rather than instances, which could be in use in the session
+        columns = self.model.__table__.columns
+        rows = db.query(*columns).order_by(self.model.id).all()
+        self.set_rows([dict(row._mapping) for row in rows])
+
+    def set_rows(self, rows: List[dict]) -> None:
+        entries: List[Optional[ReferenceEntry]] = [None] * (
+            max((row["id"] for row in rows), default=-1) + 1
+        )
+        for row in rows:
+            instance = self.model(**row)
+            make_transient_to_detached(instance)
+            entries[row["id"]] = ReferenceEntry(instance, self.schema(**row))
+
+        if self._items(self._entries) != self._items(entries):
+            self.version += 1
+        self._entries = entries
+        self._loaded_at = time.monotonic()
+
+    def _load_if_stale(self, db: Session) -> List[Optional[ReferenceEntry]]:
+        if self._entries is None or time.monotonic() - self._loaded_at >= self.max_age:
+            self.load(db)
+        return self._entries
+
+    @staticmethod
+    def _items(entries) -> list:
+        return [entry and entry.item for entry in entries or ()]
+
+    def _find(self, db: Session, ids: Iterable[int]) -> List[ReferenceEntry]:
+        entries = self._load_if_stale(db)
+        found = []
+        for id in sorted(set(ids)):
+            if 0 <= id < len(entries) and entries[id] is not None:
+                found.append(entries[id])
+        return found
+
+    def get(self, db: Session, id: Optional[int]) -> Optional[BaseModel]:
+        found = self._find(db, [id]) if id is not None else []
+        return found[0].item if found else None
+
+    def find(self, db: Session, ids: Iterable[int]) -> List[BaseModel]:
+        """Items of the existing ids, in id order, unknown ids are skipped."""
+        return [entry.item for entry in self._find(db, ids)]
+
+    def attach(self, db: Session, ids: Iterable[int]) -> list:
+        """Rows of the existing ids in the session, to link records to them."""
+        return [db.merge(entry.instance, load=False) for entry in self._find(db, ids)]
+
+
+# Usage
+max_age = float(os.getenv("REFERENCE_DATA_MAX_AGE", "300"))
+job_fields = ReferenceTable(JobFieldModel, FieldBase, max_age)
+provinces = ReferenceTable(ProvinceModel, ProvinceBase, max_age)
+
+
+def load_reference_data(db: Session) -> None:
+    job_fields.load(db)
+    provinces.load(db)
@@ -0,0 +1,74 @@
+import os
+import time
+from threading import Lock
+from typing import Dict, Tuple
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+load_dotenv()
+
+ESTIMATE_SQL = text(
+    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+)
+
+
+class RowCounter:
+    """
+    Total row counts of whole tables for the pagination metadata, so list
+    endpoints do not run COUNT(*) on every request.
+
+    A count is loaded once from the database, then kept up to date by the
+    create/delete paths through adjust(). It is reloaded when older than
+    max_age seconds, which bounds the drift caused by writes of other
+    processes. The load runs COUNT(*) with source "counter", or reads the
+    (cheap but approximate) InnoDB estimate from information_schema with
+    source "estimate".
+    """
+
+    def __init__(self, source: str = "counter", max_age: float = 60):
+        self.source = source
+        self.max_age = max_age
+        self._lock = Lock()
+        self._counts: Dict[str, Tuple[int, float]] = {}
+
+    def count(self, query, model, exact: bool = False) -> int:
+        """Number of rows of the model's table, query being its unfiltered query."""
+        table_name = model.__tablename__
+        if not exact:
+            with self._lock:
+                cached = self._counts.get(table_name)
+            if cached is not None and time.monotonic() - cached[1] < self.max_age:
+                return cached[0]
+
+        total = None
+        if self.source == "estimate" and not exact:
+            total = query.session.execute(
+                ESTIMATE_SQL, {"table_name": table_name}
+            ).scalar()
+        if total is None:
+            total = query.count()
+
+        with self._lock:
+            self._counts[table_name] = (total, time.monotonic())
+        return total
+
+    def adjust(self, model, delta: int) -> None:
+        with self._lock:
+            cached = self._counts.get(model.__tablename__)
+            if cached is not None:
+                self._counts[model.__tablename__] = (
+                    max(cached[0] + delta, 0),
+                    cached[1],
+                )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+# Usage
+row_counter = RowCounter(
+    source=os.getenv("PAGINATION_COUNT_SOURCE", "counter"),
+    max_age=float(os.getenv("PAGINATION_COUNT_MAX_AGE", "60")),
+)
@@ -0,0 +1,145 @@
+import math
+import re
+import sys
+import unicodedata
+from collections import Counter, defaultdict
+from threading import RLock
+from typing import Dict, Iterable, List, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+")
+COMBINING_MARKS = re.compile("[\u0300-\u036f]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase words of the text without their diacritics, so that "Hà Nội"
+    and "ha noi" give the same tokens.
+    """
+    text = unicodedata.normalize("NFD", text.lower().replace("đ", "d"))
+    return TOKEN_PATTERN.findall(COMBINING_MARKS.sub("", text))
+
+
+class TextIndex:
+    """
+    Resident inverted index for full-text search, ranked with BM25: one
+    posting dict of {id: term frequency} per token. The tokens of the title
+    count title_weight times, so that matches in the title rank higher.
+    """
+
+    def __init__(
+        self, name: str, k1: float = 1.2, b: float = 0.75, title_weight: int = 3
+    ):
+        self.name = name
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self._lock = RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+            # Distinct tokens and length of each document, to remove it
+            self._documents: Dict[int, Tuple[Tuple[str, ...], int]] = {}
+            self._total_length = 0
+            self.ready = False
+
+    def _counts(self, title: str, description: str) -> Counter:
+        counts = Counter(tokenize(description or ""))
+        for token in tokenize(title or ""):
+            counts[token] += self.title_weight
+        return counts
+
+    def _insert(self, id: int, title: str, description: str) -> None:
+        counts = self._counts(title, description)
+        for token, count in counts.items():
+            self._postings[token][id] = count
+        length = sum(counts.values())
+        self._documents[id] = (tuple(counts), length)
+        self._total_length += length
+
+    def load(self, documents: Iterable[Tuple[int, str, str]]) -> None:
+        """Replace the whole index, then mark it ready to serve queries."""
+        with self._lock:
+            self.clear()
+            for id, title, description in documents:
+                self._insert(id, title, description)
+            self.ready = True
+
+    def add(self, id: int, title: str, description: str) -> None:
+        """Insert a document, replacing the previous version of the same id."""
+        with self._lock:
+            self.remove(id)
+            self._insert(id, title, description)
+
+    def refresh(
+        self, ids: Iterable[int], documents: Dict[int, Tuple[str, str]]
+    ) -> None:
+        """
+        Set the (title, description) documents of the ids, removing the ids
+        without a document.
+        """
+        with self._lock:
+            for id in ids:
+                if id in documents:
+                    self.add(id, *documents[id])
+                else:
+                    self.remove(id)
+
+    def remove(self, id: int) -> None:
+        with self._lock:
+            document = self._documents.pop(id, None)
+            if document is None:
+                return
+
+            tokens, length = document
+            for token in tokens:
+                postings = self._postings[token]
+                postings.pop(id, None)
+                if not postings:
+                    del self._postings[token]
+            self._total_length -= length
+
+    def scores(self, query: str) -> Dict[int, float]:
+        """BM25 score of every id matching at least one token of the query."""
+        scores = defaultdict(float)
+        with self._lock:
+            num_documents = len(self._documents)
+            if not num_documents:
+                return scores
+
+            average_length = self._total_length / num_documents
+            for token in set(tokenize(query)):
+                postings = self._postings.get(token)
+                if not postings:
+                    continue
+
+                idf = math.log(
+                    1 + (num_documents - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                for id, count in postings.items():
+                    length = self._documents[id][1]
+                    norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                    scores[id] += idf * count * (self.k1 + 1) / (count + norm)
+        return scores
+
+    def stats(self) -> dict:
+        with self._lock:
+            approx_bytes = (
+                sys.getsizeof(self._postings)
+                + sum(sys.getsizeof(ids) for ids in self._postings.values())
+                + sys.getsizeof(self._documents)
+                + sum(sys.getsizeof(tokens) for tokens, _ in self._documents.values())
+            )
+            return {
+                "name": self.name,
+                "ready": self.ready,
+                "numEntries": len(self._documents),
+                "numTokens": len(self._postings),
+                "numPostings": sum(len(ids) for ids in self._postings.values()),
+                "approxBytes": approx_bytes,
+            }
+
+
+# Usage
+job_text_index = TextIndex("job")
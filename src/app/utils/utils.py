@@ -20,3 +20,8 @@ def object_as_dict(obj):
     return {
         c.key: getattr(obj, c.key) for c in sqlalchemy.inspect(obj).mapper.column_attrs
     }
+
+
+# Escape the wildcards of a LIKE pattern, to use with escape="\\"
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
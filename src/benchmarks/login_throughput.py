@@ -0,0 +1,63 @@
+"""
+Login throughput with bcrypt verified on the event loop or in password_hasher.
+
+Runs a burst of concurrent password verifications, the CPU-bound part of a
+login, next to a coroutine ticking every millisecond that stands for the
+other requests of the worker. Reports logins per second and the longest
+stall of the event loop. No database is needed.
+
+Run with: python -m src.benchmarks.login_throughput [logins]
+"""
+
+import asyncio
+import sys
+import time
+from src.app.utils.password_hasher import password_hasher, pwd_context
+
+
+async def ticker(stop: asyncio.Event) -> float:
+    # Longest delay of a 1 ms sleep, how long other requests would wait
+    longest = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        longest = max(longest, time.perf_counter() - start - 0.001)
+    return longest
+
+
+async def run(mode: str, logins: int, hashed_password: str):
+    async def inline_login():
+        return pwd_context.verify("password", hashed_password)
+
+    async def pooled_login():
+        return await password_hasher.verify("password", hashed_password)
+
+    login = inline_login if mode == "inline" else pooled_login
+
+    stop = asyncio.Event()
+    stall = asyncio.create_task(ticker(stop))
+    start = time.perf_counter()
+    results = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+
+    assert all(results)
+    return logins / elapsed, await stall
+
+
+def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    hashed_password = pwd_context.hash("password")
+
+    print(f"{password_hasher.max_workers} password hasher workers, {logins} logins")
+    for mode in ("inline", "pooled"):
+        per_second, stall = asyncio.run(run(mode, logins, hashed_password))
+        print(
+            f"{mode:>6}: {per_second:6.1f} logins/s,"
+            f" longest event loop stall {stall * 1000:7.1f} ms"
+        )
+    password_hasher.close()
+
+
+if __name__ == "__main__":
+    main()
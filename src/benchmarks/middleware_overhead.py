@@ -0,0 +1,111 @@
+"""
+Per-request overhead of the middleware stack.
+
+Drives three FastAPI apps directly through ASGI, without a server or an HTTP
+client, so that only the application side is measured:
+
+- bare: no middleware,
+- http: two pass-through handlers registered with app.middleware("http"),
+  the registration the exception and logging middleware used before (a lower
+  bound of their cost, since the handlers do nothing),
+- asgi: UnifiedExceptionMiddleware and ApiLoggingMiddleware.
+
+Run with: python -m src.benchmarks.middleware_overhead [requests]
+
+The logger is raised to WARNING so that writing log files is not measured.
+MongoDB is not needed: log records stay queued, then are dropped.
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from fastapi import FastAPI
+from src.app.config.logging.logging_config import logger
+from src.app.middleware.api_logging import ApiLoggingMiddleware
+from src.app.middleware.exception import UnifiedExceptionMiddleware
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/ping")
+    async def ping():
+        return {"message": "pong"}
+
+    if stack == "http":
+
+        async def pass_through(request, call_next):
+            return await call_next(request)
+
+        app.middleware("http")(pass_through)
+        app.middleware("http")(pass_through)
+    elif stack == "asgi":
+        app.add_middleware(UnifiedExceptionMiddleware)
+        app.add_middleware(ApiLoggingMiddleware)
+    return app
+
+
+async def run(app: FastAPI, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/ping",
+        "raw_path": b"/api/v1/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("localhost", 80),
+    }
+
+    disconnected = asyncio.Event()
+
+    def receiver():
+        received = False
+
+        async def receive():
+            nonlocal received
+            if received:
+                # The client stays connected until the response is sent
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        return receive
+
+    async def send(message):
+        pass
+
+    # Warm up, the middleware stack is built on the first request
+    for _ in range(100):
+        await app(dict(scope), receiver(), send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receiver(), send)
+    return (time.perf_counter() - start) / requests
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    logger.setLevel(logging.WARNING)
+
+    results = {
+        stack: asyncio.run(run(build_app(stack), requests))
+        for stack in ("bare", "http", "asgi")
+    }
+    for stack, seconds in results.items():
+        overhead = seconds - results["bare"]
+        print(
+            f"{stack:>5}: {seconds * 1e6:8.1f} us/request"
+            f" ({overhead * 1e6:+8.1f} us of middleware)"
+        )
+
+
+if __name__ == "__main__":
+    main()
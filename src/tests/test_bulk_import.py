@@ -0,0 +1,82 @@
+import io
+import json
+from pydantic import TypeAdapter
+from typing import List
+from unittest.mock import AsyncMock, MagicMock
+from src.app.api.schemas.job_schema import JobCreate
+from src.app.config.cache.invalidation import invalidate_records
+from src.app.config.database import bulk_import
+from src.app.config.database.bulk_import import read_records, validate_batch
+
+JOB = {
+    "employerId": 1,
+    "title": "Job",
+    "quantity": 1,
+    "description": "Description",
+    "salary": 1000,
+    "fieldIds": [1, 2],
+    "provinceIds": [3],
+    "expiredAt": "2030-01-01T00:00:00",
+}
+
+
+class TestBulkImport:
+    def validate(self, format, raws):
+        adapter = TypeAdapter(List[JobCreate])
+        return validate_batch(JobCreate, adapter, format, raws)
+
+    def test_reads_csv_lists_and_line_numbers(self):
+        # Arrange
+        file = io.StringIO(
+            "employerId,title,fieldIds,provinceIds\n"
+            '1,"Multi\nline",1|2,\n'
+            "2,Job,3,4\n"
+        )
+
+        # Act
+        records = list(read_records(file, "csv", JobCreate))
+
+        # Assert
+        assert [line_number for line_number, _ in records] == [3, 4]
+        assert records[0][1]["fieldIds"] == ["1", "2"]
+        assert records[0][1]["provinceIds"] == []
+
+    def test_validates_batch_at_once(self):
+        # Act
+        items, errors = self.validate("ndjson", [json.dumps(JOB)] * 2)
+
+        # Assert
+        assert [item.fieldIds for item in items.values()] == [[1, 2], [1, 2]]
+        assert errors == {}
+
+    def test_reports_invalid_records_of_batch(self):
+        # Arrange
+        raws = [json.dumps(JOB), "{", json.dumps({**JOB, "quantity": 0})]
+
+        # Act
+        items, errors = self.validate("ndjson", raws)
+
+        # Assert
+        assert list(items) == [0]
+        assert errors[1].startswith("Invalid JSON")
+        assert errors[2] == "quantity: Input should be greater than or equal to 1"
+
+    def test_publishes_index_rebuild_before_invalidations(self, monkeypatch):
+        # Arrange
+        calls = MagicMock()
+        for name in ("publish_index_rebuild", "apply_invalidations"):
+            calls.attach_mock(AsyncMock(), name)
+            monkeypatch.setattr(bulk_import, name, getattr(calls, name))
+        monkeypatch.setattr(bulk_import, "close_redis_cache", AsyncMock())
+        db = MagicMock(info={})
+        invalidate_records(db, "job", [], counts_changed=True)
+
+        # Act
+        bulk_import.apply_cache_invalidations(db, "job")
+
+        # Assert
+        assert [name for name, _, _ in calls.mock_calls] == [
+            "publish_index_rebuild",
+            "apply_invalidations",
+        ]
+        calls.publish_index_rebuild.assert_awaited_once_with("job")
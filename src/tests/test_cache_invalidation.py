@@ -0,0 +1,116 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from src.app.config.cache import redis
+from src.app.config.cache.local_cache import local_cache
+
+
+class FakePubSub:
+    """Hands out the given messages, then cancels the listener."""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def subscribe(self, channel):
+        pass
+
+    async def get_message(self, **kwargs):
+        if not self.messages:
+            raise asyncio.CancelledError()
+        return {"data": self.messages.pop(0)}
+
+
+class TestListenCacheInvalidation:
+    @pytest.fixture(autouse=True)
+    def setup_method(self, monkeypatch):
+        self.monkeypatch = monkeypatch
+        local_cache.clear()
+        local_cache.set("a", 1, 1)
+        local_cache.set("b", 2, 1)
+
+        self.index_handlers = redis.IndexHandlers(
+            rebuild=MagicMock(side_effect=RuntimeError("rebuild")),
+            refresh=AsyncMock(),
+        )
+        self.pipeline = MagicMock()
+        self.pipeline.__aenter__ = AsyncMock(return_value=self.pipeline)
+        self.pipeline.__aexit__ = AsyncMock(return_value=False)
+        self.pipeline.execute = AsyncMock()
+        monkeypatch.setattr(redis.redis_client, "pipeline", lambda **_: self.pipeline)
+
+    def listen(self, messages):
+        self.monkeypatch.setattr(
+            redis.redis_client, "pubsub", lambda: FakePubSub(messages)
+        )
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(redis.listen_cache_invalidation(self.index_handlers))
+
+    def test_keeps_listening_after_bad_messages(self):
+
+        # Act
+        self.listen(
+            [
+                "{",
+                json.dumps({"unknown": 1}),
+                json.dumps({redis.REBUILD_INDEXES: ["job"]}),
+                json.dumps(["a"]),
+            ]
+        )
+
+        # Assert
+        self.index_handlers.rebuild.assert_called_once_with(["job"])
+        assert local_cache.get("a") is None
+        assert local_cache.get("b") == 2
+
+    def test_refreshes_indexes_and_acknowledges(self):
+        # Arrange
+        message = {redis.REFRESH_INDEXES: {"job": [1, 2]}, redis.ACK_KEY: "ack"}
+
+        # Act
+        self.listen([json.dumps(message)])
+
+        # Assert
+        self.index_handlers.refresh.assert_awaited_once_with({"job": [1, 2]})
+        self.pipeline.incr.assert_called_once_with("ack")
+        self.pipeline.execute.assert_awaited_once()
+
+
+class TestPublishIndexRefresh:
+    @pytest.fixture(autouse=True)
+    def setup_method(self, monkeypatch):
+        self.monkeypatch = monkeypatch
+        monkeypatch.setattr(redis, "index_sync_poll_seconds", 0)
+        monkeypatch.setattr(redis.redis_client, "publish", AsyncMock(return_value=2))
+
+    def test_waits_for_every_worker(self):
+        # Arrange
+        get = AsyncMock(side_effect=[None, "1", "2"])
+        self.monkeypatch.setattr(redis.redis_client, "get", get)
+
+        # Act
+        asyncio.run(redis.publish_index_refresh({"job": {2, 1}}))
+
+        # Assert
+        channel, data = redis.redis_client.publish.await_args.args
+        message = json.loads(data)
+        assert channel == redis.INVALIDATION_CHANNEL
+        assert message[redis.REFRESH_INDEXES] == {"job": [1, 2]}
+        assert get.await_count == 3
+
+    def test_stops_waiting_after_timeout(self):
+        # Arrange
+        self.monkeypatch.setattr(redis, "index_sync_seconds", 0)
+        self.monkeypatch.setattr(redis.redis_client, "get", AsyncMock(return_value="1"))
+
+        # Act
+        asyncio.run(redis.publish_index_refresh({"job": [1]}))
+
+        # Assert
+        redis.redis_client.publish.assert_awaited_once()
@@ -0,0 +1,49 @@
+import asyncio
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from src.app import dependencies
+from src.app.api.models.user_model import UserRole
+from src.app.api.schemas.user_schema import UserOut
+from src.app.config.cache.local_cache import local_cache
+from src.app.utils import jwt
+
+
+class TestGetCurrentUser:
+    @pytest.fixture(autouse=True)
+    def setup_method(self, monkeypatch):
+        monkeypatch.setattr(jwt, "SECRET_KEY", "secret")
+        local_cache.clear()
+        self.token = jwt.create_access_token(data={"sub": 1, "role": UserRole.ADMIN})
+        self.db = AsyncMock()
+        self.db.run_sync.return_value = UserOut(
+            id=1,
+            role=UserRole.ADMIN,
+            created_at=datetime(2024, 1, 1),
+            updated_at=datetime(2024, 1, 1),
+        )
+
+    def get_current_user(self):
+        request = SimpleNamespace(state=SimpleNamespace())
+        return asyncio.run(dependencies.get_current_user(request, self.token, self.db))
+
+    def test_loads_user_once_per_cache_ttl(self):
+        # Act
+        first = self.get_current_user()
+        second = self.get_current_user()
+
+        # Assert
+        assert first.id == second.id == 1
+        self.db.run_sync.assert_called_once()
+
+    def test_trusts_token_claims(self, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(dependencies, "TRUST_TOKEN_CLAIMS", True)
+
+        # Act
+        current_user = self.get_current_user()
+
+        # Assert
+        assert (current_user.id, current_user.role) == (1, UserRole.ADMIN)
+        self.db.run_sync.assert_not_called()
@@ -1,13 +1,19 @@
 import pytest
 from unittest.mock import MagicMock
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import Session
+from src.app.api.controllers import bulk
 from src.app.api.controllers.employer_controller import (
     EmployerController,
     EmployerCreate,
     EmployerUpdate,
 )
 from src.app.api.models.employer_model import Employer as EmployerModel
+from src.app.api.models.job_model import Job as JobModel
 from src.app.api.models.province_model import Province as ProvinceModel
+from src.app.utils.reference_data import provinces
+from src.app.utils.matching_index import job_index
+from src.app.utils.text_index import job_text_index
 from src.app.common.custom_exception import (
     BadRequestException,
     NotFoundException,
@@ -21,6 +27,9 @@ class TestEmployerController:
     @pytest.fixture(autouse=True)
     def setup_method(self):
         self.db = MagicMock(spec=Session)
+        provinces.set_rows(
+            [{"id": i, "name": f"Test Province {i}"} for i in range(1, 11)]
+        )
 
     def test_create_employer_success(self):
         # Arrange
@@ -34,7 +43,6 @@ class TestEmployerController:
 
         # Mock the query methods
         self.db.query.return_value.filter_by.return_value.first.return_value = None
-        self.db.query.return_value.get.return_value = ProvinceModel(id=1)
 
         # Act
         result = employer_controller.create_employer(self.db, employer_data)
@@ -69,14 +77,13 @@ class TestEmployerController:
         employer_data = EmployerCreate(
             email="test@example.com",
             name="Test Employer",
-            provinceId=1,
+            provinceId=99,
             description="Test description",
         )
         employer_controller = EmployerController()
 
         # Mock the query methods
         self.db.query.return_value.filter_by.return_value.first.return_value = None
-        self.db.query.return_value.get.return_value = None
 
         # Act & Assert
         with pytest.raises(NotFoundException):
@@ -88,14 +95,12 @@ class TestEmployerController:
         employer_controller = EmployerController()
 
         # Mock the query methods
-        self.db.query.return_value.options.return_value.get.return_value = (
-            EmployerModel(
-                id=1,
-                email="test@example.com",
-                name="Test Employer",
-                province_data=ProvinceModel(id=1, name="Test Province"),
-                description="Test description",
-            )
+        self.db.query.return_value.get.return_value = EmployerModel(
+            id=1,
+            email="test@example.com",
+            name="Test Employer",
+            province=1,
+            description="Test description",
         )
 
         # Act
@@ -106,7 +111,7 @@ class TestEmployerController:
         assert result.email == "test@example.com"
         assert result.name == "Test Employer"
         assert result.provinceId == 1
-        assert result.provinceName == "Test Province"
+        assert result.provinceName == "Test Province 1"
         assert result.description == "Test description"
 
     def test_get_employer_by_id_not_found(self):
@@ -115,7 +120,7 @@ class TestEmployerController:
         employer_controller = EmployerController()
 
         # Mock the query methods
-        self.db.query.return_value.options.return_value.get.return_value = None
+        self.db.query.return_value.get.return_value = None
 
         # Act & Assert
         with pytest.raises(NotFoundException):
@@ -127,8 +132,8 @@ class TestEmployerController:
         employer_controller = EmployerController()
 
         # Mock the query methods to raise a ValidationException
-        self.db.query.return_value.options.return_value.get.side_effect = (
-            ValidationException("Test exception")
+        self.db.query.return_value.get.side_effect = ValidationException(
+            "Test exception"
         )
 
         # Act & Assert
@@ -143,14 +148,14 @@ class TestEmployerController:
                 id=i,
                 email=f"test{i}@example.com",
                 name=f"Test Employer {i}",
-                province_data=ProvinceModel(id=i, name=f"Test Province {i}"),
+                province=i,
                 description=f"Test description {i}",
             )
             for i in range(1, 11)
         ]
 
         # Mock the query methods
-        self.db.query.return_value.offset.return_value.limit.return_value.all.return_value = (
+        self.db.query.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = (
             employers
         )
         self.db.query.return_value.count.return_value = len(employers)
@@ -292,6 +297,22 @@ class TestEmployerController:
         )
         self.db.commit.assert_called_once()
 
+    def test_delete_employer_by_id_removes_jobs_from_indexes(self):
+        # Arrange
+        job = JobModel(id=5, title="Job", description="Python")
+        self.db.query.return_value.get.return_value = EmployerModel(
+            id=1, jobs_data=[job]
+        )
+        job_index.add(5, 1, 1000, [1], [1])
+        job_text_index.add(5, job.title, job.description)
+
+        # Act
+        EmployerController.delete_employer_by_id(self.db, 1)
+
+        # Assert
+        assert job_index.filter([5]) == set()
+        assert job_text_index.scores("python") == {}
+
     def test_delete_employer_by_id_not_found(self):
         # Arrange
         employer_id = 1
@@ -303,3 +324,106 @@ class TestEmployerController:
         # Act & Assert
         with pytest.raises(NotFoundException):
             employer_controller.delete_employer_by_id(self.db, employer_id)
+
+    def test_create_employers_reports_each_item(self):
+        # Arrange
+        employers = [
+            EmployerCreate(email=email, name="Test Employer", provinceId=province)
+            for email, province in [
+                ("new@example.com", 1),
+                ("Taken@example.com", 1),
+                ("NEW@example.com", 1),
+                ("other@example.com", 99),
+                ("last@example.com", 2),
+            ]
+        ]
+        employer_controller = EmployerController()
+
+        # Mock the query methods
+        self.db.query.return_value.filter.return_value.all.return_value = [
+            ("taken@example.com",)
+        ]
+        self.db.get_bind.return_value.dialect = mysql.dialect()
+        # auto_increment_increment and innodb_autoinc_lock_mode
+        self.db.execute.return_value.one.return_value = (1, 1)
+        self.db.execute.return_value.lastrowid = 7
+
+        # Act
+        result = employer_controller.create_employers(self.db, employers)
+
+        # Assert
+        assert (result.created, result.failed) == (2, 3)
+        assert [(item.id, item.error) for item in result.items] == [
+            (7, None),
+            (None, "Email already exists"),
+            (None, "Email already exists"),
+            (None, "Province not found"),
+            (8, None),
+        ]
+        self.db.commit.assert_called_once()
+
+    def test_create_employers_keeps_other_chunks_on_error(self, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(bulk, "BULK_CHUNK_SIZE", 1)
+        employers = [
+            EmployerCreate(email=f"{i}@example.com", name="Test Employer", provinceId=1)
+            for i in range(2)
+        ]
+        employer_controller = EmployerController()
+
+        # Mock the query methods
+        self.db.query.return_value.filter.return_value.all.return_value = []
+        self.db.get_bind.return_value.dialect = mysql.dialect()
+        # The id settings are read, the first chunk fails, the second inserts
+        # its employer and its stat
+        self.db.execute.side_effect = [
+            MagicMock(one=MagicMock(return_value=(1, 1))),
+            SQLAlchemyError("Error"),
+            MagicMock(lastrowid=3),
+            MagicMock(),
+        ]
+
+        # Act
+        result = employer_controller.create_employers(self.db, employers)
+
+        # Assert
+        assert [(item.id, item.error) for item in result.items] == [
+            (None, "Database error while creating employer. Error: Error"),
+            (3, None),
+        ]
+        self.db.rollback.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "settings, lastrowids, ids",
+        [
+            # Evenly spaced ids, taken from the id of the first row
+            ((2, 1), [11], [11, 13, 15]),
+            # Interleaved lock mode, each record is inserted on its own
+            ((1, 2), [11, 14, 15], [11, 14, 15]),
+        ],
+    )
+    def test_create_employers_ids_follow_auto_increment(
+        self, settings, lastrowids, ids
+    ):
+        # Arrange
+        employers = [
+            EmployerCreate(email=f"{i}@example.com", name="Test Employer", provinceId=1)
+            for i in range(3)
+        ]
+        employer_controller = EmployerController()
+
+        # Mock the query methods
+        self.db.query.return_value.filter.return_value.all.return_value = []
+        self.db.get_bind.return_value.dialect = mysql.dialect()
+        self.db.execute.side_effect = [
+            MagicMock(one=MagicMock(return_value=settings)),
+            *(MagicMock(lastrowid=lastrowid) for lastrowid in lastrowids),
+            MagicMock(),
+        ]
+
+        # Act
+        result = employer_controller.create_employers(self.db, employers)
+
+        # Assert
+        assert [item.id for item in result.items] == ids
+        assert self.db.execute.call_count == len(lastrowids) + 2
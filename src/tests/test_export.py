@@ -0,0 +1,137 @@
+import asyncio
+import csv
+import io
+import json
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.orm import Session
+from src.app import dependencies
+from src.app.api.controllers import export
+from src.app.api.controllers.hydration import hydrate_jobs
+from src.app.api.models.job_model import Job as JobModel
+from src.app.api.routes.job_route import router as job_route
+from src.app.api.schemas.job_schema import JobOut
+from src.app.utils.reference_data import job_fields, provinces
+
+
+class PartitionedResult:
+    def __init__(self, batches):
+        self.batches = batches
+
+    async def partitions(self):
+        for batch in self.batches:
+            yield batch
+
+
+class TestExport:
+    @pytest.fixture(autouse=True)
+    def setup_method(self, monkeypatch):
+        job_fields.set_rows([{"id": id, "name": f"Field {id}"} for id in (1, 2)])
+        provinces.set_rows([{"id": 3, "name": "Province 3"}])
+        monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+
+        # Five jobs streamed in batches of 2, each batch hydrated with real
+        # hydrate_jobs on a mocked session: employers, field and province links
+        jobs = [self.make_job(id) for id in range(1, 6)]
+        batches = [jobs[0:2], jobs[2:4], jobs[4:5]]
+        self.sync_db = MagicMock(spec=Session)
+        self.sync_db.query.return_value.filter.return_value.all.side_effect = [
+            rows
+            for batch in batches
+            for rows in (
+                [SimpleNamespace(id=1, name="Employer 1")],
+                [(job.id, job.id % 2 + 1) for job in batch],
+                [(job.id, 3) for job in batch],
+            )
+        ]
+
+        self.stream_db = AsyncMock()
+        self.stream_db.stream_scalars.return_value = PartitionedResult(batches)
+        self.db = AsyncMock()
+        self.db.run_sync.side_effect = lambda hydrate, batch: hydrate(
+            self.sync_db, batch
+        )
+        sessions = [MagicMock(), MagicMock()]
+        sessions[0].__aenter__.return_value = self.stream_db
+        sessions[1].__aenter__.return_value = self.db
+        connection = SimpleNamespace(SessionLocal=MagicMock(side_effect=sessions))
+        monkeypatch.setattr(export, "AsyncMySQLConnection", lambda: connection)
+
+    def make_job(self, id: int):
+        return JobModel(
+            id=id,
+            employer_id=1,
+            title=f"Job, {id}",
+            quantity=1,
+            description='Say "hi"',
+            salary=1000 * id,
+            fields=f"-{id % 2 + 1}-",
+            provinces="-3-",
+            expired_at=datetime(2030, 1, 1),
+        )
+
+    def export(self, format: export.ExportFormat) -> str:
+        response = export.export_response(
+            JobModel, hydrate_jobs, JobOut, format, "jobs"
+        )
+
+        async def read():
+            return b"".join([chunk async for chunk in response.body_iterator])
+
+        return asyncio.run(read()).decode()
+
+    def test_exports_ndjson_batch_by_batch(self):
+        # Act
+        body = self.export(export.ExportFormat.NDJSON)
+
+        # Assert
+        records = [json.loads(line) for line in body.splitlines()]
+        assert [record["id"] for record in records] == [1, 2, 3, 4, 5]
+        assert [record["fields"][0]["name"] for record in records] == [
+            "Field 2",
+            "Field 1",
+            "Field 2",
+            "Field 1",
+            "Field 2",
+        ]
+        assert records[4]["provinces"] == [{"id": 3, "name": "Province 3"}]
+        assert records[4]["employerName"] == "Employer 1"
+        assert self.db.run_sync.await_count == 3
+        statement = self.stream_db.stream_scalars.await_args.args[0]
+        assert statement.get_execution_options()["yield_per"] == 2
+
+    def test_exports_csv_with_one_header(self):
+        # Act
+        body = self.export(export.ExportFormat.CSV)
+
+        # Assert
+        rows = list(csv.reader(io.StringIO(body)))
+        assert rows[0] == list(JobOut.model_fields)
+        assert len(rows) == 6
+        records = [dict(zip(rows[0], row)) for row in rows[1:]]
+        assert [record["title"] for record in records] == [
+            f"Job, {id}" for id in range(1, 6)
+        ]
+        assert records[2]["description"] == 'Say "hi"'
+        assert records[2]["fields"] == "Field 2"
+        assert records[3]["provinces"] == "Province 3"
+
+    def test_export_route_is_admin_only_and_before_job_id(self):
+        # Arrange
+        paths = [route.path for route in job_route.routes]
+        route = job_route.routes[paths.index("/api/v1/jobs/export")]
+
+        # Act
+        response = asyncio.run(route.endpoint(format=export.ExportFormat.CSV))
+
+        # Assert
+        assert paths.index("/api/v1/jobs/export") < paths.index("/api/v1/jobs/{job_id}")
+        assert dependencies.get_current_admin in [
+            dependency.dependency for dependency in route.dependencies
+        ]
+        assert response.media_type == "text/csv"
+        assert (
+            response.headers["content-disposition"] == 'attachment; filename="jobs.csv"'
+        )
@@ -0,0 +1,96 @@
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from sqlalchemy.orm import Session
+from src.app.api.controllers.hydration import hydrate_jobs, hydrate_seekers
+from src.app.api.models.job_model import Job as JobModel
+from src.app.api.models.seeker_model import Seeker as SeekerModel
+from src.app.utils.reference_data import job_fields, provinces
+
+
+class TestHydration:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.db = MagicMock(spec=Session)
+        job_fields.set_rows([{"id": id, "name": f"Field {id}"} for id in (1, 2)])
+        provinces.set_rows([{"id": 3, "name": "Province 3"}])
+
+    def mock_rows(self, employers, field_links, province_links):
+        # Employer names, field links and province links are answered in that
+        # order, field and province names come from the reference data
+        self.db.query.return_value.filter.return_value.all.side_effect = [
+            [SimpleNamespace(id=id, name=name) for id, name in employers],
+            field_links,
+            province_links,
+        ]
+
+    def make_job(self, id: int, employer_id: int, fields: str, provinces: str):
+        return JobModel(
+            id=id,
+            employer_id=employer_id,
+            title=f"Job {id}",
+            quantity=1,
+            description="Description",
+            salary=1000,
+            fields=fields,
+            provinces=provinces,
+            expired_at=datetime(2030, 1, 1),
+        )
+
+    def test_hydrate_jobs_uses_constant_number_of_queries(self):
+        # Arrange
+        jobs = [self.make_job(i, i % 3 + 1, "-1-2-", "-3-") for i in range(1, 101)]
+        self.mock_rows(
+            [(1, "Employer 1"), (2, "Employer 2"), (3, "Employer 3")],
+            [(job.id, id) for job in jobs for id in (2, 1)],
+            [(job.id, 3) for job in jobs],
+        )
+
+        # Act
+        result = hydrate_jobs(self.db, jobs)
+
+        # Assert
+        assert len(result) == 100
+        assert self.db.query.call_count == 3
+        assert result[0].employerId == 2
+        assert result[0].employerName == "Employer 2"
+        assert [field.name for field in result[0].fields] == ["Field 1", "Field 2"]
+        assert [province.id for province in result[0].provinces] == [3]
+
+    def test_hydrate_jobs_skips_missing_references(self):
+        # Arrange
+        jobs = [self.make_job(1, 7, "-1-9-", "-3-")]
+        self.mock_rows([], [(1, 1), (1, 9)], [])
+
+        # Act
+        result = hydrate_jobs(self.db, jobs)
+
+        # Assert
+        assert result[0].employerId is None
+        assert [field.id for field in result[0].fields] == [1]
+        assert result[0].provinces == []
+
+    def test_hydrate_jobs_empty_page(self):
+        # Act
+        result = hydrate_jobs(self.db, [])
+
+        # Assert
+        assert result == []
+        self.db.query.assert_not_called()
+
+    def test_hydrate_seekers_names_provinces_without_queries(self):
+        # Arrange
+        seekers = [
+            SeekerModel(
+                id=id, name="Seeker", birthday="2000-01-01", address="", province=id
+            )
+            for id in (3, 4)
+        ]
+
+        # Act
+        result = hydrate_seekers(self.db, seekers)
+
+        # Assert
+        assert [seeker.provinceName for seeker in result] == ["Province 3", None]
+        self.db.query.assert_not_called()
@@ -0,0 +1,49 @@
+import pytest
+from src.app.config.cache.local_cache import LocalCache
+
+
+class TestLocalCache:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.cache = LocalCache(max_entries=2, max_bytes=100, ttl_seconds=60)
+
+    def test_get_returns_stored_value(self):
+        # Act
+        self.cache.set("job_1", {"id": 1}, 10)
+
+        # Assert
+        assert self.cache.get("job_1") == {"id": 1}
+        assert self.cache.get("job_2") is None
+
+    def test_evicts_least_recently_used_entry(self):
+        # Arrange
+        self.cache.set("job_1", 1, 10)
+        self.cache.set("job_2", 2, 10)
+        self.cache.get("job_1")
+
+        # Act
+        self.cache.set("job_3", 3, 10)
+
+        # Assert
+        assert self.cache.get("job_1") == 1
+        assert self.cache.get("job_2") is None
+        assert self.cache.stats()["numBytes"] == 20
+
+    def test_evicts_to_stay_under_max_bytes(self):
+        # Arrange
+        self.cache.set("job_1", 1, 60)
+
+        # Act
+        self.cache.set("job_2", 2, 60)
+
+        # Assert
+        assert self.cache.get("job_1") is None
+        assert self.cache.get("job_2") == 2
+
+    def test_expired_entry_is_a_miss(self):
+        # Act
+        self.cache.set("job_1", 1, 10, ttl_seconds=0)
+
+        # Assert
+        assert self.cache.get("job_1") is None
+        assert self.cache.stats()["numEntries"] == 0
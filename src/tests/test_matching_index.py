@@ -0,0 +1,97 @@
+import pytest
+from datetime import datetime
+from src.app.utils.matching_index import IndexEntry, MatchingIndex
+
+
+class TestMatchingIndex:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.index = MatchingIndex("test")
+        self.index.load(
+            [
+                (1, IndexEntry(10, 500, (1, 2), (1,))),
+                (2, IndexEntry(10, 1500, (2,), (2,))),
+                (3, IndexEntry(20, 800, (3,), (1, 2))),
+                (4, IndexEntry(30, 300, (1,), (3,))),
+            ]
+        )
+
+    def test_load_marks_index_ready(self):
+        # Assert
+        assert self.index.ready
+        assert self.index.stats()["numEntries"] == 4
+
+    def test_match_fields_provinces_and_salary(self):
+        # Act
+        result = self.index.match([1, 2, 3], [1, 2], max_salary=1000)
+
+        # Assert
+        assert result == {1, 3}
+
+    def test_match_min_salary(self):
+        # Act
+        result = self.index.match([1, 2, 3], [1, 2], min_salary=800)
+
+        # Assert
+        assert result == {2, 3}
+
+    def test_match_unknown_keys(self):
+        # Act
+        result = self.index.match([99], [1])
+
+        # Assert
+        assert result == set()
+
+    def test_add_replaces_existing_entry(self):
+        # Act
+        self.index.add(1, 10, 2000, [3], [3])
+
+        # Assert
+        assert self.index.match([1, 2], [1], max_salary=1000) == set()
+        assert self.index.match([3], [3]) == {1}
+        assert self.index.stats()["numEntries"] == 4
+
+    def test_remove_entry(self):
+        # Act
+        self.index.remove(3)
+        self.index.remove(99)
+
+        # Assert
+        assert self.index.match([3], [1, 2]) == set()
+        assert self.index.stats()["numFields"] == 2
+
+    def test_refresh_sets_and_removes_entries(self):
+        # Act
+        self.index.refresh([1, 3, 5], {1: IndexEntry(10, 500, (3,), (3,))})
+
+        # Assert
+        assert self.index.match([3], [3]) == {1}
+        assert self.index.match([3], [1, 2]) == set()
+        assert self.index.stats()["numEntries"] == 3
+
+    def test_prune_removes_expired_entries(self):
+        # Arrange
+        self.index.add(5, 40, 700, [1], [1], datetime(2024, 1, 1))
+        self.index.add(6, 40, 900, [1], [1], datetime(2024, 3, 1))
+
+        # Act
+        result = self.index.prune(datetime(2024, 2, 1))
+
+        # Assert
+        assert result == [5]
+        assert self.index.match([1], [1], min_salary=600) == {6}
+        assert self.index.stats()["numEntries"] == 5
+
+    def test_owners_are_distinct_and_sorted(self):
+        # Act
+        result = self.index.owners({3, 2, 1})
+
+        # Assert
+        assert result == [10, 20]
+
+    def test_filter_keeps_indexed_ids_passing_conditions(self):
+        # Act
+        result = self.index.filter([1, 2, 3, 99], province_ids=[1], min_salary=600)
+
+        # Assert
+        assert result == {3}
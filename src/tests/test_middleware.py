@@ -0,0 +1,106 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+from src.app.common.custom_exception import NotFoundException
+from src.app.middleware import api_logging
+from src.app.middleware.api_logging import (
+    ApiLoggingMiddleware,
+    read_body,
+    replay_body,
+)
+from src.app.middleware.exception import UnifiedExceptionMiddleware
+
+
+def call(app, scope, messages):
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent
+
+
+SCOPE = {"type": "http", "method": "GET", "path": "/api/v1/jobs/0", "query_string": b""}
+
+
+class TestUnifiedExceptionMiddleware:
+    def test_sends_response_of_api_exception(self):
+        # Arrange
+        async def app(scope, receive, send):
+            raise NotFoundException("Job not found")
+
+        # Act
+        sent = call(UnifiedExceptionMiddleware(app), SCOPE, [])
+
+        # Assert
+        assert sent[0]["status"] == 404
+        assert json.loads(sent[1]["body"])["message"] == "Job not found"
+
+    def test_sends_default_error_response_of_other_exceptions(self):
+        # Arrange
+        async def app(scope, receive, send):
+            raise ValueError()
+
+        # Act
+        sent = call(UnifiedExceptionMiddleware(app), SCOPE, [])
+
+        # Assert
+        assert sent[0]["status"] == 500
+        assert json.loads(sent[1]["body"])["message"] == "Internal Server Error"
+
+
+class TestApiLoggingMiddleware:
+    def test_replays_read_request_body(self):
+        # Arrange
+        messages = [
+            {"type": "http.request", "body": b'{"name":', "more_body": True},
+            {"type": "http.request", "body": b' "Job"}', "more_body": False},
+            {"type": "http.disconnect"},
+        ]
+
+        async def receive():
+            return messages.pop(0)
+
+        async def run():
+            body = await read_body(receive)
+            replay = replay_body(body, receive)
+            return body, await replay(), await replay()
+
+        # Act
+        body, first, second = asyncio.run(run())
+
+        # Assert
+        assert body == b'{"name": "Job"}'
+        assert first["body"] == body and not first["more_body"]
+        assert second == {"type": "http.disconnect"}
+
+    def test_caps_logged_request_body(self, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(api_logging, "BODY_MAX_BYTES", 16)
+        monkeypatch.setattr(api_logging, "BODY_SAMPLE_RATE", 0)
+        enqueue = AsyncMock()
+        monkeypatch.setattr(api_logging.mongo_log_writer, "enqueue", enqueue)
+        body = json.dumps({"items": [{"title": "Job"}] * 100}).encode()
+        received = []
+
+        async def app(scope, receive, send):
+            received.append(await read_body(receive))
+            await send({"type": "http.response.start", "status": 201})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        # Act
+        call(
+            ApiLoggingMiddleware(app),
+            {**SCOPE, "method": "POST", "path": "/api/v1/jobs/bulk"},
+            [{"type": "http.request", "body": body, "more_body": False}],
+        )
+
+        # Assert
+        assert received == [body]
+        record = enqueue.await_args.args[1]
+        assert record["request_body"] == body[:16].decode()
+        assert record["request_body_truncated"]
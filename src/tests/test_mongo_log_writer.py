@@ -0,0 +1,116 @@
+import asyncio
+from collections import defaultdict
+from unittest.mock import MagicMock
+from pymongo.errors import BulkWriteError, PyMongoError
+from src.app.config.logging.mongo_log_writer import (
+    MongoLogWriter,
+    decode_response_body,
+)
+
+
+class TestMongoLogWriter:
+    def test_writes_batches_per_collection(self):
+        # Arrange
+        collections = defaultdict(MagicMock)
+        db = MagicMock()
+        db.__getitem__.side_effect = collections.__getitem__
+        writer = MongoLogWriter(db, max_queue=10, batch_size=10, flush_interval=60)
+
+        async def run():
+            writer.start()
+            await writer.enqueue("info_logs", {"path": "/api/v1/jobs"})
+            await writer.enqueue("info_logs", {"path": "/api/v1/seekers"})
+            await writer.enqueue("client_error_logs", {"path": "/api/v1/jobs/0"})
+            await writer.close()
+
+        # Act
+        asyncio.run(run())
+
+        # Assert
+        collections["info_logs"].insert_many.assert_called_once_with(
+            [{"path": "/api/v1/jobs"}, {"path": "/api/v1/seekers"}], ordered=False
+        )
+        collections["client_error_logs"].insert_many.assert_called_once_with(
+            [{"path": "/api/v1/jobs/0"}], ordered=False
+        )
+        assert writer.stats() == {"queued": 0, "written": 3, "dropped": 0}
+
+    def test_drops_records_when_queue_is_full(self):
+        # Arrange
+        db = MagicMock()
+        writer = MongoLogWriter(db, max_queue=2)
+
+        async def run():
+            return [await writer.enqueue("info_logs", {"id": id}) for id in range(3)]
+
+        # Act
+        accepted = asyncio.run(run())
+
+        # Assert
+        assert accepted == [True, True, False]
+        assert writer.stats() == {"queued": 2, "written": 0, "dropped": 1}
+
+    def test_counts_failed_writes_as_dropped(self):
+        # Arrange
+        db = MagicMock()
+        db["info_logs"].insert_many.side_effect = PyMongoError("unreachable")
+        writer = MongoLogWriter(db)
+
+        async def run():
+            await writer.enqueue("info_logs", {"id": 1})
+            await writer.close()
+
+        # Act
+        asyncio.run(run())
+
+        # Assert
+        assert writer.stats() == {"queued": 0, "written": 0, "dropped": 1}
+
+    def test_counts_only_failed_documents_of_partial_write(self):
+        # Arrange
+        db = MagicMock()
+        db["info_logs"].insert_many.side_effect = BulkWriteError(
+            {"nInserted": 2, "writeErrors": [{"index": 1}]}
+        )
+        writer = MongoLogWriter(db)
+
+        async def run():
+            for id in range(3):
+                await writer.enqueue("info_logs", {"id": id})
+            await writer.close()
+
+        # Act
+        asyncio.run(run())
+
+        # Assert
+        assert writer.stats() == {"queued": 0, "written": 2, "dropped": 1}
+
+    def test_decodes_captured_response_body(self):
+        # Arrange
+        whole = {"response_body": b'{"data": []}'}
+        truncated = {"response_body": b'{"data": [', "response_body_truncated": True}
+
+        # Act
+        decode_response_body(whole)
+        decode_response_body(truncated)
+
+        # Assert
+        assert whole["response_body"] == {"data": []}
+        assert truncated["response_body"] == '{"data": ['
+
+    def test_runs_in_successive_event_loops(self):
+        # Arrange
+        db = MagicMock()
+        writer = MongoLogWriter(db, flush_interval=0.01)
+
+        async def run():
+            writer.start()
+            await writer.enqueue("info_logs", {"id": 1})
+            await writer.close()
+
+        # Act
+        asyncio.run(run())
+        asyncio.run(run())
+
+        # Assert
+        assert writer.stats() == {"queued": 0, "written": 2, "dropped": 0}
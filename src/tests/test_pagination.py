@@ -0,0 +1,37 @@
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy import column
+from src.app.common.custom_exception import BadRequestException
+from src.app.common.pagination import decode_cursor, encode_cursor, fetch_page
+
+
+class TestPagination:
+    def test_cursor_round_trip(self):
+        # Act
+        cursor = encode_cursor(42)
+
+        # Assert
+        assert decode_cursor(cursor) == [42]
+
+    def test_decode_invalid_cursor(self):
+        # Act & Assert
+        with pytest.raises(BadRequestException):
+            decode_cursor("not a cursor")
+
+    def test_fetch_page_after_cursor_skips_count(self):
+        # Arrange
+        query = MagicMock()
+        rows = [MagicMock(id=i) for i in range(11, 14)]
+        query.filter.return_value.order_by.return_value.limit.return_value.all.return_value = (
+            rows
+        )
+
+        # Act
+        result = fetch_page(query, column("id"), limit=2, after=encode_cursor(10))
+
+        # Assert
+        query.count.assert_not_called()
+        assert result.rows == rows[:2]
+        assert result.page is None
+        assert result.totalElements is None
+        assert decode_cursor(result.nextCursor) == [12]
@@ -0,0 +1,41 @@
+import asyncio
+import pytest
+from src.app.common.custom_exception import ServiceUnavailableException
+from src.app.utils.password_hasher import PasswordHasher
+
+
+class TestPasswordHasher:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.hasher = PasswordHasher(max_workers=1, max_pending=0)
+        yield
+        self.hasher.close()
+
+    def test_verifies_hashed_password(self):
+        async def run():
+            hashed_password = await self.hasher.hash("password")
+            return (
+                await self.hasher.verify("password", hashed_password),
+                await self.hasher.verify("wrong password", hashed_password),
+            )
+
+        # Act
+        valid, invalid = asyncio.run(run())
+
+        # Assert
+        assert valid and not invalid
+
+    def test_rejects_when_too_many_pending(self):
+        async def run():
+            return await asyncio.gather(
+                self.hasher.hash("password"),
+                self.hasher.hash("password"),
+                return_exceptions=True,
+            )
+
+        # Act
+        first, second = asyncio.run(run())
+
+        # Assert
+        assert isinstance(first, str)
+        assert isinstance(second, ServiceUnavailableException)
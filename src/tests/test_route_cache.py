@@ -0,0 +1,51 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+from src.app.common.api_response import ApiResponse
+from src.app.config.cache import redis, route_cache
+
+
+class TestCached:
+    @pytest.fixture(autouse=True)
+    def setup_method(self, monkeypatch):
+        monkeypatch.setattr(redis, "get_cache", AsyncMock(return_value=None))
+        monkeypatch.setattr(redis, "set_cache", AsyncMock())
+        monkeypatch.setattr(redis, "_acquire_lock", AsyncMock(return_value="token"))
+        monkeypatch.setattr(redis, "_release_lock", AsyncMock())
+        self.set_cache = redis.set_cache
+
+    def get(self, expiry):
+        @route_cache.cached("key", expires_at=lambda response: response.object)
+        async def route():
+            return ApiResponse.success_with_object(object=expiry)
+
+        return asyncio.run(route())
+
+    def test_keeps_result_until_ttl_and_stale_ttl(self):
+        # Act
+        self.get(None)
+
+        # Assert
+        _, entry, ex_seconds = self.set_cache.await_args.args
+        assert ex_seconds == redis.cache_ttl + redis.stale_ttl
+        assert entry.fresh_until == pytest.approx(
+            datetime.now().timestamp() + redis.cache_ttl, abs=5
+        )
+
+    def test_keeps_result_no_longer_than_its_expiry(self):
+        # Act
+        self.get(datetime.now() + timedelta(seconds=60))
+
+        # Assert
+        _, entry, ex_seconds = self.set_cache.await_args.args
+        assert 55 <= ex_seconds <= 60
+        assert entry.fresh_until <= datetime.now().timestamp() + 60
+
+    def test_does_not_keep_expired_result(self):
+        # Act
+        response = self.get(datetime.now() - timedelta(seconds=1))
+
+        # Assert
+        assert response.status_code == 200
+        self.set_cache.assert_not_awaited()
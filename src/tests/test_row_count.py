@@ -0,0 +1,46 @@
+import pytest
+from unittest.mock import MagicMock
+from src.app.api.models.job_model import Job as JobModel
+from src.app.utils.row_count import RowCounter
+
+
+class TestRowCounter:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.counter = RowCounter(source="counter", max_age=60)
+        self.query = MagicMock()
+        self.query.count.return_value = 10
+
+    def test_count_is_cached_and_adjusted(self):
+        # Act
+        first = self.counter.count(self.query, JobModel)
+        self.counter.adjust(JobModel, 2)
+        second = self.counter.count(self.query, JobModel)
+
+        # Assert
+        assert first == 10
+        assert second == 12
+        self.query.count.assert_called_once()
+
+    def test_exact_count_bypasses_cache(self):
+        # Arrange
+        self.counter.count(self.query, JobModel)
+        self.query.count.return_value = 11
+
+        # Act
+        result = self.counter.count(self.query, JobModel, exact=True)
+
+        # Assert
+        assert result == 11
+        assert self.query.count.call_count == 2
+
+    def test_stale_count_is_reloaded(self):
+        # Arrange
+        self.counter.max_age = 0
+        self.counter.count(self.query, JobModel)
+
+        # Act
+        self.counter.count(self.query, JobModel)
+
+        # Assert
+        assert self.query.count.call_count == 2
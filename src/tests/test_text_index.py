@@ -0,0 +1,57 @@
+import pytest
+from src.app.utils.text_index import TextIndex, tokenize
+
+
+class TestTextIndex:
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        self.index = TextIndex("test")
+        self.index.load(
+            [
+                (1, "Lập trình viên Python", "Phát triển API tại Hà Nội"),
+                (2, "Kế toán", "Kế toán tổng hợp, biết Python"),
+                (3, "Nhân viên bán hàng", "Bán hàng tại Đà Nẵng"),
+            ]
+        )
+
+    def test_tokenize_folds_case_and_accents(self):
+        # Act
+        result = tokenize("Hà Nội, ĐÀ NẴNG!")
+
+        # Assert
+        assert result == ["ha", "noi", "da", "nang"]
+
+    def test_scores_rank_title_matches_first(self):
+        # Act
+        scores = self.index.scores("python")
+
+        # Assert
+        assert scores.keys() == {1, 2}
+        assert scores[1] > scores[2]
+
+    def test_scores_ignore_accents_of_query(self):
+        # Act
+        scores = self.index.scores("ke toan ha noi")
+
+        # Assert
+        assert scores.keys() == {1, 2}
+        assert scores[2] > scores[1]
+
+    def test_add_replaces_and_remove_drops_document(self):
+        # Act
+        self.index.add(2, "Kế toán", "Excel")
+        self.index.remove(1)
+        self.index.remove(99)
+
+        # Assert
+        assert self.index.scores("python") == {}
+        assert self.index.stats()["numEntries"] == 2
+
+    def test_refresh_sets_and_removes_documents(self):
+        # Act
+        self.index.refresh([1, 2, 5], {2: ("Kế toán", "Excel")})
+
+        # Assert
+        assert self.index.scores("python") == {}
+        assert self.index.scores("excel").keys() == {2}
+        assert self.index.stats()["numEntries"] == 2